@@ -1,13 +1,19 @@
 import streamlit as st
 import plotly.express as px
 import numpy as np
-from utils import fetch_crypto_data, calculate_metrics
+from utils import calculate_metrics
+from data_access import get_price_history, cache_stats
+from downsample import downsample_frame
+from price_store import STORE_PATH
+from risk_classification import classify_value, file_version, label_with_icon
+from instrumentation import mark, render_debug_panel, start_trace
 
 # Page config
 st.set_page_config(
     page_title="Crypto Volatility & Risk Analyzer",
     layout="wide"
 )
+trace = start_trace()
 
 st.title("📊 Crypto Volatility & Risk Analyzer")
 
@@ -24,8 +30,9 @@ days = st.slider(
     value=90
 )
 
-# Fetch Data
-df = fetch_crypto_data(crypto, days)
+# Fetch Data (cached across reruns and sessions)
+df = get_price_history(crypto, days)
+mark("fetch.price_history")
 
 # Calculate Metrics
 volatility, sharpe = calculate_metrics(df)
@@ -34,36 +41,41 @@ volatility, sharpe = calculate_metrics(df)
 col1, col2 = st.columns(2)
 col1.metric("Annualized Volatility", f"{volatility:.2f}")
 col2.metric("Sharpe Ratio", f"{sharpe:.2f}")
+mark("render.metric_cards")
 
-# Price Trend Chart
+# Price Trend Chart (thinned to the chart's pixel budget, peaks kept)
 fig_price = px.line(
-    df,
+    downsample_frame(df, "date", "price", method="minmax"),
     x="date",
     y="price",
     title=f"{crypto.upper()} Price Trend"
 )
 st.plotly_chart(fig_price, use_container_width=True)
+mark("render.price_chart")
 
 # Rolling Volatility
 df["rolling_volatility"] = df["returns"].rolling(7).std() * np.sqrt(365)
+mark("compute.rolling_volatility")
 
 fig_vol = px.line(
-    df,
+    downsample_frame(df, "date", "rolling_volatility"),
     x="date",
     y="rolling_volatility",
     title="7-Day Rolling Volatility"
 )
 st.plotly_chart(fig_vol, use_container_width=True)
+mark("render.volatility_chart")
 
-# Risk Classification
-def classify_risk(vol):
-    if vol > 0.8:
-        return "🔴 High Risk"
-    elif vol > 0.4:
-        return "🟠 Medium Risk"
-    else:
-        return "🟢 Low Risk"
-
-risk_level = classify_risk(volatility)
+# Risk Classification (shared rule set, see risk_classification.py)
+risk_level = label_with_icon(classify_value(volatility, coin=crypto, version=file_version(STORE_PATH)))
 
 st.subheader(f"Risk Level: {risk_level}")
+
+
+stats = cache_stats()
+st.caption(
+    f"Data cache: {stats['hits']} hits / {stats['misses']} misses "
+    f"({stats['hit_rate']:.0%} hit rate, {stats['entries']} entries)"
+)
+
+render_debug_panel(trace)
@@ -0,0 +1,278 @@
+import base64
+import hashlib
+import hmac
+import secrets
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from db import get_pool
+
+# ===============================
+# CONFIGURATION
+# ===============================
+
+# scrypt cost: N=2**14, r=8, p=1 takes ~50 ms and 16 MB per hash
+SCRYPT_N = 2 ** 14
+SCRYPT_R = 8
+SCRYPT_P = 1
+SALT_BYTES = 16
+
+HASH_WORKERS = 4
+SESSION_TTL = 30 * 60
+# Expired sessions are swept at most this often, and the oldest are evicted
+# beyond MAX_SESSIONS, so abandoned logins can't accumulate
+SESSION_SWEEP = 60
+MAX_SESSIONS = 10_000
+
+# At most MAX_FAILURES failed attempts per user within FAILURE_WINDOW seconds
+MAX_FAILURES = 5
+FAILURE_WINDOW = 5 * 60
+
+
+class RateLimited(Exception):
+    pass
+
+
+# ===============================
+# PASSWORD HASHING
+# ===============================
+
+def _b64(raw):
+    return base64.b64encode(raw).decode("ascii")
+
+
+def _scrypt(password, salt, n, r, p):
+    # scrypt needs ~128*N*r*p bytes; allow twice that
+    return hashlib.scrypt(password.encode(), salt=salt, n=n, r=r, p=p, maxmem=256 * n * r * p)
+
+
+# "scrypt$N$r$p$salt$hash" so the cost can be raised without breaking old hashes
+def hash_password(password, n=SCRYPT_N, r=SCRYPT_R, p=SCRYPT_P):
+    salt = secrets.token_bytes(SALT_BYTES)
+    digest = _scrypt(password, salt, n, r, p)
+    return f"scrypt${n}${r}${p}${_b64(salt)}${_b64(digest)}"
+
+
+def is_hashed(stored):
+    return stored.startswith("scrypt$")
+
+
+def verify_password(password, stored):
+    if not is_hashed(stored):
+        # Rows written before hashing hold the password itself
+        return hmac.compare_digest(password.encode(), stored.encode())
+
+    _, n, r, p, salt, expected = stored.split("$")
+    n, r, p = int(n), int(r), int(p)
+    digest = _scrypt(password, base64.b64decode(salt), n, r, p)
+    return hmac.compare_digest(digest, base64.b64decode(expected))
+
+
+# Verified against when the user doesn't exist, so timing doesn't reveal it
+_DUMMY_HASH = hash_password(secrets.token_hex(8))
+
+
+# ===============================
+# SESSIONS & RATE LIMITING
+# ===============================
+
+class SessionCache:
+    def __init__(self, ttl=SESSION_TTL, max_sessions=MAX_SESSIONS, sweep_every=SESSION_SWEEP):
+        self.ttl = ttl
+        self.max_sessions = max_sessions
+        self.sweep_every = sweep_every
+        self._sessions = {}
+        self._last_sweep = time.monotonic()
+        self._lock = threading.Lock()
+
+    # Every session shares one TTL, so insertion order is expiry order
+    def _sweep(self, now):
+        if now - self._last_sweep >= self.sweep_every:
+            self._last_sweep = now
+            for token in [t for t, (_, expires) in self._sessions.items() if expires < now]:
+                del self._sessions[token]
+        while len(self._sessions) > self.max_sessions:
+            del self._sessions[next(iter(self._sessions))]
+
+    def create(self, username):
+        token = secrets.token_urlsafe(32)
+        with self._lock:
+            now = time.monotonic()
+            self._sessions[token] = (username, now + self.ttl)
+            self._sweep(now)
+        return token
+
+    # Username for a live token, else None; expired tokens are dropped
+    def get(self, token):
+        if not token:
+            return None
+        with self._lock:
+            entry = self._sessions.get(token)
+            if entry is None:
+                return None
+            username, expires = entry
+            if expires < time.monotonic():
+                del self._sessions[token]
+                return None
+            return username
+
+    def revoke(self, token):
+        with self._lock:
+            self._sessions.pop(token, None)
+
+
+class LoginRateLimiter:
+    def __init__(self, max_failures=MAX_FAILURES, window=FAILURE_WINDOW):
+        self.max_failures = max_failures
+        self.window = window
+        self._failures = {}
+        self._pending = {}
+        self._last_sweep = time.monotonic()
+        self._lock = threading.Lock()
+
+    # Failures inside the window; usernames with none left are forgotten
+    def _recent(self, username):
+        failures = self._failures.get(username)
+        if failures is None:
+            return deque()
+        cutoff = time.monotonic() - self.window
+        while failures and failures[0] < cutoff:
+            failures.popleft()
+        if not failures:
+            del self._failures[username]
+        return failures
+
+    # Drops every username whose failures have all expired, at most once per
+    # window, so guessed usernames don't accumulate
+    def _sweep(self):
+        now = time.monotonic()
+        if now - self._last_sweep < self.window:
+            return
+        self._last_sweep = now
+        cutoff = now - self.window
+        for username in [u for u, failures in self._failures.items() if failures[-1] < cutoff]:
+            del self._failures[username]
+
+    # Seconds until the user may try again, or 0
+    def retry_after(self, username):
+        with self._lock:
+            failures = self._recent(username)
+            if len(failures) < self.max_failures:
+                return 0
+            return failures[0] + self.window - time.monotonic()
+
+    # Reserves one attempt: recent failures plus attempts still being
+    # verified count against max_failures, so parallel submissions can't
+    # slip past the limit. Returns 0 when reserved (pair with end_attempt),
+    # else the seconds to wait.
+    def begin_attempt(self, username):
+        with self._lock:
+            failures = self._recent(username)
+            pending = self._pending.get(username, 0)
+            if len(failures) + pending >= self.max_failures:
+                if len(failures) >= self.max_failures:
+                    return failures[0] + self.window - time.monotonic()
+                # Blocked only by attempts in flight; they finish within ms
+                return 1
+            self._pending[username] = pending + 1
+            return 0
+
+    def end_attempt(self, username):
+        with self._lock:
+            pending = self._pending.pop(username, 1) - 1
+            if pending > 0:
+                self._pending[username] = pending
+
+    def record_failure(self, username):
+        with self._lock:
+            self._sweep()
+            self._recent(username)
+            self._failures.setdefault(username, deque()).append(time.monotonic())
+
+    def reset(self, username):
+        with self._lock:
+            self._failures.pop(username, None)
+
+
+# ===============================
+# AUTHENTICATION
+# ===============================
+
+class Authenticator:
+    def __init__(self, pool=None, hash_workers=HASH_WORKERS, session_ttl=SESSION_TTL):
+        self.pool = pool
+        self.sessions = SessionCache(session_ttl)
+        self.limiter = LoginRateLimiter()
+        # scrypt releases the GIL, so hashing here doesn't stall other sessions
+        self._executor = ThreadPoolExecutor(max_workers=hash_workers, thread_name_prefix="auth-hash")
+
+    def _pool(self):
+        return self.pool or get_pool()
+
+    def _stored_hash(self, username):
+        pool = self._pool()
+        with pool.cursor() as cursor:
+            cursor.execute(pool.sql("SELECT password_hash FROM User WHERE username=%s LIMIT 1"), (username,))
+            row = cursor.fetchone()
+        return row[0] if row else None
+
+    def _upgrade_hash(self, username, password):
+        pool = self._pool()
+        with pool.cursor(commit=True) as cursor:
+            cursor.execute(pool.sql("UPDATE User SET password_hash=%s WHERE username=%s"),
+                           (hash_password(password), username))
+
+    def _verify(self, username, password):
+        try:
+            stored = self._stored_hash(username)
+            ok = verify_password(password, stored or _DUMMY_HASH)
+            if not stored or not ok:
+                self.limiter.record_failure(username)
+                return None
+        finally:
+            self.limiter.end_attempt(username)
+
+        self.limiter.reset(username)
+        if not is_hashed(stored):
+            self._upgrade_hash(username, password)
+        return self.sessions.create(username)
+
+    # Future resolving to a session token on success or None on bad
+    # credentials; the lookup and scrypt run on the hashing pool, so the
+    # caller's thread is free while they do. Raises RateLimited up front,
+    # counting attempts still in flight against the limit.
+    def begin_login(self, username, password):
+        wait = self.limiter.begin_attempt(username)
+        if wait > 0:
+            raise RateLimited(f"Too many failed attempts, try again in {wait:.0f}s")
+        try:
+            return self._executor.submit(self._verify, username, password)
+        except BaseException:
+            self.limiter.end_attempt(username)
+            raise
+
+    # Blocking form of begin_login for scripts
+    def login(self, username, password):
+        return self.begin_login(username, password).result()
+
+    # Reruns with a live token skip the database entirely
+    def current_user(self, token):
+        return self.sessions.get(token)
+
+    def logout(self, token):
+        self.sessions.revoke(token)
+
+
+_authenticator = None
+_authenticator_lock = threading.Lock()
+
+
+# Process-wide authenticator so sessions survive Streamlit reruns
+def get_authenticator():
+    global _authenticator
+    with _authenticator_lock:
+        if _authenticator is None:
+            _authenticator = Authenticator()
+        return _authenticator
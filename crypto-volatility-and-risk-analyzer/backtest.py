@@ -0,0 +1,234 @@
+import itertools
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+# ===============================
+# CONFIGURATION
+# ===============================
+
+# Same sqrt(252) scaling as risk_engine.py and vol_forecast.py, whose
+# annualized volatilities the risk thresholds below are applied to
+PERIODS_PER_YEAR = 252
+COST_BPS = 10
+# Parameter sets simulated together in one (params x days x assets) batch
+CHUNK_PARAMS = 64
+
+# Default sweeps. The threshold grid brackets the absolute rule set in
+# risk_classification.py (Medium above 0.4, High above 0.7).
+THRESHOLD_GRID = {
+    "window": [7, 14, 30, 60],
+    "medium": [0.3, 0.4, 0.5],
+    "high": [0.6, 0.7, 0.8, 1.0],
+    "medium_exposure": [1.0, 0.5],
+    "high_exposure": [0.0, 0.25],
+    "cost_bps": [COST_BPS],
+}
+VOL_TARGET_GRID = {
+    "window": [7, 14, 30, 60],
+    "target": [0.2, 0.3, 0.4, 0.6],
+    "max_leverage": [1.0, 2.0],
+    "cost_bps": [COST_BPS],
+}
+
+# Exposures are decided on day t's close and earn day t+1's return. Until a
+# window has enough history there is no signal and the position is held.
+
+
+# ===============================
+# SIGNALS
+# ===============================
+
+# Annualized trailing volatility of every column from prefix sums, (T x N)
+def rolling_annual_vol(R, window, periods_per_year=PERIODS_PER_YEAR):
+    T = R.shape[0]
+    S = np.zeros((T + 1, R.shape[1]))
+    SS = np.zeros_like(S)
+    np.cumsum(R, axis=0, out=S[1:])
+    np.cumsum(R * R, axis=0, out=SS[1:])
+
+    vol = np.full(R.shape, np.nan)
+    if T >= window:
+        s = S[window:] - S[:-window]
+        ss = SS[window:] - SS[:-window]
+        var = (ss - s * s / window) / (window - 1)
+        vol[window - 1:] = np.sqrt(np.maximum(var, 0.0) * periods_per_year)
+    return vol
+
+
+# Parameter arrays are (P,) and broadcast against a (T x N) volatility
+def _p(values):
+    return np.asarray(values, dtype=float)[:, None, None]
+
+
+def vol_target_exposure(vol, target, max_leverage):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        exposure = np.minimum(_p(target) / vol[None], _p(max_leverage))
+    return exposure
+
+
+# Full size while Low risk, medium_exposure once volatility is above
+# `medium`, high_exposure once it is above `high`
+def risk_threshold_exposure(vol, medium, high, medium_exposure=1.0, high_exposure=0.0):
+    v = vol[None]
+    exposure = np.where(v > _p(high), _p(high_exposure), np.where(v > _p(medium), _p(medium_exposure), 1.0))
+    return np.where(np.isnan(v), np.nan, exposure)
+
+
+STRATEGIES = {
+    "risk_threshold": (risk_threshold_exposure, ["medium", "high", "medium_exposure", "high_exposure"]),
+    "vol_target": (vol_target_exposure, ["target", "max_leverage"]),
+}
+
+
+# ===============================
+# SIMULATION
+# ===============================
+
+# Net daily returns for (P x T x N) exposures, after costs on every change
+def simulate(R, exposure, cost_bps):
+    held = np.where(np.isnan(exposure), 1.0, exposure)
+    position = np.empty_like(held)
+    position[:, 0] = 1.0
+    position[:, 1:] = held[:, :-1]
+
+    trades = np.abs(np.diff(position, axis=1, prepend=1.0))
+    net = position * R[None] - trades * _p(cost_bps) / 10_000
+    return net, position, trades
+
+
+# Summary statistics over the time axis, vectorized over params and assets
+def performance(net, position, trades, periods_per_year=PERIODS_PER_YEAR):
+    T = net.shape[1]
+    equity = np.cumprod(1 + net, axis=1)
+    drawdown = equity / np.maximum.accumulate(equity, axis=1) - 1
+
+    mean = net.mean(axis=1)
+    std = net.std(axis=1, ddof=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sharpe = mean / std * np.sqrt(periods_per_year)
+    return {
+        "CAGR": equity[:, -1] ** (periods_per_year / T) - 1,
+        "Annual Volatility": std * np.sqrt(periods_per_year),
+        "Sharpe Ratio": sharpe,
+        "Max Drawdown": drawdown.min(axis=1),
+        "Average Exposure": position.mean(axis=1),
+        "Annual Turnover": trades.mean(axis=1) * periods_per_year,
+    }
+
+
+# One task: a list of parameter dicts for one strategy and window
+def _run_chunk(args):
+    R, strategy, window, params, periods_per_year = args
+    exposure_fn, names = STRATEGIES[strategy]
+
+    vol = rolling_annual_vol(R, window, periods_per_year)
+    exposure = exposure_fn(vol, *[[p[name] for p in params] for name in names])
+    net, position, trades = simulate(R, exposure, [p["cost_bps"] for p in params])
+    return performance(net, position, trades, periods_per_year)
+
+
+# ===============================
+# PUBLIC API
+# ===============================
+
+def _returns_matrix(prices):
+    prices = prices.sort_index()
+    return prices.pct_change().iloc[1:].fillna(0.0)
+
+
+def _grid(grid):
+    names = list(grid)
+    return [dict(zip(names, values)) for values in itertools.product(*grid.values())]
+
+
+# Buy-and-hold statistics for each asset, the baseline for every sweep
+def buy_and_hold(prices, periods_per_year=PERIODS_PER_YEAR):
+    R = _returns_matrix(prices).to_numpy(dtype=float)
+    position = np.ones((1,) + R.shape)
+    stats = performance(R[None], position, np.zeros_like(position), periods_per_year)
+    return pd.DataFrame({k: v[0] for k, v in stats.items()}, index=prices.columns)
+
+
+# Runs every parameter combination of each strategy grid on every asset of
+# a Date x asset price panel. Combinations sharing a window are batched
+# (the rolling volatility is computed once per batch) and batches are
+# spread over a process pool. Returns (results, timing) where results has
+# one row per strategy x parameters x asset.
+def sweep(prices, grids=None, workers=None, chunk_params=CHUNK_PARAMS, periods_per_year=PERIODS_PER_YEAR):
+    grids = grids or {"risk_threshold": THRESHOLD_GRID, "vol_target": VOL_TARGET_GRID}
+    R = _returns_matrix(prices).to_numpy(dtype=float)
+    assets = list(prices.columns)
+
+    tasks = []
+    for strategy, grid in grids.items():
+        combos = _grid(grid)
+        for window in sorted({c["window"] for c in combos}):
+            group = [c for c in combos if c["window"] == window]
+            for i in range(0, len(group), chunk_params):
+                tasks.append((R, strategy, window, group[i:i + chunk_params], periods_per_year))
+
+    start = time.perf_counter()
+    workers = min(workers or os.cpu_count() or 1, len(tasks))
+    if workers <= 1:
+        results = [_run_chunk(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_run_chunk, tasks))
+    elapsed = time.perf_counter() - start
+
+    rows = []
+    for (_, strategy, _, params, _), stats in zip(tasks, results):
+        for p, combo in enumerate(params):
+            for a, asset in enumerate(assets):
+                rows.append({
+                    "Strategy": strategy,
+                    **combo,
+                    "Asset": asset,
+                    **{name: values[p, a] for name, values in stats.items()},
+                })
+
+    n_backtests = len(rows)
+    timing = {
+        "backtests": n_backtests,
+        "tasks": len(tasks),
+        "workers": workers,
+        "seconds": elapsed,
+        "backtests_per_second": n_backtests / elapsed if elapsed else float("inf"),
+    }
+    return pd.DataFrame(rows), timing
+
+
+# Best parameter set per strategy and asset by Sharpe ratio
+def best_by_sharpe(results):
+    best = results.loc[results.groupby(["Strategy", "Asset"])["Sharpe Ratio"].idxmax()]
+    return best.reset_index(drop=True)
+
+
+# ===============================
+# COMMAND LINE
+# ===============================
+
+def main():
+    from feature_cache import get_features
+
+    coins = ["bitcoin", "ethereum", "solana", "cardano", "dogecoin"]
+    prices = get_features(coins).prices
+
+    results, timing = sweep(prices)
+    results.to_csv("data/backtest_results.csv", index=False)
+
+    baseline = buy_and_hold(prices)
+    print("Buy & hold:")
+    print(baseline[["CAGR", "Sharpe Ratio", "Max Drawdown"]].round(3).to_string())
+    print("\nBest parameters by Sharpe:")
+    print(best_by_sharpe(results).round(3).to_string(index=False))
+    print(f"\n{timing['backtests']} backtests in {timing['seconds']:.2f}s on {timing['workers']} "
+          f"worker(s): {timing['backtests_per_second']:,.0f} backtests/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from auth import Authenticator, hash_password
+from db import ConnectionPool, sqlite_connect
+
+# ===============================
+# LOGINS PER SECOND
+# ===============================
+# Full login path (pooled SELECT + scrypt verify + session token) against
+# a SQLite stand-in for crypto_risk_db, at several scrypt costs.
+
+USERS = 20
+LOGINS = 200
+COSTS = [2 ** 12, 2 ** 14, 2 ** 15]
+CLIENTS = [1, 4]
+
+
+def setup_users(pool, n):
+    with pool.cursor(commit=True) as cursor:
+        cursor.execute("DROP TABLE IF EXISTS User")
+        cursor.execute("CREATE TABLE User (username TEXT PRIMARY KEY, password_hash TEXT)")
+        cursor.executemany(
+            "INSERT INTO User VALUES (?, ?)",
+            [(f"user{i}", hash_password(f"secret{i}", n=n)) for i in range(USERS)]
+        )
+
+
+def run(auth, clients):
+    def attempt(i):
+        return auth.login(f"user{i % USERS}", f"secret{i % USERS}")
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as pool:
+        tokens = list(pool.map(attempt, range(LOGINS)))
+    elapsed = time.perf_counter() - start
+    assert all(tokens)
+    return LOGINS / elapsed
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as tmp:
+        pool = ConnectionPool(lambda: sqlite_connect(os.path.join(tmp, "users.sqlite")), placeholder="?")
+
+        print(f"{'scrypt N':>9} " + " ".join(f"{f'{c} client(s)':>13}" for c in CLIENTS) + "  (logins/s)")
+        for n in COSTS:
+            setup_users(pool, n)
+            auth = Authenticator(pool=pool)
+            rates = [run(auth, clients) for clients in CLIENTS]
+            print(f"{n:>9} " + " ".join(f"{rate:>13.0f}" for rate in rates))
+
+        # Cached session lookups, what an authenticated rerun costs
+        token = auth.login("user0", "secret0")
+        start = time.perf_counter()
+        for _ in range(100_000):
+            auth.current_user(token)
+        per_lookup = (time.perf_counter() - start) / 100_000
+        print(f"\nsession cache hit: {per_lookup * 1e6:.2f} us ({1 / per_lookup:,.0f}/s, no database)")
+        pool.close_all()
@@ -0,0 +1,37 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backtest import sweep
+
+# ===============================
+# BACKTEST THROUGHPUT
+# ===============================
+# Default threshold + vol-target sweeps over synthetic daily price panels,
+# serially and across a process pool.
+
+PANELS = [(5, 365), (5, 5 * 365), (50, 5 * 365), (200, 10 * 365)]
+
+
+def synthetic_prices(n_assets, days, seed=0):
+    rng = np.random.default_rng(seed)
+    vol = rng.uniform(0.02, 0.06, n_assets)
+    returns = rng.standard_normal((days, n_assets)) * vol
+    index = pd.date_range("2015-01-01", periods=days)
+    return pd.DataFrame(100 * np.exp(returns.cumsum(axis=0)), index=index,
+                        columns=[f"asset_{i}" for i in range(n_assets)])
+
+
+if __name__ == "__main__":
+    workers = os.cpu_count() or 1
+    print(f"{'assets':>6} {'days':>6} {'backtests':>10} {'x1 (bt/s)':>12} {f'x{workers} (bt/s)':>12}")
+    for n_assets, days in PANELS:
+        prices = synthetic_prices(n_assets, days)
+        _, serial = sweep(prices, workers=1)
+        _, parallel = sweep(prices, workers=workers)
+        print(f"{n_assets:>6} {days:>6} {serial['backtests']:>10} "
+              f"{serial['backtests_per_second']:>12,.0f} {parallel['backtests_per_second']:>12,.0f}")
@@ -0,0 +1,60 @@
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from columnar import load_columnar, write_columnar
+
+# ===============================
+# CSV vs MEMMAP LOAD TIME
+# ===============================
+# Same 21-column layout as data/processed_crypto_data.csv, at one year
+# daily, one year hourly and five years hourly.
+
+COINS = ["bitcoin", "ethereum", "solana", "cardano", "dogecoin"]
+SIZES = {"1y daily": 365, "1y hourly": 365 * 24, "5y hourly": 5 * 365 * 24}
+REPEATS = 3
+
+
+def make_panel(rows):
+    rng = np.random.default_rng(0)
+    dates = pd.date_range("2020-01-01", periods=rows, freq="h", name="Date")
+    prices = pd.DataFrame(np.exp(rng.normal(0, 0.01, (rows, 5)).cumsum(axis=0)), index=dates, columns=COINS)
+    returns = np.log(prices / prices.shift(1))
+    df = prices.join(prices.rolling(30).mean().add_suffix("_MA30"))
+    df = df.join(returns.add_suffix("_return"))
+    return df.join(returns.rolling(30).std().add_suffix("_Vol30_return"))
+
+
+def best_of(func):
+    timings = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000
+
+
+if __name__ == "__main__":
+    print(f"{'size':>10} {'csv all':>9} {'csv 5 cols':>11} {'npy all':>9} {'npy 5 cols':>11} {'npy 5 cols, 30d':>16}  (ms)")
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, rows in SIZES.items():
+            df = make_panel(rows)
+            csv_path = os.path.join(tmp, "panel.csv")
+            npy_path = os.path.join(tmp, "panel")
+            df.to_csv(csv_path)
+            write_columnar(df, npy_path)
+            end = df.index[-1]
+            start = end - pd.Timedelta(days=30)
+
+            csv_all = best_of(lambda: pd.read_csv(csv_path, parse_dates=["Date"]))
+            csv_cols = best_of(lambda: pd.read_csv(csv_path, parse_dates=["Date"], usecols=["Date"] + COINS))
+            npy_all = best_of(lambda: load_columnar(npy_path))
+            npy_cols = best_of(lambda: load_columnar(npy_path, COINS))
+            npy_range = best_of(lambda: load_columnar(npy_path, COINS, start, end))
+            print(f"{label:>10} {csv_all:>9.1f} {csv_cols:>11.1f} {npy_all:>9.1f} {npy_cols:>11.1f} {npy_range:>16.1f}")
@@ -0,0 +1,39 @@
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fetcher import CoinGeckoFetcher, HostRateLimiter
+from stub_coingecko import start_stub_server
+
+# ===============================
+# SERIAL vs CONCURRENT FETCH
+# ===============================
+# Wall-clock time to build the aligned 365-day panel against the local
+# stub, which adds LATENCY seconds to every request.
+
+LATENCY = 0.25
+DAYS = 365
+COIN_COUNTS = [5, 10, 25, 50]
+
+
+def run(base_url, coins, max_workers):
+    limiter = HostRateLimiter(rate=1000, burst=1000)
+    with CoinGeckoFetcher(base_url, max_workers=max_workers, rate_limiter=limiter) as fetcher:
+        start = time.perf_counter()
+        panel = fetcher.price_panel(coins, DAYS)
+        return time.perf_counter() - start, panel.shape
+
+
+if __name__ == "__main__":
+    server, base_url = start_stub_server(latency=LATENCY)
+
+    print(f"{'coins':>6} {'serial (s)':>11} {'8 workers (s)':>14} {'speed-up':>9}")
+    for count in COIN_COUNTS:
+        coins = [f"coin{i}" for i in range(count)]
+        serial, _ = run(base_url, coins, max_workers=1)
+        concurrent, shape = run(base_url, coins, max_workers=8)
+        print(f"{count:>6} {serial:>11.2f} {concurrent:>14.2f} {serial / concurrent:>8.1f}x")
+
+    server.shutdown()
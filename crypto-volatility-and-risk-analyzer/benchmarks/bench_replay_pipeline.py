@@ -0,0 +1,63 @@
+import os
+import sys
+import tempfile
+import time
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, APP_DIR)
+
+import milestone2_processing as processing
+from price_store import PriceStore
+from providers import ReplayProvider
+
+# ===============================
+# OFFLINE PIPELINE BENCHMARK
+# ===============================
+# Runs the milestone 2 pipeline against the checked-in CSVs through the
+# replay provider, in a scratch directory, with no network access.
+
+REPEATS = 5
+
+
+def replay_provider(speedup=None):
+    replay_dir = os.path.join(APP_DIR, "data", "replay")
+    return ReplayProvider(
+        prices_path=os.path.join(replay_dir, "prices.csv"),
+        ohlc_path=os.path.join(replay_dir, "btc_ohlc.csv"),
+        market_path=os.path.join(replay_dir, "markets.csv"),
+        table_path=os.path.join(replay_dir, "quotes.csv"),
+        speedup=speedup,
+    )
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, (time.perf_counter() - start) * 1000
+
+
+if __name__ == "__main__":
+    provider = replay_provider()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        os.makedirs("data")
+        store = PriceStore("data/price_store.db")
+
+        print(f"{'run':>4} {'load (ms)':>10} {'process (ms)':>13} {'save (ms)':>10}")
+        for run in range(REPEATS):
+            df_prices, load_ms = timed(processing.load_prices, store, processing.DAYS, provider)
+            outputs, process_ms = timed(processing.process_prices, df_prices)
+            _, save_ms = timed(processing.save_outputs, *outputs)
+            print(f"{run:>4} {load_ms:>10.1f} {process_ms:>13.1f} {save_ms:>10.1f}")
+        store.close()
+
+    start = time.perf_counter()
+    ticks = sum(1 for _ in provider.stream())
+    elapsed = time.perf_counter() - start
+    print(f"\nreplay stream: {ticks} ticks in {elapsed * 1000:.1f} ms ({ticks / elapsed:,.0f} ticks/s, no throttling)")
+
+    throttled = replay_provider(speedup=86_400 * 50)
+    start = time.perf_counter()
+    ticks = sum(1 for _ in throttled.stream(["bitcoin"]))
+    print(f"replay stream at 50 days/s: {ticks} ticks in {time.perf_counter() - start:.1f} s")
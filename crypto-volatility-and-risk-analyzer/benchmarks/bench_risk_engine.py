@@ -0,0 +1,54 @@
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from risk_engine import compute_risk_metrics
+
+# ===============================
+# PER-COIN LOOP vs BATCHED ENGINE
+# ===============================
+# One year of daily log returns for 5, 100 and 1,000 synthetic assets.
+
+DAYS = 365
+ASSET_COUNTS = [5, 100, 1000]
+REPEATS = 3
+
+
+# The metrics loop milestone2_processing.py used before the engine
+def loop_metrics(df_returns, benchmark):
+    btc_returns = df_returns[benchmark]
+    rows = []
+    for coin in df_returns.columns:
+        returns = df_returns[coin]
+        daily_vol = returns.std()
+        cov = np.cov(returns, btc_returns)[0][1]
+        var = np.var(btc_returns)
+        rows.append([daily_vol, daily_vol * np.sqrt(252), returns.mean() / daily_vol, cov / var])
+    return rows
+
+
+def best_of(func, *args):
+    timings = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        func(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+if __name__ == "__main__":
+    rng = np.random.default_rng(0)
+
+    print(f"{'assets':>7} {'loop (ms)':>10} {'engine (ms)':>12} {'speed-up':>9}")
+    for count in ASSET_COUNTS:
+        columns = ["bitcoin"] + [f"asset{i}" for i in range(count - 1)]
+        df_returns = pd.DataFrame(rng.normal(0, 0.03, size=(DAYS, count)), columns=columns)
+
+        loop = best_of(loop_metrics, df_returns, "bitcoin")
+        engine = best_of(compute_risk_metrics, df_returns, "bitcoin")
+        print(f"{count:>7} {loop * 1000:>10.1f} {engine * 1000:>12.1f} {loop / engine:>8.0f}x")
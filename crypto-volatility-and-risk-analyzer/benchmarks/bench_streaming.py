@@ -0,0 +1,57 @@
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from stub_exchange_ws import start_stub_ws_server, stop_stub_ws_server
+from streaming import PriceStream
+
+# ===============================
+# TICK LATENCY & THROUGHPUT
+# ===============================
+# One persistent connection to the local exchange stub, fanned out to
+# several subscribers. Reports ticks/s and latency from the exchange
+# timestamp to the subscriber, versus one REST poll round-trip per refresh.
+
+SUBSCRIBERS = 4
+DURATION = 5
+COINS = ["bitcoin", "ethereum", "solana", "cardano", "dogecoin", "litecoin", "ripple", "polkadot"]
+
+
+def run(tick_interval, drop_after=0):
+    server, url = start_stub_ws_server(tick_interval=tick_interval, drop_after=drop_after)
+    stream = PriceStream(url=url, coins=COINS).start()
+    subscriptions = [stream.subscribe() for _ in range(SUBSCRIBERS)]
+
+    received = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < DURATION:
+        for subscription in subscriptions:
+            ticks = subscription.drain()
+            stream.record_render(ticks)
+            received += len(ticks)
+        time.sleep(0.01)
+    elapsed = time.perf_counter() - start
+
+    stream.stop()
+    stop_stub_ws_server(server)
+    return stream.stats(), received / SUBSCRIBERS / elapsed
+
+
+def fmt(summary):
+    if not summary["count"]:
+        return "n/a"
+    return f"p50 {summary['p50_ms']:.2f} ms  p95 {summary['p95_ms']:.2f} ms  max {summary['max_ms']:.2f} ms"
+
+
+if __name__ == "__main__":
+    for label, interval, drop_after in [
+        ("paced (10 ticks/s/coin)", 0.1, 0),
+        ("flat out", 0.0, 0),
+        ("flat out, drop every 5000", 0.0, 5000),
+    ]:
+        stats, rate = run(interval, drop_after)
+        print(f"{label}: {rate:,.0f} ticks/s per subscriber, {stats['connects']} connection(s)")
+        print(f"  exchange -> stream     {fmt(stats['network_latency'])}")
+        print(f"  stream   -> subscriber {fmt(stats['screen_latency'])}")
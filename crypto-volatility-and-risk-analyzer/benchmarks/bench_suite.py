@@ -0,0 +1,361 @@
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+import warnings
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import milestone2_processing as processing
+from downsample import downsample_series
+from feature_cache import Features
+from horizons import multi_horizon_metrics
+from portfolio import PortfolioModel
+from risk_engine import compute_risk_metrics
+from rolling_corr import rolling_matrices
+from utils import calculate_metrics
+
+# ===============================
+# CONFIGURATION
+# ===============================
+# Every stage runs on synthetic Date x asset price panels across asset
+# counts, history lengths and bar resolutions. Network, price store and
+# snapshot I/O are mocked, so only the computation is measured.
+#
+#   python benchmarks/bench_suite.py                  compare with baseline.json
+#   python benchmarks/bench_suite.py --save-baseline  record a new baseline
+#
+# The process exits 1 when a case is slower (or peaks higher in memory)
+# than its baseline by more than --threshold. Times are stored and
+# compared as multiples of a fixed calibration loop run in the same
+# process (re-timed before every case, to follow load changes during the
+# run), so a baseline recorded on one machine holds on another.
+#
+# Every stage needs the whole panel in memory, so the default grid is the
+# (resolution, assets, years) cases that fit MAX_CELLS prices. Asking for
+# a larger case with --assets / --years / --resolutions is an error rather
+# than a silent skip; raise --max-cells to run it anyway.
+
+RESOLUTIONS = {"daily": 1, "hourly": 24, "minute": 24 * 60}
+FREQ = {"daily": "D", "hourly": "h", "minute": "min"}
+
+MAX_CELLS = 5_000_000
+# (resolution, assets, years); minute bars for 10 years of 1,000 assets
+# would be 5 billion prices
+GRID = [
+    ("daily", 5, 1), ("daily", 100, 1), ("daily", 1000, 1),
+    ("daily", 5, 10), ("daily", 100, 10), ("daily", 1000, 10),
+    ("hourly", 5, 1), ("hourly", 100, 1), ("hourly", 5, 10),
+    ("minute", 5, 1),
+]
+REPEATS = 3
+THRESHOLD = 0.25
+# Cases faster / smaller than this are too noisy to flag
+MIN_SECONDS = 0.005
+MIN_PEAK_MB = 1.0
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+COINS = list(processing.coins)
+
+
+# ===============================
+# SYNTHETIC DATA
+# ===============================
+
+# Geometric random walk; the first column is the "bitcoin" benchmark, and
+# 5-asset panels use the real coin ids so the milestone 2 pipeline runs
+def synthetic_panel(n_assets, years, resolution, seed=0):
+    periods = years * 365 * RESOLUTIONS[resolution]
+    rng = np.random.default_rng(seed)
+    vol = rng.uniform(0.02, 0.06, n_assets) / np.sqrt(RESOLUTIONS[resolution])
+    returns = rng.standard_normal((periods, n_assets)) * vol
+    columns = COINS if n_assets == len(COINS) else ["bitcoin"] + [f"asset_{i}" for i in range(1, n_assets)]
+    index = pd.date_range("2015-01-01", periods=periods, freq=FREQ[resolution])
+    return pd.DataFrame(100 * np.exp(returns.cumsum(axis=0)), index=index, columns=columns)
+
+
+# Price store stand-in for milestone2_processing.load_prices
+class FakeStore:
+    def __init__(self, panel):
+        self.panel = panel
+
+    def sync(self, coins, days, resolution="daily", provider=None):
+        return 0
+
+    def read_panel(self, coins, start=None, resolution="daily"):
+        return self.panel[list(coins)]
+
+
+# ===============================
+# STAGES
+# ===============================
+# Each stage is (run, fits): run(ctx) does the work on prepared inputs,
+# fits(n_assets, rows, resolution) says whether the case is in scope.
+
+def _context(panel):
+    returns = np.log(panel / panel.shift(1)).dropna()
+    return {"panel": panel, "returns": returns, "features": Features("bench", panel)}
+
+
+# Per-coin metrics as app.py computes them, for every asset of the panel
+def stage_calculate_metrics(ctx):
+    for column in ctx["panel"].columns:
+        calculate_metrics(pd.DataFrame({"price": ctx["panel"][column].to_numpy()}))
+
+
+def stage_log_returns(ctx):
+    panel = ctx["panel"]
+    np.log(panel / panel.shift(1)).dropna()
+
+
+def stage_risk_metrics(ctx):
+    compute_risk_metrics(ctx["returns"], benchmark="bitcoin")
+
+
+def stage_horizons(ctx):
+    multi_horizon_metrics(ctx["returns"], [30, 90, 365], benchmark="bitcoin")
+
+
+# MA30 / Vol30 columns and the price + returns join of process_prices
+def stage_rolling_features(ctx):
+    prices, returns = ctx["panel"].copy(), ctx["returns"].copy()
+    for column in prices.columns:
+        prices[f"{column}_MA30"] = prices[column].rolling(30).mean()
+        returns[f"{column}_Vol30"] = returns[column].rolling(30).std()
+    prices.join(returns.add_suffix("_return"))
+
+
+# load_prices + process_prices with the store and snapshots mocked out
+def stage_pipeline(ctx):
+    with mock.patch("vol_forecast.read_snapshot", return_value=None), \
+            mock.patch("vol_forecast.publish_snapshot"):
+        processing.process_prices(processing.load_prices(store=FakeStore(ctx["panel"])))
+
+
+def stage_features(ctx):
+    Features("bench", ctx["panel"])
+
+
+# Milestone 3 trace preparation: slice the last half of five assets and
+# downsample price and rolling volatility to the chart budget
+def stage_window_downsample(ctx):
+    features = ctx["features"]
+    columns = list(ctx["panel"].columns[:5])
+    start = features.prices.index[len(features.prices) // 2]
+    prices = features.price_window(columns, start)
+    vols = features.vol_window(columns, start)
+    for column in columns:
+        downsample_series(prices[column], method="minmax")
+        downsample_series(vols[column])
+
+
+def stage_rolling_corr(ctx):
+    rolling_matrices(ctx["returns"], window=30, cache_dir=None)
+
+
+def stage_portfolio(ctx):
+    PortfolioModel(ctx["returns"]).risk()
+
+
+def _always(n_assets, rows, resolution):
+    return True
+
+
+STAGES = {
+    "utils.calculate_metrics": (stage_calculate_metrics, _always),
+    "m2.log_returns": (stage_log_returns, _always),
+    "m2.risk_metrics": (stage_risk_metrics, _always),
+    "m2.horizons": (stage_horizons, _always),
+    "m2.rolling_features": (stage_rolling_features, _always),
+    "m2.pipeline": (stage_pipeline, lambda n, rows, res: n == len(COINS) and res == "daily"),
+    "m3.features": (stage_features, _always),
+    "m3.window_downsample": (stage_window_downsample, _always),
+    # steps x N x N float64 scratch and float32 output
+    "m3.rolling_corr": (stage_rolling_corr, lambda n, rows, res: rows * n * n * 8 <= 512 * 2 ** 20),
+    "m3.portfolio": (stage_portfolio, _always),
+}
+
+
+# ===============================
+# MEASUREMENT
+# ===============================
+
+# Fixed NumPy / pandas workload (rolling windows, a matmul, elementwise
+# logs) of roughly the suite's mix; its time is the unit baselines use
+def _calibration_loop():
+    rng = np.random.default_rng(0)
+    values = rng.standard_normal((200_000, 20))
+    frame = pd.DataFrame(values)
+    frame.rolling(30).std()
+    frame.rolling(30).mean()
+    values.T @ values
+    np.log(np.abs(values) + 1)
+
+
+def calibrate(repeats=3):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        _calibration_loop()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def measure(run, ctx, repeats, memory=True):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        run(ctx)
+        timings.append(time.perf_counter() - start)
+        # One run is enough for the slow cases
+        if timings[-1] > 2.0:
+            break
+
+    peak = float("nan")
+    if memory:
+        tracemalloc.start()
+        try:
+            run(ctx)
+            peak = tracemalloc.get_traced_memory()[1] / 2 ** 20
+        finally:
+            tracemalloc.stop()
+    return min(timings), peak
+
+
+def _cells(case):
+    resolution, n_assets, n_years = case
+    return n_years * 365 * RESOLUTIONS[resolution] * n_assets
+
+
+# Cases over max_cells prices, for main() to refuse
+def oversized(cases, max_cells=MAX_CELLS):
+    return [case for case in cases if _cells(case) > max_cells]
+
+
+def run_suite(cases, stages, repeats=REPEATS, memory=True):
+    rows = []
+    for resolution, n_assets, n_years in cases:
+        n_rows = n_years * 365 * RESOLUTIONS[resolution]
+        case = f"{resolution}/{n_assets}x{n_years}y"
+
+        ctx = _context(synthetic_panel(n_assets, n_years, resolution))
+        calibration = calibrate()
+        print(f"{'calibration':<26} {case:<20} {calibration * 1000:>10.1f} ms", flush=True)
+        for name in stages:
+            run, fits = STAGES[name]
+            if not fits(n_assets, n_rows, resolution):
+                continue
+            seconds, peak = measure(run, ctx, repeats, memory)
+            rows.append({
+                "Case": f"{name}/{case}",
+                "Stage": name,
+                "Resolution": resolution,
+                "Assets": n_assets,
+                "Years": n_years,
+                "Seconds": seconds,
+                "Calibration": calibration,
+                "Relative": seconds / calibration,
+                "Cells/s": n_rows * n_assets / seconds,
+                "Peak MB": peak,
+            })
+            print(f"{name:<26} {case:<20} {seconds * 1000:>10.1f} ms  {seconds / calibration:>8.3f} x  "
+                  f"{peak:>9.1f} MB", flush=True)
+    return pd.DataFrame(rows)
+
+
+# ===============================
+# BASELINE
+# ===============================
+
+# "relative" is seconds / calibration seconds; no absolute times are kept
+def save_baseline(results, path=BASELINE):
+    baseline = {
+        row["Case"]: {"relative": row["Relative"], "peak_mb": None if np.isnan(row["Peak MB"]) else row["Peak MB"]}
+        for row in results.to_dict("records")
+    }
+    with open(path, "w") as f:
+        json.dump(baseline, f, indent=2, sort_keys=True)
+
+
+# Cases slower or heavier than baseline * (1 + threshold); times are
+# compared in calibration units and reported in this machine's ms
+def regressions(results, baseline, threshold=THRESHOLD):
+    found = []
+    for row in results.to_dict("records"):
+        base = baseline.get(row["Case"])
+        if base is None:
+            continue
+        expected = base["relative"] * row["Calibration"]
+        if expected >= MIN_SECONDS and row["Relative"] > base["relative"] * (1 + threshold):
+            found.append((row["Case"], "time", expected * 1000, row["Seconds"] * 1000, "ms"))
+        peak = base.get("peak_mb")
+        if peak and peak >= MIN_PEAK_MB and row["Peak MB"] > peak * (1 + threshold):
+            found.append((row["Case"], "memory", peak, row["Peak MB"], "MB"))
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the metrics and processing stages")
+    parser.add_argument("--assets", type=int, nargs="+", help="with --years / --resolutions, replaces the default grid")
+    parser.add_argument("--years", type=int, nargs="+")
+    parser.add_argument("--resolutions", nargs="+", choices=list(RESOLUTIONS))
+    parser.add_argument("--stages", nargs="+", choices=list(STAGES), default=list(STAGES))
+    parser.add_argument("--max-cells", type=int, default=MAX_CELLS)
+    parser.add_argument("--repeats", type=int, default=REPEATS)
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc pass")
+    parser.add_argument("--baseline", default=BASELINE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD)
+    args = parser.parse_args()
+    # The per-column inserts of m2.rolling_features mirror process_prices on purpose
+    warnings.simplefilter("ignore", pd.errors.PerformanceWarning)
+
+    cases = GRID
+    if args.assets or args.years or args.resolutions:
+        cases = [
+            (resolution, n_assets, n_years)
+            for resolution in args.resolutions or list(RESOLUTIONS)
+            for n_years in args.years or sorted({c[2] for c in GRID})
+            for n_assets in args.assets or sorted({c[1] for c in GRID})
+        ]
+    too_big = oversized(cases, args.max_cells)
+    if too_big:
+        names = ", ".join(f"{r}/{a}x{y}y" for r, a, y in too_big)
+        print(f"Cases over {args.max_cells:,} prices: {names}\nRaise --max-cells or narrow the grid")
+        return 2
+
+    results = run_suite(cases, args.stages, args.repeats, not args.no_memory)
+
+    summary = results.pivot_table(index="Stage", columns="Resolution", values="Cells/s", aggfunc="max")
+    print("\nBest throughput (prices/s):")
+    print(summary.map(lambda v: f"{v:,.0f}" if pd.notna(v) else "-").to_string())
+
+    if args.save_baseline:
+        save_baseline(results, args.baseline)
+        print(f"\nBaseline written to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"\nNo baseline at {args.baseline}; run with --save-baseline first")
+        return 0
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+
+    found = regressions(results, baseline, args.threshold)
+    if not found:
+        print(f"\nNo regressions beyond {args.threshold:.0%} of baseline")
+        return 0
+    print(f"\n{len(found)} regression(s) beyond {args.threshold:.0%} of baseline:")
+    for case, kind, before, after, unit in found:
+        print(f"  {case:<50} {kind:<6} {before:>10.1f} -> {after:>10.1f} {unit}")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,56 @@
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from vol_forecast import fit_volatility_models
+
+# ===============================
+# DAILY REFIT TIMINGS
+# ===============================
+# Simulated GARCH(1,1) returns for many assets. A cold fit (grid + pattern
+# search) is followed by "tomorrow's" refit with one more day of data,
+# warm-started from the cached parameters, serially and on a process pool.
+
+DAYS = 1000
+ASSETS = [10, 100, 250]
+
+
+def simulate(n_assets, days, seed=0):
+    rng = np.random.default_rng(seed)
+    alpha = rng.uniform(0.05, 0.15, n_assets)
+    beta = np.minimum(rng.uniform(0.75, 0.9, n_assets), 0.97 - alpha)
+    long_run = 0.03 ** 2
+    s2 = np.full(n_assets, long_run)
+    R = np.empty((days, n_assets))
+    for t in range(days):
+        R[t] = np.sqrt(s2) * rng.standard_normal(n_assets)
+        s2 = (1 - alpha - beta) * long_run + alpha * R[t] ** 2 + beta * s2
+    index = pd.date_range("2020-01-01", periods=days)
+    return pd.DataFrame(R, index=index, columns=[f"asset_{i}" for i in range(n_assets)]), alpha, beta
+
+
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    workers = os.cpu_count() or 1
+    print(f"{'assets':>6} {'cold':>8} {'warm x1':>8} {f'warm x{workers}':>8}  (s)  mean |alpha err| |beta err|")
+    for n in ASSETS:
+        returns, alpha, beta = simulate(n, DAYS + 1)
+        with tempfile.TemporaryDirectory() as tmp:
+            os.chdir(tmp)
+            report, cold_s = timed(fit_volatility_models, returns.iloc[:-1], workers=1)
+            _, warm_s = timed(fit_volatility_models, returns, workers=1)
+            _, warm_parallel_s = timed(fit_volatility_models, returns, workers=workers)
+        a_err = np.abs(report["GARCH Alpha"].to_numpy() - alpha).mean()
+        b_err = np.abs(report["GARCH Beta"].to_numpy() - beta).mean()
+        print(f"{n:>6} {cold_s:>8.2f} {warm_s:>8.2f} {warm_parallel_s:>8.2f}       {a_err:.3f}       {b_err:.3f}")
@@ -0,0 +1,108 @@
+import json
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+
+# ===============================
+# LOCAL COINGECKO STUB
+# ===============================
+# Serves deterministic synthetic data on the same paths as CoinGecko:
+#   /api/v3/coins/<coin>/market_chart?vs_currency=usd&days=N
+#   /api/v3/simple/price?ids=a,b&vs_currencies=usd
+# `latency` simulates the round-trip, `rate_limit_every` answers every
+# Nth request with a 429 so retry/backoff paths can be exercised.
+
+DAY_MS = 86_400_000
+
+
+def synthetic_prices(coin, days, end_ms=None):
+    end_ms = end_ms if end_ms is not None else int(time.time() // 86_400) * DAY_MS
+    days = int(days)
+    rng = np.random.default_rng(zlib.crc32(coin.encode()))
+    start_price = 10 ** rng.uniform(-1, 5)
+    walk = rng.normal(0.0, 0.03, size=4000).cumsum()
+
+    timestamps = end_ms - DAY_MS * np.arange(days, -1, -1)
+    offsets = (timestamps // DAY_MS) % len(walk)
+    prices = start_price * np.exp(walk[offsets])
+    return [[int(t), float(p)] for t, p in zip(timestamps, prices)]
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status, payload, headers=None):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.request_count += 1
+            count = server.request_count
+
+        if server.latency:
+            time.sleep(server.latency)
+
+        if server.rate_limit_every and count % server.rate_limit_every == 0:
+            self._send(429, {"status": {"error_code": 429}}, {"Retry-After": "0"})
+            return
+
+        url = urlparse(self.path)
+        query = {k: v[0] for k, v in parse_qs(url.query).items()}
+        parts = url.path.strip("/").split("/")
+
+        if parts[-1] == "market_chart" and len(parts) >= 2:
+            coin = parts[-2]
+            prices = synthetic_prices(coin, query.get("days", 30))
+            self._send(200, {"prices": prices, "market_caps": [], "total_volumes": []})
+        elif parts[-2:] == ["simple", "price"]:
+            ids = query.get("ids", "").split(",")
+            payload = {}
+            for coin in filter(None, ids):
+                last = synthetic_prices(coin, 1)
+                payload[coin] = {
+                    "usd": last[-1][1],
+                    "usd_24h_change": (last[-1][1] / last[0][1] - 1) * 100,
+                    "usd_24h_vol": 1e9,
+                }
+            self._send(200, payload)
+        else:
+            self._send(404, {"error": "not found"})
+
+
+# Start the stub on a free localhost port; returns (server, base_url)
+def start_stub_server(latency=0.0, rate_limit_every=0):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubHandler)
+    server.daemon_threads = True
+    server.latency = latency
+    server.rate_limit_every = rate_limit_every
+    server.request_count = 0
+    server.lock = threading.Lock()
+
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    host, port = server.server_address
+    return server, f"http://{host}:{port}/api/v3"
+
+
+if __name__ == "__main__":
+    server, base_url = start_stub_server(latency=0.1)
+    print(f"CoinGecko stub listening on {base_url} (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.shutdown()
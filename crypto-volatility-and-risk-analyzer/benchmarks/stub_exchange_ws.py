@@ -0,0 +1,84 @@
+import json
+import threading
+import time
+import zlib
+from datetime import datetime, timezone
+
+import numpy as np
+from websockets.exceptions import ConnectionClosed
+from websockets.sync.server import serve
+
+# ===============================
+# LOCAL EXCHANGE WEBSOCKET STUB
+# ===============================
+# Speaks the Coinbase Exchange feed protocol on ws://127.0.0.1:<port>/:
+# after a {"type": "subscribe", "product_ids": [...], "channels": [...]}
+# message it streams "ticker" messages for those products, one random-walk
+# step every `tick_interval` seconds per product, stamped with the send
+# time so receivers can measure latency. `drop_after` closes each
+# connection after that many ticks to exercise reconnects.
+
+
+def _iso_now():
+    return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+# One connection: read the subscribe message, then stream ticks
+def _handle(server, ws):
+    message = json.loads(ws.recv())
+    products = message.get("product_ids", [])
+    rngs = {p: np.random.default_rng(zlib.crc32(p.encode())) for p in products}
+    prices = {p: 10 ** rngs[p].uniform(-1, 5) for p in products}
+    sent = 0
+    try:
+        while not server.stopped.is_set():
+            for product in products:
+                prices[product] *= float(np.exp(rngs[product].normal(0.0, 0.001)))
+                ws.send(json.dumps({
+                    "type": "ticker",
+                    "product_id": product,
+                    "price": f"{prices[product]:.8f}",
+                    "open_24h": f"{prices[product] * 0.98:.8f}",
+                    "volume_24h": "12345.6",
+                    "time": _iso_now(),
+                }))
+                sent += 1
+                if server.drop_after and sent >= server.drop_after:
+                    ws.close()
+                    return
+            if sent % (50 * max(len(products), 1)) == 0:
+                ws.ping(b"hb")
+            if server.tick_interval:
+                time.sleep(server.tick_interval)
+    except (ConnectionClosed, OSError):
+        pass
+
+
+# Start the stub on a free localhost port; returns (server, url)
+def start_stub_ws_server(tick_interval=0.1, drop_after=0):
+    server = serve(lambda ws: _handle(server, ws), "127.0.0.1", 0)
+    server.tick_interval = tick_interval
+    server.drop_after = drop_after
+    server.stopped = threading.Event()
+
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    host, port = server.socket.getsockname()[:2]
+    return server, f"ws://{host}:{port}/"
+
+
+def stop_stub_ws_server(server):
+    server.stopped.set()
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    server, url = start_stub_ws_server()
+    print(f"Exchange WebSocket stub listening on {url} (Ctrl+C to stop)")
+    print(f"Run the dashboard with CRYPTO_STREAM_URL={url}")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        stop_stub_ws_server(server)
@@ -0,0 +1,72 @@
+import json
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+# ===============================
+# COLUMNAR MEMMAP FORMAT
+# ===============================
+# A directory holding one .npy file per column, the DatetimeIndex as
+# int64 nanoseconds in index.npy, and a schema.json sidecar:
+#
+#   data/processed_crypto_data/
+#       schema.json  index.npy  bitcoin.npy  ethereum.npy ...
+#
+# Files are opened with mmap_mode="r", so loading a subset of columns
+# and a date range reads only those bytes and returns views, not copies.
+
+COLUMNAR_DIR = "data/processed_crypto_data"
+
+
+def write_columnar(df, path=COLUMNAR_DIR):
+    tmp_path = path + ".tmp"
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    os.makedirs(tmp_path)
+
+    index = pd.DatetimeIndex(df.index).as_unit("ns")
+    np.save(os.path.join(tmp_path, "index.npy"), index.asi8)
+
+    schema = {"index": df.index.name or "Date", "rows": len(df), "columns": {}}
+    for column in df.columns:
+        values = df[column].to_numpy()
+        np.save(os.path.join(tmp_path, f"{column}.npy"), values)
+        schema["columns"][column] = str(values.dtype)
+
+    with open(os.path.join(tmp_path, "schema.json"), "w") as f:
+        json.dump(schema, f, indent=2)
+
+    # Swap the finished directory in so readers never see a half-written one
+    old_path = path + ".old"
+    shutil.rmtree(old_path, ignore_errors=True)
+    if os.path.exists(path):
+        os.rename(path, old_path)
+    os.rename(tmp_path, path)
+    shutil.rmtree(old_path, ignore_errors=True)
+
+
+def read_schema(path=COLUMNAR_DIR):
+    with open(os.path.join(path, "schema.json")) as f:
+        return json.load(f)
+
+
+# Load selected columns between start and end (inclusive) as a Date-indexed frame
+def load_columnar(path=COLUMNAR_DIR, columns=None, start=None, end=None):
+    schema = read_schema(path)
+    columns = list(schema["columns"]) if columns is None else list(columns)
+
+    index = np.load(os.path.join(path, "index.npy"), mmap_mode="r")
+    lo = 0 if start is None else np.searchsorted(index, pd.Timestamp(start).as_unit("ns").value, "left")
+    hi = len(index) if end is None else np.searchsorted(index, pd.Timestamp(end).as_unit("ns").value, "right")
+
+    data = {
+        column: np.load(os.path.join(path, f"{column}.npy"), mmap_mode="r")[lo:hi]
+        for column in columns
+    }
+    dates = pd.DatetimeIndex(np.asarray(index[lo:hi]).view("datetime64[ns]"), name=schema["index"])
+    return pd.DataFrame(data, index=dates, copy=False)
+
+
+def has_columnar(path=COLUMNAR_DIR):
+    return os.path.exists(os.path.join(path, "schema.json"))
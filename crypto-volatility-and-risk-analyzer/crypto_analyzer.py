@@ -2,15 +2,17 @@
 # Crypto Volatility & Risk Analyzer (Simple)
 # ===========================================
 
-import yfinance as yf
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
+from providers import get_provider
 
 # 1. Download Bitcoin Data (1 year)
-btc = yf.Ticker("BTC-USD")
-data = btc.history(period="1y")
+# Source from CRYPTO_DATA_PROVIDER (providers.DEFAULT_PROVIDER); replay reads
+# the fixtures in data/replay/, so the files written below never feed back in
+provider = get_provider()
+data = provider.history("bitcoin", period="1y")
 
 # Save raw data
 data.to_csv("crypto_prices.csv")
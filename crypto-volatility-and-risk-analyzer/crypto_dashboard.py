@@ -1,8 +1,11 @@
 import streamlit as st
-import requests
 import pandas as pd
 import plotly.graph_objs as go
+from collections import deque
 from datetime import datetime
+from data_access import get_price_history, get_simple_prices, cache_stats
+from downsample import downsample_series
+from streaming import get_stream, release
 
 st.set_page_config(page_title="Crypto Dashboard", layout="wide")
 
@@ -89,6 +92,10 @@ with left:
     # Refresh button
     refresh = st.button("🔄 Refresh Data", key="refresh", help="Fetch latest crypto values")
 
+    # Streaming mode: ticks arrive over one shared WebSocket connection and
+    # only the live panel reruns, instead of re-polling on every refresh
+    streaming = st.toggle("⚡ Streaming mode", key="streaming", help="Live exchange ticks over WebSocket")
+
     # Show live updated timestamp
     now = datetime.now().strftime("%Y-%m-%d  %H:%M:%S")
     st.markdown(f"#### 🕒 Last Updated: *{now}*")
@@ -101,43 +108,94 @@ with left:
 
 coins = ["bitcoin", "ethereum", "solana", "cardano", "dogecoin", "litecoin", "ripple", "polkadot"]
 
-def fetch_data():
-    url = "https://api.coingecko.com/api/v3/simple/price"
-    params = {
-        "ids": ",".join(coins),
-        "vs_currencies": "usd",
-        "include_24hr_vol": "true",
-        "include_24hr_change": "true"
-    }
-    return requests.get(url, params=params).json()
+STREAM_REFRESH = 1.0
+LIVE_TICKS = 300
+
+# A Refresh click bypasses the 60 s cache and the ingestion snapshot
+def fetch_data(refresh=False):
+    return get_simple_prices(coins, refresh=refresh)
 
-data = fetch_data()
+# Streaming mode takes prices from the push feed instead of polling REST
+data = get_stream().prices() if streaming else fetch_data(refresh)
 
 # ============================================
 # LIVE TABLE
 # ============================================
 
-rows = []
-for coin in coins:
-    price = data[coin]["usd"]
-    change = data[coin]["usd_24h_change"]
-    volume = data[coin]["usd_24h_vol"]
-
-    arrow = "📈" if change >= 0 else "📉"
-
-    rows.append([
-        coin.title(),
-        f"${price:,.2f}",
-        f"{arrow} {change:.2f}%",
-        f"${volume/1_000_000_000:.2f}B"
+def render_live_table(data):
+    rows = []
+    for coin in coins:
+        if coin not in data:
+            continue
+        price = data[coin]["usd"]
+        change = data[coin]["usd_24h_change"] or 0.0
+        volume = data[coin]["usd_24h_vol"]
+
+        arrow = "📈" if change >= 0 else "📉"
+
+        rows.append([
+            coin.title(),
+            f"${price:,.2f}",
+            f"{arrow} {change:.2f}%",
+            f"${volume/1_000_000_000:.2f}B"
+        ])
+
+    df = pd.DataFrame(rows, columns=[
+        "Cryptocurrency", "Price (USD)", "24h Change", "Volume (24h)"
     ])
 
-df = pd.DataFrame(rows, columns=[
-    "Cryptocurrency", "Price (USD)", "24h Change", "Volume (24h)"
-])
-
-
-st.dataframe(df, use_container_width=True, height=380)
+    st.dataframe(df, use_container_width=True, height=380)
+
+
+# Reruns on its own every STREAM_REFRESH seconds; drains this session's
+# ticks, appends them to the live chart and reports tick-to-screen latency
+@st.fragment(run_every=STREAM_REFRESH)
+def live_panel():
+    stream = get_stream()
+    subscription = st.session_state.get("tick_subscription")
+    # Idle subscriptions are reaped by the bus (e.g. after streaming was
+    # switched off for a while); take a fresh one
+    if subscription is None or subscription.closed:
+        st.session_state["tick_subscription"] = stream.subscribe()
+    if "live_ticks" not in st.session_state:
+        st.session_state["live_ticks"] = {c: deque(maxlen=LIVE_TICKS) for c in ["bitcoin", "ethereum", "solana"]}
+
+    ticks = st.session_state["tick_subscription"].drain()
+    history = st.session_state["live_ticks"]
+    for tick in ticks:
+        if tick["coin"] in history:
+            history[tick["coin"]].append((datetime.fromtimestamp(tick["received"]), tick["price"]))
+
+    # Coins appear as their first tick arrives
+    render_live_table(stream.prices())
+
+    fig_live = go.Figure()
+    for coin, points in history.items():
+        if points:
+            times, prices = zip(*points)
+            fig_live.add_trace(go.Scatter(x=times, y=prices, mode="lines", name=coin.title()))
+    fig_live.update_layout(template="plotly_dark", title="Live Ticks", height=300)
+    st.plotly_chart(fig_live, use_container_width=True)
+
+    stream.record_render(ticks)
+    stats = stream.stats()
+    latency = stats["screen_latency"]
+    status = "🟢 connected" if stats["connected"] else "🔴 reconnecting"
+    if latency["count"]:
+        st.caption(
+            f"Stream {status} • {stats['ticks']:,} ticks • tick-to-screen "
+            f"p50 {latency['p50_ms']:.0f} ms / p95 {latency['p95_ms']:.0f} ms"
+        )
+    else:
+        st.caption(f"Stream {status} • waiting for ticks")
+
+
+if streaming:
+    live_panel()
+else:
+    if "tick_subscription" in st.session_state:
+        release(st.session_state.pop("tick_subscription"))
+    render_live_table(data)
 st.markdown("</div>", unsafe_allow_html=True)
 
 
@@ -147,35 +205,46 @@ st.markdown("</div>", unsafe_allow_html=True)
 
 st.markdown("## 📈 7-Day Price Trend")
 
-hist_url = "https://api.coingecko.com/api/v3/coins/{}/market_chart"
-trend = {}
+# No REST history requests while streaming; the live chart covers it
+if streaming:
+    st.caption("Paused in streaming mode — see the live ticks above.")
+else:
+    trend = {}
 
-for coin in ["bitcoin", "ethereum", "solana"]:
-    r = requests.get(hist_url.format(coin), params={"vs_currency": "usd", "days": 7}).json()
-    trend[coin] = [p[1] for p in r["prices"]]
+    for coin in ["bitcoin", "ethereum", "solana"]:
+        # Date-indexed, so the x axis shows times rather than row positions
+        trend[coin] = downsample_series(get_price_history(coin, 7).set_index("date")["price"], method="minmax")
 
-fig1 = go.Figure()
-fig1.add_trace(go.Scatter(y=trend["bitcoin"], mode="lines+markers", name="BTC"))
-fig1.add_trace(go.Scatter(y=trend["ethereum"], mode="lines+markers", name="ETH"))
-fig1.update_layout(template="plotly_dark", title="BTC & ETH 7-Day Trend")
+    fig1 = go.Figure()
+    fig1.add_trace(go.Scatter(x=trend["bitcoin"].index, y=trend["bitcoin"], mode="lines+markers", name="BTC"))
+    fig1.add_trace(go.Scatter(x=trend["ethereum"].index, y=trend["ethereum"], mode="lines+markers", name="ETH"))
+    fig1.update_layout(template="plotly_dark", title="BTC & ETH 7-Day Trend")
 
-fig2 = go.Figure()
-fig2.add_trace(go.Scatter(y=trend["solana"], mode="lines+markers", name="SOL"))
-fig2.update_layout(template="plotly_dark", title="Solana 7-Day Trend")
+    fig2 = go.Figure()
+    fig2.add_trace(go.Scatter(x=trend["solana"].index, y=trend["solana"], mode="lines+markers", name="SOL"))
+    fig2.update_layout(template="plotly_dark", title="Solana 7-Day Trend")
 
-c1, c2 = st.columns(2)
-c1.plotly_chart(fig1, use_container_width=True)
-c2.plotly_chart(fig2, use_container_width=True)
+    c1, c2 = st.columns(2)
+    c1.plotly_chart(fig1, use_container_width=True)
+    c2.plotly_chart(fig2, use_container_width=True)
 # VOLUME CHART
 # ============================================
 
 st.markdown("## 📊 24h Trading Volume")
 
-volume_values = [data[c]["usd_24h_vol"] for c in coins]
+volume_coins = [c for c in coins if c in data]
+volume_values = [data[c]["usd_24h_vol"] for c in volume_coins]
 
-fig3 = go.Figure([go.Bar(x=[c.title() for c in coins], y=volume_values)])
+fig3 = go.Figure([go.Bar(x=[c.title() for c in volume_coins], y=volume_values)])
 fig3.update_layout(template="plotly_dark", title="24h Trading Volume")
 
 st.plotly_chart(fig3, use_container_width=True)
 
 
+
+
+stats = cache_stats()
+st.caption(
+    f"Data cache: {stats['hits']} hits / {stats['misses']} misses "
+    f"({stats['hit_rate']:.0%} hit rate, {stats['entries']} entries)"
+)
@@ -0,0 +1,141 @@
+import threading
+import time
+from collections import OrderedDict
+
+from providers import get_provider
+from utils import fetch_crypto_data
+from snapshots import read_snapshot
+
+# ===============================
+# CONFIGURATION
+# ===============================
+
+# Seconds a cached response stays fresh, per endpoint
+TTL = {
+    "market_chart": 300,
+    "simple_price": 60,
+}
+MAX_ENTRIES = 256
+
+# Live prices published by ingestion_service.py are used while this fresh
+LIVE_SNAPSHOT_MAX_AGE = 120
+
+
+# ===============================
+# TTL + LRU CACHE
+# ===============================
+
+# Process-wide cache: every Streamlit session in this server shares it.
+# Concurrent misses on the same key wait for a single upstream call.
+class TTLCache:
+    def __init__(self, max_entries=MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._key_locks = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _lookup(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires, value = entry
+        if expires < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def get_or_load(self, key, ttl, loader):
+        with self._lock:
+            entry = self._lookup(key)
+            if entry is not None:
+                self.hits += 1
+                return entry[1]
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            # Another session may have loaded it while we waited
+            with self._lock:
+                entry = self._lookup(key)
+                if entry is not None:
+                    self.hits += 1
+                    return entry[1]
+                self.misses += 1
+
+            # The key's lock is dropped even when the loader raises
+            try:
+                value = loader()
+                with self._lock:
+                    self._entries[key] = (time.monotonic() + ttl, value)
+                    self._entries.move_to_end(key)
+                    while len(self._entries) > self.max_entries:
+                        self._entries.popitem(last=False)
+                        self.evictions += 1
+            finally:
+                with self._lock:
+                    self._key_locks.pop(key, None)
+            return value
+
+    def invalidate(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "entries": len(self._entries),
+                "evictions": self.evictions,
+            }
+
+
+cache = TTLCache()
+
+
+# ===============================
+# CACHED ENDPOINTS
+# ===============================
+
+# [date, price] history for one coin; callers get their own copy to mutate
+def get_price_history(coin, days):
+    df = cache.get_or_load(
+        ("market_chart", coin, days),
+        TTL["market_chart"],
+        lambda: fetch_crypto_data(coin, days)
+    )
+    return df.copy()
+
+
+# simple/price payload with 24h volume and change for several coins;
+# refresh=True skips the live snapshot and the cached entry and asks the
+# provider again (the result is cached as usual)
+def get_simple_prices(coins, vs_currency="usd", refresh=False):
+    coins = tuple(coins)
+    key = ("simple_price", coins, vs_currency)
+
+    if refresh:
+        cache.invalidate(key)
+    else:
+        snapshot = read_snapshot("live_prices", max_age=LIVE_SNAPSHOT_MAX_AGE)
+        if snapshot and vs_currency == "usd" and all(coin in snapshot for coin in coins):
+            return snapshot
+
+    def load():
+        with get_provider() as provider:
+            return provider.simple_price(coins, vs_currency)
+
+    return cache.get_or_load(key, TTL["simple_price"], load)
+
+
+def cache_stats():
+    return cache.stats()
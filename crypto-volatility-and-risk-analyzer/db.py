@@ -0,0 +1,221 @@
+import os
+import sqlite3
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+# ===============================
+# CONFIGURATION
+# ===============================
+
+# mysql (default) or sqlite for a local stand-in
+DB_BACKEND = os.environ.get("CRYPTO_DB_BACKEND", "mysql")
+
+DB_CONFIG = {
+    "host": os.environ.get("CRYPTO_DB_HOST", "localhost"),
+    "user": os.environ.get("CRYPTO_DB_USER", "root"),
+    "password": os.environ.get("CRYPTO_DB_PASSWORD", "Mysql@123"),
+    "database": os.environ.get("CRYPTO_DB_NAME", "crypto_risk_db"),
+    "connection_timeout": 3,
+}
+SQLITE_PATH = os.environ.get("CRYPTO_DB_SQLITE_PATH", "data/crypto_risk_db.sqlite")
+
+POOL_SIZE = 5
+CHECKOUT_TIMEOUT = 10
+# Idle connections older than this are pinged before being handed out
+HEALTH_CHECK_AFTER = 30
+
+
+class PoolTimeout(Exception):
+    pass
+
+
+# ===============================
+# CONNECTION POOL
+# ===============================
+
+# Bounded pool: at most `size` connections exist; callers beyond that wait
+# up to `timeout` seconds for one to be returned, then get PoolTimeout
+class ConnectionPool:
+    def __init__(self, connect, size=POOL_SIZE, timeout=CHECKOUT_TIMEOUT,
+                 health_check_after=HEALTH_CHECK_AFTER, placeholder="%s"):
+        self._connect = connect
+        self.size = size
+        self.timeout = timeout
+        self.health_check_after = health_check_after
+        self.placeholder = placeholder
+
+        self._idle = deque()
+        self._cond = threading.Condition()
+        self._created = 0
+        self._in_use = 0
+        self._waiters = 0
+        self._checkouts = 0
+        self._timeouts = 0
+        self._replaced = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+
+    # Rewrites %s placeholders for drivers that use ? (sqlite3)
+    def sql(self, query):
+        return query if self.placeholder == "%s" else query.replace("%s", self.placeholder)
+
+    @staticmethod
+    def _is_healthy(conn):
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT 1")
+            cursor.fetchall()
+            cursor.close()
+            return True
+        except Exception:
+            return False
+
+    @staticmethod
+    def _close_quietly(conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def _discard(self, conn):
+        self._close_quietly(conn)
+        with self._cond:
+            self._created -= 1
+            self._in_use -= 1
+            self._cond.notify()
+
+    def acquire(self, timeout=None):
+        timeout = self.timeout if timeout is None else timeout
+        start = time.monotonic()
+        deadline = start + timeout
+
+        with self._cond:
+            self._waiters += 1
+            try:
+                while True:
+                    if self._idle:
+                        conn, returned_at = self._idle.pop()
+                        break
+                    if self._created < self.size:
+                        self._created += 1
+                        conn, returned_at = None, None
+                        break
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._timeouts += 1
+                        raise PoolTimeout(f"no database connection free after {timeout:.1f}s")
+                    self._cond.wait(remaining)
+            finally:
+                self._waiters -= 1
+            self._in_use += 1
+
+            waited = time.monotonic() - start
+            self._checkouts += 1
+            self._total_wait += waited
+            self._max_wait = max(self._max_wait, waited)
+
+        # Connecting and pinging happen outside the lock
+        if conn is not None and time.monotonic() - returned_at > self.health_check_after:
+            if not self._is_healthy(conn):
+                self._close_quietly(conn)
+                conn = None
+                with self._cond:
+                    self._replaced += 1
+        if conn is None:
+            try:
+                conn = self._connect()
+            except Exception:
+                with self._cond:
+                    self._created -= 1
+                    self._in_use -= 1
+                    self._cond.notify()
+                raise
+        return conn
+
+    def release(self, conn):
+        with self._cond:
+            self._in_use -= 1
+            self._idle.append((conn, time.monotonic()))
+            self._cond.notify()
+
+    # Rolls back on return (ending any open read snapshot); uncommitted
+    # writes are discarded, and an unusable connection is dropped
+    def _reset_and_release(self, conn):
+        try:
+            conn.rollback()
+        except Exception:
+            self._discard(conn)
+        else:
+            self.release(conn)
+
+    @contextmanager
+    def connection(self, timeout=None):
+        conn = self.acquire(timeout)
+        try:
+            yield conn
+        finally:
+            self._reset_and_release(conn)
+
+    # Cursor that is always closed; commits on success when commit=True
+    @contextmanager
+    def cursor(self, commit=False, timeout=None):
+        with self.connection(timeout) as conn:
+            cursor = conn.cursor()
+            try:
+                yield cursor
+                if commit:
+                    conn.commit()
+            finally:
+                cursor.close()
+
+    def stats(self):
+        with self._cond:
+            return {
+                "size": self.size,
+                "open": self._created,
+                "idle": len(self._idle),
+                "in_use": self._in_use,
+                "waiters": self._waiters,
+                "checkouts": self._checkouts,
+                "timeouts": self._timeouts,
+                "replaced": self._replaced,
+                "avg_wait_ms": self._total_wait / self._checkouts * 1000 if self._checkouts else 0.0,
+                "max_wait_ms": self._max_wait * 1000,
+            }
+
+    def close_all(self):
+        with self._cond:
+            while self._idle:
+                self._close_quietly(self._idle.pop()[0])
+                self._created -= 1
+
+
+# ===============================
+# SHARED POOL
+# ===============================
+
+def mysql_connect():
+    import mysql.connector
+    return mysql.connector.connect(**DB_CONFIG)
+
+
+def sqlite_connect(path=SQLITE_PATH):
+    return sqlite3.connect(path, check_same_thread=False)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+# Process-wide pool shared by every Streamlit session
+def get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            if DB_BACKEND == "sqlite":
+                _pool = ConnectionPool(sqlite_connect, placeholder="?")
+            else:
+                _pool = ConnectionPool(mysql_connect)
+        return _pool
@@ -1,21 +1,14 @@
 import streamlit as st
-import mysql.connector
-
-def get_connection():
-    return mysql.connector.connect(
-        host="localhost",
-        user="root",
-        password="Mysql@123",
-        database="crypto_risk_db"
-    )
+from db import get_pool
 
 st.title("Database Connection Test")
 
+pool = get_pool()
+
 try:
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("SELECT * FROM User")
-    data = cursor.fetchall()
+    with pool.cursor() as cursor:
+        cursor.execute("SELECT * FROM User")
+        data = cursor.fetchall()
 
     st.success("Database connected successfully!")
     st.write("User table data:")
@@ -23,4 +16,7 @@ try:
 
 except Exception as e:
     st.error("Database connection failed")
-    st.write(e)
\ No newline at end of file
+    st.write(e)
+
+st.write("Connection pool:")
+st.json(pool.stats())
@@ -0,0 +1,198 @@
+import sqlite3
+import time
+
+import pandas as pd
+
+from db import get_pool
+
+# ===============================
+# SCHEMA (crypto_risk_db)
+# ===============================
+
+SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS price_history (
+        asset VARCHAR(16) NOT NULL,
+        ts DATETIME NOT NULL,
+        price DOUBLE NOT NULL,
+        PRIMARY KEY (asset, ts)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS risk_metrics (
+        asset VARCHAR(16) NOT NULL,
+        as_of DATE NOT NULL,
+        horizon INT NOT NULL,
+        daily_volatility DOUBLE,
+        annual_volatility DOUBLE,
+        sharpe_ratio DOUBLE,
+        beta DOUBLE,
+        var_95 DOUBLE,
+        PRIMARY KEY (asset, as_of, horizon)
+    )
+    """,
+]
+
+# Metrics are read by horizon, newest as_of first
+INDEXES = [
+    "CREATE INDEX idx_risk_metrics_horizon ON risk_metrics (horizon, as_of)",
+]
+
+BATCH_SIZE = 1000
+# After a failed read the dashboards skip the database for this many
+# seconds instead of waiting out the connection timeout on every rerun
+OFFLINE_BACKOFF = 60
+# MySQL ER_DUP_KEYNAME
+DUPLICATE_INDEX_ERRNO = 1061
+
+METRIC_COLUMNS = {
+    "Daily Volatility": "daily_volatility",
+    "Annual Volatility": "annual_volatility",
+    "Sharpe Ratio": "sharpe_ratio",
+    "Beta (vs BTC)": "beta",
+    "VaR 95": "var_95",
+}
+
+
+def create_tables(pool=None):
+    pool = pool or get_pool()
+    with pool.cursor(commit=True) as cursor:
+        for statement in SCHEMA:
+            cursor.execute(statement)
+
+    # MySQL has no CREATE INDEX IF NOT EXISTS; only "already exists" is ignored
+    for statement in INDEXES:
+        try:
+            with pool.cursor(commit=True) as cursor:
+                cursor.execute(statement)
+        except Exception as e:
+            if not _index_exists(e):
+                raise
+
+
+def _index_exists(error):
+    if isinstance(error, sqlite3.OperationalError):
+        return "already exists" in str(error)
+    return getattr(error, "errno", None) == DUPLICATE_INDEX_ERRNO
+
+
+# INSERT ... that overwrites the non-key columns when the key already exists
+def _upsert_sql(pool, table, columns, keys):
+    names = ", ".join(columns)
+    values = ", ".join([pool.placeholder] * len(columns))
+    updates = [c for c in columns if c not in keys]
+
+    if pool.placeholder == "?":
+        assignments = ", ".join(f"{c}=excluded.{c}" for c in updates)
+        conflict = f"ON CONFLICT ({', '.join(keys)}) DO UPDATE SET {assignments}"
+    else:
+        assignments = ", ".join(f"{c}=VALUES({c})" for c in updates)
+        conflict = f"ON DUPLICATE KEY UPDATE {assignments}"
+    return f"INSERT INTO {table} ({names}) VALUES ({values}) {conflict}"
+
+
+# executemany in batches inside one transaction; safe to re-run (idempotent)
+def _bulk_upsert(pool, table, columns, keys, rows):
+    query = _upsert_sql(pool, table, columns, keys)
+    with pool.cursor(commit=True) as cursor:
+        for i in range(0, len(rows), BATCH_SIZE):
+            cursor.executemany(query, rows[i:i + BATCH_SIZE])
+    return len(rows)
+
+
+def _none_if_nan(value):
+    return None if pd.isna(value) else float(value)
+
+
+# ===============================
+# WRITES
+# ===============================
+
+# Wide Date x asset price frame -> price_history rows
+def write_prices(df_prices, asset_names=None, pool=None):
+    pool = pool or get_pool()
+    long = df_prices.rename(columns=asset_names or {}).stack().dropna()
+    rows = [
+        (asset, ts.strftime("%Y-%m-%d %H:%M:%S"), float(price))
+        for (ts, asset), price in long.items()
+    ]
+    return _bulk_upsert(pool, "price_history", ["asset", "ts", "price"], ["asset", "ts"], rows)
+
+
+# Horizon metrics frame (milestone2_processing.py's horizons_df) -> risk_metrics rows
+def write_metrics(horizons_df, as_of, pool=None):
+    pool = pool or get_pool()
+    as_of = pd.Timestamp(as_of).strftime("%Y-%m-%d")
+    columns = ["asset", "as_of", "horizon"] + list(METRIC_COLUMNS.values())
+    rows = [
+        (r["Asset"], as_of, int(r["Horizon"])) + tuple(_none_if_nan(r[c]) for c in METRIC_COLUMNS)
+        for _, r in horizons_df.iterrows()
+    ]
+    return _bulk_upsert(pool, "risk_metrics", columns, ["asset", "as_of", "horizon"], rows)
+
+
+# ===============================
+# NARROW READS
+# ===============================
+
+# Date x asset price frame for the given assets and date range
+def read_prices(assets, start, end, pool=None):
+    if not assets:
+        return pd.DataFrame()
+    pool = pool or get_pool()
+    marks = ", ".join([pool.placeholder] * len(assets))
+    query = pool.sql(
+        f"SELECT ts, asset, price FROM price_history "
+        f"WHERE asset IN ({marks}) AND ts BETWEEN %s AND %s ORDER BY ts"
+    )
+    params = list(assets) + [
+        pd.Timestamp(start).strftime("%Y-%m-%d %H:%M:%S"),
+        pd.Timestamp(end).strftime("%Y-%m-%d 23:59:59"),
+    ]
+    with pool.cursor() as cursor:
+        cursor.execute(query, params)
+        rows = cursor.fetchall()
+
+    df = pd.DataFrame(rows, columns=["Date", "Asset", "Price"])
+    df["Date"] = pd.to_datetime(df["Date"])
+    return df.pivot(index="Date", columns="Asset", values="Price")
+
+
+# Latest metrics for one horizon, optionally limited to some assets
+def read_latest_metrics(horizon, assets=None, pool=None):
+    pool = pool or get_pool()
+    query = (
+        "SELECT * FROM risk_metrics WHERE horizon=%s "
+        "AND as_of=(SELECT MAX(as_of) FROM risk_metrics WHERE horizon=%s)"
+    )
+    params = [horizon, horizon]
+    if assets:
+        query += f" AND asset IN ({', '.join(['%s'] * len(assets))})"
+        params += list(assets)
+
+    with pool.cursor() as cursor:
+        cursor.execute(pool.sql(query), params)
+        columns = [d[0] for d in cursor.description]
+        rows = cursor.fetchall()
+    return pd.DataFrame(rows, columns=columns)
+
+
+# ===============================
+# DASHBOARD READS
+# ===============================
+
+_offline_until = 0.0
+
+
+# read(*args) or None when the database is unreachable; a failure is
+# remembered for OFFLINE_BACKOFF seconds so callers fall back straight away
+def try_read(read, *args, **kwargs):
+    global _offline_until
+    if time.monotonic() < _offline_until:
+        return None
+    try:
+        return read(*args, **kwargs)
+    except Exception as e:
+        _offline_until = time.monotonic() + OFFLINE_BACKOFF
+        print(f"crypto_risk_db unavailable, using local files for {OFFLINE_BACKOFF}s: {e}")
+        return None
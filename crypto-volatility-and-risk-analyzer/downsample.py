@@ -0,0 +1,123 @@
+import numpy as np
+
+# ===============================
+# CONFIGURATION
+# ===============================
+
+# Points per trace: about two per horizontal pixel of a full-width chart.
+# Beyond this the browser draws the same picture, only slower.
+TARGET_POINTS = 1500
+
+
+# ===============================
+# DOWNSAMPLING ALGORITHMS
+# ===============================
+# Both return sorted positions into the input, so callers can subset the
+# matching x values, frames or hover data with them. Cost is O(n) in the
+# number of visible points; the output size depends only on n_out.
+
+# Largest-Triangle-Three-Buckets: keeps the point in each bucket that forms
+# the largest triangle with the previous pick and the next bucket's mean,
+# which follows the shape of the line (spikes included) with few points
+def lttb_indices(x, y, n_out=TARGET_POINTS):
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+
+    # Bucket i covers [bounds[i], bounds[i + 1]); first and last point are fixed
+    every = (n - 2) / (n_out - 2)
+    bounds = (np.arange(n_out - 1) * every).astype(np.int64) + 1
+    bounds[-1] = n - 1
+
+    # Bucket means from running sums; the last bucket looks ahead to the final point
+    cx = np.concatenate(([0.0], np.cumsum(x)))
+    cy = np.concatenate(([0.0], np.cumsum(y)))
+    next_lo = np.append(bounds[1:-1], n - 1)
+    next_hi = np.append(bounds[2:], n)
+    count = next_hi - next_lo
+    avg_x = (cx[next_hi] - cx[next_lo]) / count
+    avg_y = (cy[next_hi] - cy[next_lo]) / count
+
+    out = np.empty(n_out, dtype=np.int64)
+    out[0], out[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = bounds[i], bounds[i + 1]
+        area = np.abs(
+            (x[a] - avg_x[i]) * (y[lo:hi] - y[a])
+            - (x[a] - x[lo:hi]) * (avg_y[i] - y[a])
+        )
+        a = lo + int(area.argmax())
+        out[i + 1] = a
+    return out
+
+
+# Min/max envelope: the lowest and highest point of every bucket, so
+# each peak and trough of the full series survives exactly
+def minmax_indices(y, n_out=TARGET_POINTS):
+    n = len(y)
+    if n_out >= n or n_out < 4:
+        return np.arange(n)
+
+    y = np.asarray(y, dtype=float)
+    size = -(-n // (n_out // 2))
+    buckets = -(-n // size)
+    padded = np.full(buckets * size, np.nan)
+    padded[:n] = y
+    padded = padded.reshape(buckets, size)
+
+    offsets = np.arange(buckets) * size
+    picks = np.concatenate((
+        [0, n - 1],
+        offsets + np.nanargmin(padded, axis=1),
+        offsets + np.nanargmax(padded, axis=1),
+    ))
+    return np.unique(picks)
+
+
+METHODS = {
+    "lttb": lambda x, y, n_out: lttb_indices(x, y, n_out),
+    "minmax": lambda x, y, n_out: minmax_indices(y, n_out),
+}
+
+
+# ===============================
+# SERIES & FRAMES
+# ===============================
+
+def _numeric(x):
+    if x is None:
+        return None
+    values = np.asarray(x)
+    if np.issubdtype(values.dtype, np.datetime64):
+        return values.astype("datetime64[ns]").astype(np.int64).astype(float)
+    return values.astype(float)
+
+
+# Positions to keep from (x, y); NaN points (e.g. a rolling window's warm-up)
+# are dropped first since a line trace doesn't draw them anyway
+def downsample_indices(x, y, n_out=TARGET_POINTS, method="lttb"):
+    y = np.asarray(y, dtype=float)
+    x = np.arange(len(y), dtype=float) if x is None else _numeric(x)
+
+    valid = np.flatnonzero(~np.isnan(y))
+    if len(valid) <= n_out:
+        return valid
+    keep = METHODS[method](x[valid], y[valid], n_out)
+    return valid[keep]
+
+
+# Series with a (Datetime)Index -> reduced series, optionally after slicing
+# to the visible date range so zooming in restores detail
+def downsample_series(series, n_out=TARGET_POINTS, method="lttb", start=None, end=None):
+    if start is not None or end is not None:
+        series = series.loc[start:end]
+    return series.iloc[downsample_indices(series.index, series.to_numpy(), n_out, method)]
+
+
+# Rows of df to plot for the y column against the x column
+def downsample_frame(df, x, y, n_out=TARGET_POINTS, method="lttb"):
+    return df.iloc[downsample_indices(df[x], df[y], n_out, method)]
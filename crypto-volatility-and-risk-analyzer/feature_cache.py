@@ -0,0 +1,87 @@
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+from columnar import COLUMNAR_DIR, has_columnar, load_columnar
+
+# ===============================
+# CONFIGURATION
+# ===============================
+
+PRICES_CSV = "data/processed_crypto_data.csv"
+VOL_WINDOWS = [30]
+MA_WINDOWS = [30]
+
+
+# ===============================
+# DATA VERSION
+# ===============================
+
+# Changes whenever milestone2_processing.py rewrites the price data
+def data_version(columnar_path=COLUMNAR_DIR, csv_path=PRICES_CSV):
+    if has_columnar(columnar_path):
+        path = os.path.join(columnar_path, "schema.json")
+    else:
+        path = csv_path
+    stat = os.stat(path)
+    return f"{path}:{stat.st_mtime_ns}:{stat.st_size}"
+
+
+def load_prices(columns, columnar_path=COLUMNAR_DIR, csv_path=PRICES_CSV):
+    if has_columnar(columnar_path):
+        prices = load_columnar(columnar_path, columns=columns)
+    else:
+        prices = pd.read_csv(csv_path, parse_dates=["Date"], usecols=["Date"] + list(columns))
+        prices = prices.set_index("Date")
+    return prices.sort_index()
+
+
+# ===============================
+# FEATURE CACHE
+# ===============================
+
+# Wide Date x asset frames computed once per data version. Rolling
+# features run over the full history, so a date window sliced out of
+# them matches what the full computation gives for those dates.
+class Features:
+    def __init__(self, version, prices, vol_windows=VOL_WINDOWS, ma_windows=MA_WINDOWS):
+        self.version = version
+        self.prices = prices
+        self.returns = prices.pct_change()
+        self.log_returns = np.log(prices / prices.shift(1))
+        self.rolling_vol = {w: self.returns.rolling(window=w).std() for w in vol_windows}
+        self.rolling_ma = {w: prices.rolling(window=w).mean() for w in ma_windows}
+
+    # Date range (inclusive) and asset columns of a feature frame
+    @staticmethod
+    def window(frame, columns, start=None, end=None):
+        return frame.loc[start:end, columns]
+
+    def price_window(self, columns, start=None, end=None):
+        return self.window(self.prices, columns, start, end)
+
+    def vol_window(self, columns, start=None, end=None, window=VOL_WINDOWS[0]):
+        return self.window(self.rolling_vol[window], columns, start, end)
+
+    def ma_window(self, columns, start=None, end=None, window=MA_WINDOWS[0]):
+        return self.window(self.rolling_ma[window], columns, start, end)
+
+
+_features = {}
+_features_lock = threading.Lock()
+
+
+# Process-wide, so every Streamlit session and rerun shares one copy;
+# only the latest version for each column set is kept
+def get_features(columns, columnar_path=COLUMNAR_DIR, csv_path=PRICES_CSV):
+    columns = tuple(columns)
+    version = data_version(columnar_path, csv_path)
+    with _features_lock:
+        features = _features.get(columns)
+        if features is None or features.version != version:
+            prices = load_prices(columns, columnar_path, csv_path)
+            features = Features(version, prices)
+            _features[columns] = features
+        return features
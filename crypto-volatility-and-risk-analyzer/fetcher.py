@@ -0,0 +1,167 @@
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+
+# ===============================
+# CONFIGURATION
+# ===============================
+
+BASE_URL = os.environ.get("COINGECKO_API_URL", "https://api.coingecko.com/api/v3")
+
+MAX_WORKERS = 8
+MAX_RETRIES = 5
+BACKOFF_SECONDS = 1.0
+REQUEST_TIMEOUT = 30
+
+# CoinGecko's public tier allows roughly 30 calls/minute
+CALLS_PER_SECOND = 0.5
+BURST = 10
+
+
+# ===============================
+# PER-HOST RATE LIMITER
+# ===============================
+
+# Token bucket per host; a 429 pauses the whole host, not just one worker
+class HostRateLimiter:
+    def __init__(self, rate=CALLS_PER_SECOND, burst=BURST):
+        self.rate = rate
+        self.burst = burst
+        self._lock = threading.Lock()
+        self._tokens = {}
+        self._updated = {}
+        self._paused_until = {}
+
+    def acquire(self, host):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                paused = self._paused_until.get(host, 0.0) - now
+                if paused <= 0:
+                    elapsed = now - self._updated.get(host, now)
+                    tokens = min(self.burst, self._tokens.get(host, self.burst) + elapsed * self.rate)
+                    self._updated[host] = now
+                    if tokens >= 1:
+                        self._tokens[host] = tokens - 1
+                        return
+                    self._tokens[host] = tokens
+                    wait = (1 - tokens) / self.rate
+                else:
+                    wait = paused
+            time.sleep(wait)
+
+    def pause(self, host, seconds):
+        with self._lock:
+            until = time.monotonic() + seconds
+            self._paused_until[host] = max(self._paused_until.get(host, 0.0), until)
+
+
+# ===============================
+# CONCURRENT FETCHER
+# ===============================
+
+class CoinGeckoFetcher:
+    def __init__(self, base_url=BASE_URL, max_workers=MAX_WORKERS, rate_limiter=None,
+                 max_retries=MAX_RETRIES, backoff=BACKOFF_SECONDS, timeout=REQUEST_TIMEOUT):
+        self.base_url = base_url.rstrip("/")
+        self.host = urlparse(self.base_url).netloc
+        self.max_workers = max_workers
+        self.rate_limiter = rate_limiter if rate_limiter is not None else HostRateLimiter()
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.timeout = timeout
+
+        # One pooled session shared by every worker thread
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_workers)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def close(self):
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def get_json(self, path, params=None):
+        url = f"{self.base_url}/{path.lstrip('/')}"
+
+        for attempt in range(self.max_retries + 1):
+            self.rate_limiter.acquire(self.host)
+            response = self.session.get(url, params=params, timeout=self.timeout)
+
+            if response.status_code == 429 or response.status_code >= 500:
+                if attempt == self.max_retries:
+                    response.raise_for_status()
+                retry_after = response.headers.get("Retry-After")
+                if retry_after is not None and retry_after.isdigit():
+                    delay = float(retry_after)
+                else:
+                    delay = self.backoff * (2 ** attempt) * (1 + random.random())
+                if response.status_code == 429:
+                    self.rate_limiter.pause(self.host, delay)
+                else:
+                    time.sleep(delay)
+                continue
+
+            response.raise_for_status()
+            return response.json()
+
+    # Fetch one coin's market_chart as a [timestamp, price] frame
+    def market_chart(self, coin, days, vs_currency="usd", interval=None):
+        params = {"vs_currency": vs_currency, "days": days}
+        if interval:
+            params["interval"] = interval
+        data = self.get_json(f"coins/{coin}/market_chart", params)
+        return pd.DataFrame(data["prices"], columns=["timestamp", "price"])
+
+    # Fetch many coins at once; `days` may be a single value or a {coin: days} dict
+    def market_charts(self, coins, days, vs_currency="usd", interval=None):
+        coins = list(coins)
+        days_for = days if isinstance(days, dict) else dict.fromkeys(coins, days)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            futures = {
+                coin: pool.submit(self.market_chart, coin, days_for[coin], vs_currency, interval)
+                for coin in coins
+            }
+            return {coin: future.result() for coin, future in futures.items()}
+
+    # Aligned price panel: Date index, one column per coin, rows present for every coin
+    def price_panel(self, coins, days, vs_currency="usd", interval=None):
+        charts = self.market_charts(coins, days, vs_currency, interval)
+        return align_prices(charts)
+
+
+# Combine per-coin [timestamp, price] frames into one Date-indexed panel
+def align_prices(charts):
+    columns = []
+    for coin, prices in charts.items():
+        series = pd.Series(
+            prices["price"].to_numpy(),
+            index=pd.to_datetime(prices["timestamp"], unit="ms"),
+            name=coin
+        )
+        columns.append(series)
+
+    df_prices = pd.concat(columns, axis=1)
+    df_prices.index.name = "Date"
+    df_prices = df_prices.dropna()
+    df_prices.sort_index(inplace=True)
+    return df_prices
+
+
+# Fetch an aligned price panel for several coins concurrently
+def fetch_price_panel(coins, days=365, vs_currency="usd", **kwargs):
+    with CoinGeckoFetcher(**kwargs) as fetcher:
+        return fetcher.price_panel(coins, days, vs_currency)
@@ -0,0 +1,67 @@
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+
+# ===============================
+# MULTI-HORIZON METRICS
+# ===============================
+
+HORIZONS = [30, 90, 365]
+
+
+# Prefix sums with a leading zero row, so a window sum is S[end] - S[start]
+def _prefix(values):
+    out = np.zeros((values.shape[0] + 1,) + values.shape[1:])
+    np.cumsum(values, axis=0, out=out[1:])
+    return out
+
+
+# Vol, Sharpe, beta and parametric VaR over the trailing window of each horizon.
+# One pass builds the prefix sums; every horizon then costs O(1) per asset.
+# A horizon longer than the history gets NaN metrics, not a shorter window.
+def multi_horizon_metrics(returns, horizons=HORIZONS, benchmark="bitcoin",
+                          periods_per_year=252, confidence=0.95):
+    assets = returns.columns
+    X = returns.to_numpy(dtype=float)
+    b = X[:, assets.get_loc(benchmark)]
+    n = X.shape[0]
+
+    S_x = _prefix(X)
+    S_xx = _prefix(X * X)
+    S_xb = _prefix(X * b[:, None])
+    S_b = _prefix(b)
+    S_bb = _prefix(b * b)
+    z = NormalDist().inv_cdf(confidence)
+
+    var_column = f"VaR {confidence * 100:.0f}"
+    frames = []
+    for horizon in horizons:
+        if horizon > n:
+            frames.append(pd.DataFrame({
+                "Asset": assets,
+                "Horizon": horizon,
+                **{c: np.nan for c in ["Daily Volatility", "Annual Volatility", "Sharpe Ratio", "Beta", var_column]}
+            }))
+            continue
+        h = horizon
+        lo = n - h
+
+        mean = (S_x[n] - S_x[lo]) / h
+        var = (S_xx[n] - S_xx[lo] - h * mean ** 2) / (h - 1)
+        mean_b = (S_b[n] - S_b[lo]) / h
+        var_b = (S_bb[n] - S_bb[lo] - h * mean_b ** 2) / (h - 1)
+        cov_b = (S_xb[n] - S_xb[lo] - h * mean * mean_b) / (h - 1)
+
+        daily_vol = np.sqrt(np.maximum(var, 0.0))
+        frames.append(pd.DataFrame({
+            "Asset": assets,
+            "Horizon": horizon,
+            "Daily Volatility": daily_vol,
+            "Annual Volatility": daily_vol * np.sqrt(periods_per_year),
+            "Sharpe Ratio": mean / daily_vol,
+            "Beta": cov_b / var_b,
+            var_column: z * daily_vol - mean
+        }))
+
+    return pd.concat(frames, ignore_index=True)
@@ -0,0 +1,209 @@
+import argparse
+import hashlib
+import heapq
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import pandas as pd
+
+import milestone2_processing as processing
+from price_store import get_store
+from providers import get_provider
+from snapshots import publish_snapshot, read_snapshot
+from instrumentation import maybe_export, timed
+
+# ===============================
+# CONFIGURATION
+# ===============================
+
+# Same coins as the live table in crypto_dashboard.py
+LIVE_COINS = ["bitcoin", "ethereum", "solana", "cardano", "dogecoin", "litecoin", "ripple", "polkadot"]
+
+LIVE_INTERVAL = 60
+HISTORY_INTERVAL = 24 * 60 * 60
+
+
+def log(message):
+    print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] {message}", flush=True)
+
+
+# ===============================
+# JOB SCHEDULER
+# ===============================
+
+class Job:
+    def __init__(self, name, interval, func):
+        self.name = name
+        self.interval = interval
+        self.func = func
+        self.running = False
+        self.runs = 0
+        self.last_run = None
+        self.last_duration = None
+        self.last_error = None
+
+
+# Runs each job on its own cadence in a small thread pool; a job that is
+# still running when it comes due again is skipped rather than stacked
+class Scheduler:
+    def __init__(self, jobs, max_workers=4):
+        self.jobs = jobs
+        self._pool = ThreadPoolExecutor(max_workers=max_workers)
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+
+    def _run(self, job):
+        start = time.perf_counter()
+        try:
+            with timed(f"job.{job.name}"):
+                result = job.func()
+            job.last_error = None
+            log(f"{job.name}: {result}")
+        except Exception as e:
+            job.last_error = repr(e)
+            log(f"{job.name} failed: {e!r}")
+        finally:
+            with self._lock:
+                job.running = False
+                job.runs += 1
+                job.last_run = time.time()
+                job.last_duration = time.perf_counter() - start
+            self._publish_status()
+            maybe_export()
+
+    def _publish_status(self):
+        with self._lock:
+            status = {
+                job.name: {
+                    "interval": job.interval,
+                    "runs": job.runs,
+                    "last_run": job.last_run,
+                    "last_duration": job.last_duration,
+                    "last_error": job.last_error,
+                }
+                for job in self.jobs
+            }
+        publish_snapshot("service_status", status)
+
+    def run_forever(self):
+        queue = [(time.monotonic(), i, job) for i, job in enumerate(self.jobs)]
+        heapq.heapify(queue)
+
+        try:
+            while not self._stop.is_set():
+                due, i, job = queue[0]
+                wait = due - time.monotonic()
+                if wait > 0:
+                    self._stop.wait(wait)
+                    continue
+
+                heapq.heapreplace(queue, (max(due + job.interval, time.monotonic()), i, job))
+                with self._lock:
+                    if job.running:
+                        log(f"{job.name}: previous run still in progress, skipped")
+                        continue
+                    job.running = True
+                self._pool.submit(self._run, job)
+        finally:
+            self._pool.shutdown(wait=True)
+
+    def stop(self):
+        self._stop.set()
+
+
+# ===============================
+# INGESTION JOBS
+# ===============================
+
+# Digest of the panel's values, index and row order (a sum of row hashes
+# would not change when rows are reordered or swapped between dates)
+def panel_version(df):
+    row_hashes = pd.util.hash_pandas_object(df, index=True).to_numpy()
+    return hashlib.sha1(row_hashes.tobytes()).hexdigest()[:16]
+
+
+# panel_version per coin column, plus "index" for the dates alone, so a
+# refresh can tell which coins' histories actually changed
+def panel_versions(df):
+    versions = {coin: panel_version(df[[coin]]) for coin in df.columns}
+    versions["index"] = panel_version(df.index.to_frame(index=False))
+    return versions
+
+
+class IngestionService:
+    def __init__(self, live_coins=LIVE_COINS):
+        self.live_coins = live_coins
+        self.provider = get_provider()
+        self.store = get_store()
+        # Resume from the last published version so a restart doesn't force a recompute
+        self.data_version = (read_snapshot("data_version") or {}).get("version")
+        # Per-column versions and process_prices outputs of the last run; kept
+        # in memory only, so the first change after a restart recomputes fully
+        self.versions = {}
+        self.outputs = None
+
+    # Live prices -> data/snapshots/live_prices.json
+    def refresh_live(self):
+        payload = self.provider.simple_price(self.live_coins)
+        publish_snapshot("live_prices", payload)
+        return f"{len(payload)} live prices published"
+
+    # History tail -> metrics. Skipped when the aligned panel is unchanged.
+    # When only some coins' histories changed on the same dates (a provider
+    # backfill or correction), their per-asset metrics and GARCH fits are
+    # recomputed and the rest reused; a new day moves every column, so it
+    # reruns process_prices in full.
+    def refresh_history(self):
+        df_prices = processing.load_prices(self.store, provider=self.provider)
+        version = panel_version(df_prices)
+        if version == self.data_version:
+            return "no new history, metrics unchanged"
+
+        versions = panel_versions(df_prices)
+        changed = [coin for coin in df_prices.columns if versions[coin] != self.versions.get(coin)]
+        if self.outputs is None or versions["index"] != self.versions.get("index"):
+            changed = list(df_prices.columns)
+            outputs = processing.process_prices(df_prices)
+        else:
+            outputs = processing.update_prices(df_prices, self.outputs, changed)
+
+        processing.save_outputs(*outputs)
+        self.data_version, self.versions, self.outputs = version, versions, outputs
+        publish_snapshot("data_version", {
+            "version": version,
+            "rows": len(df_prices),
+            "last_date": str(df_prices.index[-1]),
+            "changed": changed,
+        })
+        return f"metrics recomputed for {len(changed)} assets over {len(df_prices)} days (version {version})"
+
+    def jobs(self, live_interval=LIVE_INTERVAL, history_interval=HISTORY_INTERVAL):
+        return [
+            Job("live_prices", live_interval, self.refresh_live),
+            Job("history", history_interval, self.refresh_history),
+        ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Periodic crypto data ingestion service")
+    parser.add_argument("--live-interval", type=float, default=LIVE_INTERVAL,
+                        help="seconds between live price refreshes")
+    parser.add_argument("--history-interval", type=float, default=HISTORY_INTERVAL,
+                        help="seconds between history syncs and metric recomputes")
+    args = parser.parse_args()
+
+    service = IngestionService()
+    scheduler = Scheduler(service.jobs(args.live_interval, args.history_interval))
+    log(f"ingestion service started (live every {args.live_interval:g}s, "
+        f"history every {args.history_interval:g}s)")
+    try:
+        scheduler.run_forever()
+    except KeyboardInterrupt:
+        scheduler.stop()
+        log("ingestion service stopped")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,330 @@
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from functools import wraps
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pandas as pd
+
+from snapshots import atomic_write_text
+
+# ===============================
+# CONFIGURATION
+# ===============================
+
+METRICS_PREFIX = "crypto"
+# One Prometheus text file per process, in the layout node_exporter's
+# textfile collector reads: data/metrics/<process>.prom
+METRICS_DIR = os.environ.get("CRYPTO_METRICS_DIR", "data/metrics")
+# Minimum seconds between metrics file rewrites from a dashboard
+EXPORT_INTERVAL = 10
+# Serve /metrics on this port when set
+METRICS_PORT = os.environ.get("CRYPTO_METRICS_PORT")
+METRICS_HOST = os.environ.get("CRYPTO_METRICS_HOST", "127.0.0.1")
+# Show the per-rerun stage table in the dashboards' sidebars by default
+DEBUG_PANEL = os.environ.get("CRYPTO_DEBUG_PANEL", "0") == "1"
+
+# Metrics file / label name for this process; derived from the main script
+# when unset (see process_name)
+PROCESS = os.environ.get("CRYPTO_METRICS_PROCESS")
+
+# Latency histogram buckets, seconds
+BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+# Stage names are dotted, grouped by their first part:
+#   fetch.*   network / store / file reads
+#   compute.* pandas and NumPy transforms
+#   render.*  figure building and HTML
+#   io.*      writes
+
+
+# "app" for `streamlit run app.py` or `python app.py`; processes without a
+# script (python -c, a REPL) get "python-<pid>" so they never share a file
+def process_name():
+    if PROCESS:
+        return PROCESS
+    script = None
+    if "streamlit" in sys.modules:
+        try:
+            from streamlit.runtime.scriptrunner import get_script_run_ctx
+            ctx = get_script_run_ctx()
+            script = getattr(ctx, "main_script_path", None) if ctx else None
+        except ImportError:
+            pass
+    if script is None and sys.argv and sys.argv[0].endswith(".py"):
+        script = sys.argv[0]
+    if script is None:
+        return f"python-{os.getpid()}"
+    return os.path.splitext(os.path.basename(script))[0]
+
+
+def log(message):
+    print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] {message}", flush=True)
+
+
+# ===============================
+# REGISTRY
+# ===============================
+
+# Process-wide latency histograms per stage and free-form counters
+class Registry:
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = buckets
+        self._stages = {}
+        self._counters = {}
+        self._lock = threading.Lock()
+
+    def observe(self, stage, seconds, error=False):
+        with self._lock:
+            entry = self._stages.get(stage)
+            if entry is None:
+                entry = self._stages[stage] = {
+                    "buckets": [0] * len(self.buckets), "sum": 0.0, "count": 0, "errors": 0, "max": 0.0
+                }
+            for i, bound in enumerate(self.buckets):
+                if seconds <= bound:
+                    entry["buckets"][i] += 1
+            entry["sum"] += seconds
+            entry["count"] += 1
+            entry["errors"] += int(error)
+            entry["max"] = max(entry["max"], seconds)
+
+    def count(self, name, value=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    # Calls, total / mean / max milliseconds and errors per stage
+    def stage_summary(self):
+        with self._lock:
+            rows = [
+                {"Stage": stage, "Calls": e["count"], "Total ms": e["sum"] * 1000,
+                 "Mean ms": e["sum"] * 1000 / e["count"], "Max ms": e["max"] * 1000, "Errors": e["errors"]}
+                for stage, e in self._stages.items()
+            ]
+        return pd.DataFrame(rows, columns=["Stage", "Calls", "Total ms", "Mean ms", "Max ms", "Errors"])
+
+    # Prometheus text exposition format (version 0.0.4)
+    def prometheus_text(self, process=None):
+        process = process or process_name()
+        name = f"{METRICS_PREFIX}_stage_seconds"
+        with self._lock:
+            stages = {stage: dict(e, buckets=list(e["buckets"])) for stage, e in self._stages.items()}
+            counters = dict(self._counters)
+
+        lines = [f"# HELP {name} Wall time of instrumented pipeline stages.", f"# TYPE {name} histogram"]
+        for stage, e in sorted(stages.items()):
+            labels = _labels(process=process, stage=stage)
+            for bound, n in zip(self.buckets, e["buckets"]):
+                lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {n}')
+            lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {e["count"]}')
+            lines.append(f"{name}_sum{{{labels}}} {e['sum']:.9f}")
+            lines.append(f"{name}_count{{{labels}}} {e['count']}")
+
+        errors = f"{METRICS_PREFIX}_stage_errors_total"
+        lines += [f"# HELP {errors} Instrumented stages that raised.", f"# TYPE {errors} counter"]
+        for stage, e in sorted(stages.items()):
+            lines.append(f"{errors}{{{_labels(process=process, stage=stage)}}} {e['errors']}")
+
+        by_name = {}
+        for (counter, labels), value in counters.items():
+            by_name.setdefault(counter, []).append((labels, value))
+        for counter, series in sorted(by_name.items()):
+            metric = f"{METRICS_PREFIX}_{counter}_total"
+            lines.append(f"# TYPE {metric} counter")
+            for labels, value in sorted(series):
+                lines.append(f"{metric}{{{_labels(process=process, **dict(labels))}}} {value}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(**labels):
+    return ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items())
+
+
+registry = Registry()
+
+
+# ===============================
+# PER-RERUN TRACES
+# ===============================
+# A trace collects the stages timed on one thread between start_trace()
+# and the next start_trace(); Streamlit runs each rerun of a session on
+# its own script thread, so a dashboard's trace is exactly its rerun.
+# Top-level dashboard code is timed with mark(): each call closes a stage
+# that began at the previous mark (or at start_trace()).
+
+_local = threading.local()
+
+
+class Trace:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.last_mark = self.started
+        self.stages = []
+
+    def record(self, stage, seconds):
+        self.stages.append((stage, seconds))
+
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+    # Stages in first-seen order with call counts and milliseconds
+    def summary(self):
+        df = pd.DataFrame(self.stages, columns=["Stage", "Seconds"])
+        grouped = df.groupby("Stage", sort=False)["Seconds"]
+        return pd.DataFrame({
+            "Calls": grouped.size(),
+            "Total ms": grouped.sum() * 1000,
+            "Max ms": grouped.max() * 1000,
+        }).reset_index()
+
+
+def start_trace():
+    _local.trace = Trace()
+    return _local.trace
+
+
+def current_trace():
+    return getattr(_local, "trace", None)
+
+
+def mark(stage):
+    trace = current_trace()
+    if trace is None:
+        return
+    now = time.perf_counter()
+    seconds = now - trace.last_mark
+    registry.observe(stage, seconds)
+    trace.record(stage, seconds)
+    trace.last_mark = time.perf_counter()
+
+
+# ===============================
+# TIMERS
+# ===============================
+
+@contextmanager
+def timed(stage):
+    start = time.perf_counter()
+    error = False
+    try:
+        yield
+    except BaseException:
+        error = True
+        raise
+    finally:
+        seconds = time.perf_counter() - start
+        registry.observe(stage, seconds, error)
+        trace = current_trace()
+        if trace is not None:
+            trace.record(stage, seconds)
+
+
+def instrumented(stage):
+    def decorate(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with timed(stage):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def count(name, value=1, **labels):
+    registry.count(name, value, **labels)
+
+
+# ===============================
+# EXPORT
+# ===============================
+
+def metrics_path(process=None, directory=METRICS_DIR):
+    return os.path.join(directory, f"{process or process_name()}.prom")
+
+
+def write_metrics_file(path=None):
+    path = path or metrics_path()
+    atomic_write_text(path, registry.prometheus_text())
+    return path
+
+
+_last_export = 0.0
+_export_lock = threading.Lock()
+
+
+# Rewrites the metrics file at most every `interval` seconds
+def maybe_export(interval=EXPORT_INTERVAL):
+    global _last_export
+    with _export_lock:
+        if time.monotonic() - _last_export < interval:
+            return
+        _last_export = time.monotonic()
+    try:
+        write_metrics_file()
+    except OSError as e:
+        log(f"Metrics export failed: {e}")
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = registry.prometheus_text().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+_server = None
+_server_lock = threading.Lock()
+
+
+# Serves GET /metrics from a daemon thread; once per process, and a port
+# already taken by another dashboard is logged rather than fatal. Local
+# only unless CRYPTO_METRICS_HOST says otherwise.
+def start_metrics_server(port=METRICS_PORT, host=METRICS_HOST):
+    global _server
+    if not port:
+        return None
+    with _server_lock:
+        if _server is None:
+            try:
+                _server = ThreadingHTTPServer((host, int(port)), _MetricsHandler)
+            except OSError as e:
+                log(f"Metrics endpoint not started on port {port}: {e}")
+                return None
+            threading.Thread(target=_server.serve_forever, daemon=True).start()
+            log(f"Serving metrics on http://{host}:{port}/metrics")
+        return _server
+
+
+# ===============================
+# STREAMLIT DEBUG PANEL
+# ===============================
+
+# Sidebar table of this rerun's stage latencies; also where the dashboards
+# export, since it runs once at the end of every rerun
+def render_debug_panel(trace):
+    import streamlit as st
+
+    start_metrics_server()
+    maybe_export()
+    if not st.sidebar.checkbox("🛠 Show stage timings", value=DEBUG_PANEL):
+        return
+    with st.sidebar.expander("Stage timings (this rerun)", expanded=True):
+        if trace.stages:
+            st.dataframe(trace.summary().round(1), hide_index=True, use_container_width=True)
+        st.caption(f"Rerun so far: {trace.elapsed() * 1000:.0f} ms")
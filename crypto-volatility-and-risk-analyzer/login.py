@@ -1,34 +1,62 @@
 import streamlit as st
-import mysql.connector
+from auth import get_authenticator, RateLimited
 
-def get_connection():
-    return mysql.connector.connect(
-        host="localhost",
-        user="root",
-        password="Mysql@123",
-        database="crypto_risk_db"
-    )
+auth = get_authenticator()
 
 st.title("User Login")
 
+# Authenticated reruns are answered from the session cache, not the database
+user = auth.current_user(st.session_state.get("auth_token"))
+
+if user:
+    st.success("Login successful!")
+    st.write(f"Welcome, {user}")
+    if st.button("Logout"):
+        auth.logout(st.session_state.pop("auth_token", None))
+        st.rerun()
+    st.stop()
+
+# Seconds between checks on a pending login
+LOGIN_POLL = 0.25
+
 username = st.text_input("Username")
 password = st.text_input("Password", type="password")
 
-if st.button("Login"):
+if st.button("Login", disabled="login_future" in st.session_state):
     try:
-        conn = get_connection()
-        cursor = conn.cursor()
+        # Verification runs on the auth pool; this rerun returns immediately
+        st.session_state["login_future"] = auth.begin_login(username, password)
+        st.session_state["login_user"] = username
+
+    except RateLimited as e:
+        st.error(str(e))
 
-        query = "SELECT * FROM User WHERE username=%s AND password_hash=%s"
-        cursor.execute(query, (username, password))
-        user = cursor.fetchone()
 
-        if user:
+# Polls only while a login is pending; once it resolves, a full rerun
+# reports the outcome and no longer calls the fragment
+@st.fragment(run_every=LOGIN_POLL)
+def login_pending():
+    if st.session_state["login_future"].done():
+        st.rerun()
+    st.info("Checking credentials…")
+
+
+future = st.session_state.get("login_future")
+if future is not None and not future.done():
+    login_pending()
+elif future is not None:
+    st.session_state.pop("login_future")
+    login_user = st.session_state.pop("login_user", "")
+    try:
+        token = future.result()
+
+        if token:
+            st.session_state["auth_token"] = token
             st.success("Login successful!")
-            st.write(f"Welcome, {username}")
+            st.write(f"Welcome, {login_user}")
         else:
             st.error("Invalid username or password")
 
     except Exception as e:
         st.error("Error connecting to database")
-        st.write(e)
\ No newline at end of file
+        st.write(e)
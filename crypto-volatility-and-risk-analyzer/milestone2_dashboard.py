@@ -3,9 +3,13 @@ import pandas as pd
 import plotly.express as px
 from datetime import datetime
 import numpy as np
+from db_store import read_latest_metrics, try_read
+from risk_classification import classify, file_version
+from instrumentation import mark, render_debug_panel, start_trace
 
 # -------------------- PAGE SETUP --------------------
 st.set_page_config(page_title="Milestone 2: Crypto Risk Analysis", layout="wide")
+trace = start_trace()
 
 st.markdown("""
 <style>
@@ -31,33 +35,54 @@ with col2:
         unsafe_allow_html=True
     )
 
-# -------------------- LOAD DATA --------------------
-df = pd.read_csv("data/crypto_metrics.csv")
-df.columns = ["Asset", "Daily_Volatility", "Annual_Volatility", "Sharpe_Ratio", "Beta"]
-
 # -------------------- TIME RANGE --------------------
 st.markdown("### 📅 Select Analysis Period")
 period = st.radio("", ["30 Days", "90 Days", "1 Year"], horizontal=True)
 
-factor = {"30 Days": 1.0, "90 Days": 0.9, "1 Year": 0.8}[period]
-df["Volatility"] = df["Daily_Volatility"] * factor
-
-# -------------------- VALUE AT RISK (VaR) --------------------
-df["VaR_95"] = 1.65 * df["Volatility"]
+horizon = {"30 Days": 30, "90 Days": 90, "1 Year": 365}[period]
 
-# -------------------- RISK CLASSIFICATION --------------------
-low = df["Volatility"].quantile(0.33)
-high = df["Volatility"].quantile(0.66)
+# -------------------- LOAD DATA --------------------
+# Real 30/90/365-day metrics precomputed by milestone2_processing.py:
+# only the selected horizon's rows from crypto_risk_db, else the CSV
+HORIZONS_CSV = "data/crypto_metrics_horizons.csv"
+df = try_read(read_latest_metrics, horizon)
+# Database rows carry no file version; they are labelled without the cache
+metrics_version = None
+if df is not None:
+    df = df.rename(columns={
+        "asset": "Asset",
+        "daily_volatility": "Daily_Volatility",
+        "annual_volatility": "Annual_Volatility",
+        "sharpe_ratio": "Sharpe_Ratio",
+        "beta": "Beta",
+        "var_95": "VaR_95"
+    })
 
-def classify_risk(v):
-    if v < low:
-        return "Low"
-    elif v < high:
-        return "Medium"
-    else:
-        return "High"
+if df is None or df.empty:
+    horizons_df = pd.read_csv(HORIZONS_CSV)
+    metrics_version = (file_version(HORIZONS_CSV), horizon)
+    df = horizons_df[horizons_df["Horizon"] == horizon].reset_index(drop=True)
+    df = df.rename(columns={
+        "Daily Volatility": "Daily_Volatility",
+        "Annual Volatility": "Annual_Volatility",
+        "Sharpe Ratio": "Sharpe_Ratio",
+        "Beta (vs BTC)": "Beta",
+        "VaR 95": "VaR_95"
+    })
+# Horizons longer than the stored history are NaN rather than truncated
+if df["Daily_Volatility"].isna().all():
+    st.warning(f"Not enough price history yet for {period} metrics.")
+    st.stop()
+df["Volatility"] = df["Daily_Volatility"]
+mark("fetch.metrics")
 
-df["Risk"] = df["Volatility"].apply(classify_risk)
+# -------------------- RISK CLASSIFICATION --------------------
+# One vectorized call with the rule set every dashboard uses
+df["Risk"] = classify(df.rename(columns={
+    "Daily_Volatility": "Daily Volatility",
+    "Annual_Volatility": "Annual Volatility"
+}), version=metrics_version)
+mark("compute.risk_classification")
 
 def color_value(value, risk):
     color = "low" if risk == "Low" else "med" if risk == "Medium" else "high"
@@ -92,6 +117,7 @@ with left:
     )
     fig.update_layout(template="plotly_dark", yaxis_title="Volatility (%)")
     st.plotly_chart(fig, use_container_width=True)
+    mark("render.volatility_chart")
 
 # -------------------- RIGHT PANEL --------------------
 with right:
@@ -116,7 +142,10 @@ with right:
     })
 
     st.markdown(table.to_html(escape=False, index=False, classes="metric-table"), unsafe_allow_html=True)
+    mark("render.metrics_table")
 
 # -------------------- FOOTER --------------------
 st.markdown("---")
-st.markdown("<p style='text-align:center;'>✅ Milestone 2 Completed – Crypto Risk Dashboard</p>", unsafe_allow_html=True)
\ No newline at end of file
+st.markdown("<p style='text-align:center;'>✅ Milestone 2 Completed – Crypto Risk Dashboard</p>", unsafe_allow_html=True)
+
+render_debug_panel(trace)
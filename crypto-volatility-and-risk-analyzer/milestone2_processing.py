@@ -1,7 +1,16 @@
-import requests
 import pandas as pd
 import numpy as np
-from datetime import datetime
+from price_store import get_store
+from risk_engine import compute_risk_metrics
+from columnar import write_columnar
+from var_engine import portfolio_var_report
+from horizons import multi_horizon_metrics
+from optimizer import efficient_frontier, optimal_allocations
+from rolling_corr import rolling_matrices
+from vol_forecast import fit_volatility_models, garch_term_structure
+from snapshots import atomic_to_csv
+from instrumentation import count, instrumented, timed, write_metrics_file
+import db_store
 
 # ===============================
 # CONFIGURATION
@@ -15,96 +24,191 @@ coins = {
     "dogecoin": "DOGE"
 }
 
-DAYS = 365
-BASE_URL = "https://api.coingecko.com/api/v3/coins/{}/market_chart"
+# One more day than the longest horizon, so the 365-day metrics get 365 returns
+DAYS = 366
 
 # ===============================
 # FETCH HISTORICAL DATA
 # ===============================
 
-price_data = {}
+# Only the days missing from the local store are fetched
+@instrumented("fetch.load_prices")
+def load_prices(store=None, days=DAYS, provider=None):
+    store = store or get_store()
+    store.sync(coins, days, resolution="daily", provider=provider)
 
-for coin in coins:
-    url = BASE_URL.format(coin)
-    params = {"vs_currency": "usd", "days": DAYS}
-    data = requests.get(url, params=params).json()
+    start = pd.Timestamp.now(tz="UTC") - pd.Timedelta(days=days)
+    return store.read_panel(coins, start=start, resolution="daily")
 
-    prices = pd.DataFrame(data["prices"], columns=["timestamp", coin])
-    prices["Date"] = pd.to_datetime(prices["timestamp"], unit="ms")
-    prices.set_index("Date", inplace=True)
-    prices.drop(columns=["timestamp"], inplace=True)
-
-    price_data[coin] = prices
-
-# ===============================
-# COMBINE DATA
-# ===============================
-
-df_prices = pd.concat(price_data.values(), axis=1)
-df_prices = df_prices.dropna()
-df_prices.sort_index(inplace=True)
-
-# ===============================
-# LOG RETURNS
-# ===============================
-
-df_returns = np.log(df_prices / df_prices.shift(1)).dropna()
-
-# ===============================
-# METRICS CALCULATION
-# ===============================
-
-metrics = []
-
-btc_returns = df_returns["bitcoin"]
-
-for coin in coins:
-    returns = df_returns[coin]
-
-    daily_vol = returns.std()
-    annual_vol = daily_vol * np.sqrt(252)
-    sharpe = returns.mean() / daily_vol
-
-    if coin == "bitcoin":
-        beta = 1.0
-    else:
-        cov = np.cov(returns, btc_returns)[0][1]
-        var = np.var(btc_returns)
-        beta = cov / var
-
-    metrics.append([
-        coins[coin],
-        daily_vol,
-        annual_vol,
-        sharpe,
-        beta
-    ])
-
-metrics_df = pd.DataFrame(
-    metrics,
-    columns=["Asset", "Daily Volatility", "Annual Volatility", "Sharpe Ratio", "Beta (vs BTC)"]
-)
 
 # ===============================
-# MOVING AVERAGE & ROLLING VOL
+# PIPELINE STAGES
 # ===============================
+# Per-asset stages (risk metrics, horizon metrics, volatility forecasts)
+# only read their own column and the bitcoin benchmark; the cross-asset
+# stages (VaR, allocations, frontier) read the full covariance.
+
+def log_returns(df_prices):
+    with timed("compute.returns"):
+        return np.log(df_prices / df_prices.shift(1)).dropna()
+
+
+# Vol, Sharpe and beta for every coin in one batched computation
+def risk_metrics(df_returns):
+    with timed("compute.risk_metrics"):
+        metrics_df, cov_matrix, corr_matrix = compute_risk_metrics(df_returns, benchmark="bitcoin")
+
+    metrics_df = metrics_df.rename(columns={"Beta": "Beta (vs BTC)"})
+    metrics_df.insert(0, "Asset", [coins[coin] for coin in metrics_df.index])
+    return metrics_df.reset_index(drop=True)
+
+
+# 30 / 90 / 365 day metrics
+def horizon_metrics(df_returns):
+    with timed("compute.horizons"):
+        horizons_df = multi_horizon_metrics(df_returns, [30, 90, 365], benchmark="bitcoin")
+    horizons_df = horizons_df.rename(columns={"Beta": "Beta (vs BTC)"})
+    horizons_df["Asset"] = horizons_df["Asset"].map(coins)
+    return horizons_df
+
+
+# EWMA / GARCH(1,1) forecasts, warm-started from yesterday's fitted
+# parameters (data/snapshots/vol_models.json)
+def volatility_forecasts(df_returns):
+    with timed("compute.vol_forecast"):
+        forecasts_df = fit_volatility_models(df_returns)
+        forecasts_df = forecasts_df.join(garch_term_structure(forecasts_df).add_prefix("GARCH Vol "))
+        return forecasts_df.rename(index=coins).reset_index()
+
+
+# Portfolio VaR / CVaR (equal weight, 95%), optimal allocations and the
+# efficient frontier
+def cross_asset_outputs(df_returns):
+    returns = df_returns[list(coins)]
+    # Five assets fit in one or two chunks; a process pool would cost more than it saves
+    with timed("compute.var"):
+        var_df = pd.DataFrame(portfolio_var_report(returns, workers=1))
+
+    with timed("compute.optimizer"):
+        allocations_df = optimal_allocations(returns).rename(columns=coins)
+        frontier_df = efficient_frontier(
+            returns.mean().to_numpy(),
+            returns.cov().to_numpy(),
+            assets=list(coins.values())
+        )
+    return var_df, allocations_df, frontier_df
+
+
+# Prices with MA30 columns joined to returns with Vol30 columns
+def rolling_features(df_prices, df_returns):
+    df_prices, df_returns = df_prices.copy(), df_returns.copy()
+    with timed("compute.rolling"):
+        for coin in coins:
+            df_prices[f"{coin}_MA30"] = df_prices[coin].rolling(30).mean()
+            df_returns[f"{coin}_Vol30"] = df_returns[coin].rolling(30).std()
+
+        # Rename return columns to avoid overlap
+        df_returns_renamed = df_returns.add_suffix("_return")
+
+        # Combine price + returns safely
+        return df_prices.join(df_returns_renamed)
+
+
+# Returns (final_df, metrics_df, horizons_df, var_df, allocations_df, frontier_df,
+# forecasts_df) for an aligned price panel
+@instrumented("compute.process_prices")
+def process_prices(df_prices):
+    count("rows_processed", len(df_prices), stage="process_prices")
+    df_returns = log_returns(df_prices)
+    var_df, allocations_df, frontier_df = cross_asset_outputs(df_returns)
+    return (
+        rolling_features(df_prices, df_returns),
+        risk_metrics(df_returns),
+        horizon_metrics(df_returns),
+        var_df,
+        allocations_df,
+        frontier_df,
+        volatility_forecasts(df_returns[list(coins)]),
+    )
+
+
+# Replaces the rows of `previous` that `fresh` has (matched on `keys`), keeping order
+def _splice(previous, fresh, keys=("Asset",)):
+    keys = list(keys)
+    merged = previous.set_index(keys)
+    merged.update(fresh.set_index(keys))
+    return merged.reset_index()[previous.columns]
+
+
+# process_prices for a panel where only the `changed` coins' prices differ
+# from the panel `previous` (process_prices' output) was computed from, on
+# the same dates. Per-asset stages run for the changed coins only and are
+# spliced into `previous`; the cross-asset stages and the rolling columns
+# are cheap next to the GARCH fits and are recomputed in full.
+@instrumented("compute.update_prices")
+def update_prices(df_prices, previous, changed):
+    _, metrics_prev, horizons_prev, _, _, _, forecasts_prev = previous
+    changed = [coin for coin in coins if coin in changed]
+    count("assets_recomputed", len(changed), stage="update_prices")
+
+    df_returns = log_returns(df_prices)
+    # Every beta is measured against bitcoin, so a bitcoin change touches all rows
+    rescored = list(coins) if "bitcoin" in changed else ["bitcoin"] + changed
+    var_df, allocations_df, frontier_df = cross_asset_outputs(df_returns)
+    return (
+        rolling_features(df_prices, df_returns),
+        _splice(metrics_prev, risk_metrics(df_returns[rescored])),
+        _splice(horizons_prev, horizon_metrics(df_returns[rescored]), keys=("Asset", "Horizon")),
+        var_df,
+        allocations_df,
+        frontier_df,
+        _splice(forecasts_prev, volatility_forecasts(df_returns[changed])),
+    )
 
-for coin in coins:
-    df_prices[f"{coin}_MA30"] = df_prices[coin].rolling(30).mean()
-    df_returns[f"{coin}_Vol30"] = df_returns[coin].rolling(30).std()
 
 # ===============================
 # SAVE OUTPUTS
 # ===============================
 
-# Rename return columns to avoid overlap
-df_returns_renamed = df_returns.add_suffix("_return")
-
-# Combine price + returns safely
-final_df = df_prices.join(df_returns_renamed)
-
-# Save processed dataset
-final_df.to_csv("data/processed_crypto_data.csv")
-metrics_df.to_csv("data/crypto_metrics.csv", index = False)
-
-print("✅ Milestone 2 data processing completed successfully")
\ No newline at end of file
+# Every file is swapped in atomically, so dashboards never read a partial write
+@instrumented("io.save_outputs")
+def save_outputs(final_df, metrics_df, horizons_df, var_df, allocations_df, frontier_df, forecasts_df):
+    atomic_to_csv(final_df, "data/processed_crypto_data.csv")
+    write_columnar(final_df, "data/processed_crypto_data")
+    atomic_to_csv(metrics_df, "data/crypto_metrics.csv", index=False)
+    atomic_to_csv(var_df, "data/portfolio_var.csv", index=False)
+    atomic_to_csv(horizons_df, "data/crypto_metrics_horizons.csv", index=False)
+    atomic_to_csv(allocations_df, "data/optimal_allocations.csv", index=False)
+    atomic_to_csv(frontier_df, "data/efficient_frontier.csv", index=False)
+    atomic_to_csv(forecasts_df, "data/volatility_forecasts.csv", index=False)
+    save_rolling_matrices(final_df)
+    save_to_db(final_df, horizons_df)
+
+
+# 30-day rolling correlation/beta stacks into data/rolling_cache, keyed by
+# the log returns so the dashboards find them without recomputing
+def save_rolling_matrices(final_df, window=30):
+    returns = final_df[[f"{coin}_return" for coin in coins]]
+    rolling_matrices(returns.rename(columns=lambda c: c.removesuffix("_return")), window=window)
+
+
+# Upsert prices and horizon metrics into crypto_risk_db; CSVs remain the fallback
+def save_to_db(final_df, horizons_df):
+    try:
+        db_store.create_tables()
+        n_prices = db_store.write_prices(final_df[list(coins)], coins)
+        n_metrics = db_store.write_metrics(horizons_df, as_of=final_df.index[-1])
+        print(f"🗄️ Database updated: {n_prices} price rows, {n_metrics} metric rows")
+    except Exception as e:
+        print(f"⚠️ Skipped database write: {e}")
+
+
+def main():
+    df_prices = load_prices()
+    save_outputs(*process_prices(df_prices))
+    print(f"📈 Stage metrics written to {write_metrics_file()}")
+    print("✅ Milestone 2 data processing completed successfully")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,11 +2,19 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
+from db_store import read_prices, try_read
+from feature_cache import get_features
+from downsample import downsample_series
+from portfolio import get_portfolio_model
+from rolling_corr import rolling_matrices
+from risk_classification import classify_value, file_version
+from instrumentation import mark, render_debug_panel, start_trace
 # ================= PAGE CONFIG =================
 st.set_page_config(
     page_title="Crypto Risk Analytics Dashboard",
     layout="wide"
 )
+trace = start_trace()
 # ================= CUSTOM CSS (UI COLOR FIX) =================
 
 st.markdown("""
@@ -105,12 +113,6 @@ hr {
 }
 </style>
 """, unsafe_allow_html=True)
-# ================= LOAD DATA =================
-price_df = pd.read_csv(
-    "data/processed_crypto_data.csv",
-    parse_dates=["Date"]
-)
-metrics_df = pd.read_csv("data/crypto_metrics.csv")
 # ================= ASSET NAME MAPPING =================
 asset_map = {
     "BTC": "bitcoin",
@@ -120,6 +122,14 @@ asset_map = {
     "DOGE": "dogecoin"
 }
 reverse_map = {v: k for k, v in asset_map.items()}
+# ================= LOAD DATA =================
+# Prices and rolling features are computed once per data version and
+# shared across reruns; filters below only slice them
+features = get_features(asset_map.values())
+price_df = features.prices
+METRICS_CSV = "data/crypto_metrics.csv"
+metrics_df = pd.read_csv(METRICS_CSV)
+mark("fetch.features")
 # ================= SIDEBAR FILTERS =================
 st.sidebar.title("🔍 Filters")
 crypto_list = metrics_df["Asset"].tolist()
@@ -128,29 +138,32 @@ selected_crypto = st.sidebar.multiselect(
     crypto_list,
     default=crypto_list[:3]
 )
-min_date = price_df["Date"].min().date()
-max_date = price_df["Date"].max().date()
+min_date = price_df.index.min().date()
+max_date = price_df.index.max().date()
 start_date = st.sidebar.date_input("Start Date", min_date, format="YYYY-MM-DD")
 end_date = st.sidebar.date_input("End Date", max_date, format="YYYY-MM-DD")
+st.sidebar.markdown("### 💼 Portfolio Weights")
+raw_weights = {
+    asset_map[c]: st.sidebar.slider(f"{c} weight", 0.0, 1.0, 1.0 / max(len(selected_crypto), 1), 0.05)
+    for c in selected_crypto if c in asset_map
+}
 # ================= PREPARE PRICE DATA =================
 crypto_columns = [asset_map[c] for c in selected_crypto if c in asset_map]
-filtered_price_df = price_df[["Date"] + crypto_columns]
-price_long = filtered_price_df.melt(
-    id_vars="Date",
-    var_name="Asset",
-    value_name="Price"
-)
-price_long["Asset"] = price_long["Asset"].map(reverse_map)
-price_long = price_long[
-    (price_long["Date"] >= pd.to_datetime(start_date)) &
-    (price_long["Date"] <= pd.to_datetime(end_date))
-]
+start_ts = pd.to_datetime(start_date)
+end_ts = pd.to_datetime(end_date)
+# Only the selected assets and dates from crypto_risk_db, else the cache
+db_prices = try_read(read_prices, [reverse_map[c] for c in crypto_columns], start_ts, end_ts)
+if db_prices is not None and not db_prices.empty and set(crypto_columns) <= set(db_prices.rename(columns=asset_map)):
+    price_window = db_prices.rename(columns=asset_map)[crypto_columns]
+else:
+    price_window = features.price_window(crypto_columns, start_ts, end_ts)
 filtered_metrics = metrics_df[
     metrics_df["Asset"].isin(selected_crypto)
 ]
-if price_long.empty:
+if price_window.empty:
     st.error("❌ No data available for the selected filters")
     st.stop()
+mark("compute.filters")
 # ================= HEADER =================
 st.markdown("### Milestone 3 – Visualization Dashboard")
 # ================= REQUIREMENTS & OUTPUTS =================
@@ -175,57 +188,36 @@ with c2:
 st.markdown("---")
 st.title("📊 Crypto Risk Analytics Dashboard")
 fig = go.Figure()
-# ================= CALCULATE VOLATILITY OVER TIME =================
-volatility_df = price_df.copy()
-volatility_df.set_index("Date", inplace=True)
-
-# Calculate daily returns
-returns = volatility_df.pct_change()
-
-# Rolling volatility (30-day)
-rolling_vol = returns.rolling(window=30).std()
-
-# Convert to long format
-vol_long = rolling_vol.reset_index().melt(
-    id_vars="Date",
-    var_name="Asset",
-    value_name="Volatility"
-)
-
-vol_long["Asset"] = vol_long["Asset"].map(reverse_map)
-# Filter selected assets & dates
-vol_long = vol_long[
-    (vol_long["Asset"].isin(selected_crypto)) &
-    (vol_long["Date"] >= pd.to_datetime(start_date)) &
-    (vol_long["Date"] <= pd.to_datetime(end_date))
-]
+# ================= VOLATILITY OVER TIME =================
+# 30-day rolling volatility of daily returns, from the feature cache
+vol_window = features.vol_window(crypto_columns, start_ts, end_ts, window=30)
 # ================= PRICE & VOLATILITY TRENDS =================
 st.subheader("📈 Price & Volatility Trends")
 combined_fig = go.Figure()
+# Each trace is thinned to a fixed point budget for the visible range, so
+# long or high-frequency histories don't slow the browser down
 # ---- PRICE LINES ----
-for asset in price_long["Asset"].unique():
-    asset_data = price_long[price_long["Asset"] == asset]
-
+for column in price_window.columns:
+    price_points = downsample_series(price_window[column], method="minmax")
     combined_fig.add_trace(
         go.Scatter(
-            x=asset_data["Date"],
-            y=asset_data["Price"],
+            x=price_points.index,
+            y=price_points,
             mode="lines",
-            name=f"{asset} Price",
+            name=f"{reverse_map[column]} Price",
             yaxis="y1"
         )
     )
 
 # ---- VOLATILITY LINES ----
-for asset in vol_long["Asset"].unique():
-    vol_data = vol_long[vol_long["Asset"] == asset]
-
+for column in vol_window.columns:
+    vol_points = downsample_series(vol_window[column])
     combined_fig.add_trace(
         go.Scatter(
-            x=vol_data["Date"],
-            y=vol_data["Volatility"],
+            x=vol_points.index,
+            y=vol_points,
             mode="lines",
-            name=f"{asset} Volatility",
+            name=f"{reverse_map[column]} Volatility",
             yaxis="y2",
             line=dict(dash="dot"),
             opacity=0.8
@@ -253,6 +245,52 @@ combined_fig.update_layout(
 )
 
 st.plotly_chart(combined_fig, use_container_width=True)
+mark("render.price_volatility_trends")
+# ================= CORRELATION & CONTAGION =================
+# 30-day rolling correlation/beta stacks, read from the on-disk cache that
+# milestone2_processing.py fills (computed here once if it's missing)
+st.subheader("🔗 Correlation & Contagion")
+rolling = rolling_matrices(features.log_returns, window=30)
+steps = rolling.dates.slice_indexer(start_ts, end_ts)
+idx = [rolling.assets.index(c) for c in crypto_columns]
+if len(idx) > 1 and steps.stop > steps.start:
+    sub_corr = rolling.corr[steps][:, idx][:, :, idx]
+    n = len(idx)
+    avg_corr = (sub_corr.sum(axis=(1, 2), dtype=float) - n) / (n * (n - 1))
+    step_dates = rolling.dates[steps]
+
+    contagion_fig = go.Figure()
+    contagion_fig.add_trace(go.Scatter(
+        x=step_dates, y=avg_corr, mode="lines", name="Average Pairwise Correlation"
+    ))
+    beta_window = rolling.beta_to("bitcoin").loc[start_ts:end_ts, crypto_columns]
+    for column in beta_window.columns:
+        if column != "bitcoin":
+            contagion_fig.add_trace(go.Scatter(
+                x=beta_window.index, y=beta_window[column], mode="lines",
+                name=f"{reverse_map[column]} Beta vs BTC", yaxis="y2", line=dict(dash="dot")
+            ))
+    contagion_fig.update_layout(
+        template="plotly_dark",
+        plot_bgcolor="#0E1117",
+        yaxis=dict(title="Correlation"),
+        yaxis2=dict(title="Beta", overlaying="y", side="right"),
+        height=420
+    )
+
+    h1, h2 = st.columns([2, 1])
+    h1.plotly_chart(contagion_fig, use_container_width=True)
+
+    heatmap = rolling.corr_at(end_ts).loc[crypto_columns, crypto_columns].rename(index=reverse_map, columns=reverse_map)
+    heatmap_fig = px.imshow(
+        heatmap, zmin=-1, zmax=1, color_continuous_scale="RdBu_r", text_auto=".2f",
+        title=f"Correlation, 30 days to {rolling.dates[steps.stop - 1].date()}",
+        template="plotly_dark"
+    )
+    h2.plotly_chart(heatmap_fig, use_container_width=True)
+else:
+    st.info("Select at least two assets and a range longer than 30 days to see correlations")
+mark("render.correlation")
 # ================= RISK–RETURN (FIXED) =================
 st.subheader("⚖ Risk–Return Analysis")
 # ❗ Size removed to avoid negative-value error
@@ -268,13 +306,48 @@ risk_fig = px.scatter(
 risk_fig.update_traces(marker=dict(size=16,opacity=0.85,line=dict(width=1,color="white")))
 risk_fig.update_layout(plot_bgcolor="#0E1117")
 st.plotly_chart(risk_fig, use_container_width=True)
+mark("render.risk_return")
+# ================= PORTFOLIO RISK =================
+# Covariance is cached per data version and date window; moving a weight
+# slider only re-evaluates one covariance-vector product
+st.subheader("💼 Portfolio Risk")
+portfolio_returns = features.returns.loc[start_ts:end_ts, list(asset_map.values())]
+total_weight = sum(raw_weights.values())
+if total_weight:
+    weights = {a: w / total_weight for a, w in raw_weights.items()}
+else:
+    # All sliders at zero: spread evenly over the selected assets only
+    st.warning("All portfolio weights are 0 — using equal weights across the selected assets.")
+    weights = {a: 1 / len(raw_weights) for a in raw_weights}
+model = get_portfolio_model(portfolio_returns, version=features.version)
+portfolio = model.risk(weights)
+
+p1, p2, p3, p4 = st.columns(4)
+p1.metric("Annual Volatility", f"{portfolio['Annual Volatility']:.2f}")
+p2.metric("VaR 95 (1 day)", f"{portfolio['VaR']:.2%}")
+p3.metric("Beta vs BTC", f"{portfolio['Beta']:.2f}")
+p4.metric("Sharpe Ratio", f"{portfolio['Sharpe Ratio']:.3f}")
+
+contributions = portfolio["contributions"]
+contributions = contributions[contributions["Weight"] > 0].rename(index=reverse_map)
+contrib_fig = px.bar(
+    contributions.reset_index(names="Asset"),
+    x="Asset",
+    y="% of Risk",
+    color="Asset",
+    title="Component Risk Contributions",
+    template="plotly_dark"
+)
+contrib_fig.update_layout(plot_bgcolor="#0E1117", yaxis_tickformat=".0%")
+st.plotly_chart(contrib_fig, use_container_width=True)
+mark("render.portfolio")
 # ================= RADAR / SPIDER CHART =================
 st.subheader("🕸 dashboard features")
 radar_values = [
-    filtered_metrics["Annual Volatility"].mean(),
-    filtered_metrics["Sharpe Ratio"].mean(),
-    1 - filtered_metrics["Annual Volatility"].mean(),
-    filtered_metrics["Beta (vs BTC)"].mean(),
+    portfolio["Annual Volatility"],
+    portfolio["Sharpe Ratio"],
+    1 - portfolio["Annual Volatility"],
+    portfolio["Beta"],
     0.7
 ]
 
@@ -299,17 +372,14 @@ radar_fig.update_layout(
 )
 
 st.plotly_chart(radar_fig, use_container_width=True)
+mark("render.radar")
 # ================= KPI METRICS =================
 st.subheader("📊 Key Risk Metrics")
 avg_vol = filtered_metrics["Annual Volatility"].mean()
 avg_sharpe = filtered_metrics["Sharpe Ratio"].mean()
 avg_beta = filtered_metrics["Beta (vs BTC)"].mean()
-if avg_vol < 0.4:
-    risk_level = "Low"
-elif avg_vol < 0.7:
-    risk_level = "Medium"
-else:
-    risk_level = "High"
+risk_level = classify_value(avg_vol, reference=filtered_metrics,
+                            version=(file_version(METRICS_CSV), tuple(selected_crypto)))
 
 c1, c2, c3, c4 = st.columns(4)
 
@@ -341,9 +411,10 @@ with c4:
     st.markdown(f"""
     <div class="kpi-card">
         <div class="kpi-title">Risk Level</div>
-        <div class="kpi-value">Medium</div>
+        <div class="kpi-value">{risk_level}</div>
     </div>
     """, unsafe_allow_html=True)
+mark("render.kpis")
 
 # ================= FOOTER =================
 st.markdown("---")
@@ -356,4 +427,6 @@ section[data-testid="stSidebar"] [data-baseweb="input"] input {
     background-color: white !important;
 }
 </style>
-""", unsafe_allow_html=True)
\ No newline at end of file
+""", unsafe_allow_html=True)
+
+render_debug_panel(trace)
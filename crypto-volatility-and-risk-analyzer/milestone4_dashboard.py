@@ -1,13 +1,17 @@
 import streamlit as st
 import pandas as pd
 import plotly.express as px
-from fpdf import FPDF
+from feature_cache import get_features
+from reports import FORMATS, data_version, get_report_worker
+from risk_classification import TICKERS, classify, file_version
+from instrumentation import mark, render_debug_panel, start_trace
 
 # ================= PAGE CONFIG =================
 st.set_page_config(
     page_title="Milestone 4 – Risk Classification & Reporting",
     layout="wide"
 )
+trace = start_trace()
 # ================= CUSTOM CSS =================
 st.markdown("""
 <style>
@@ -79,18 +83,13 @@ h1, h2, h3 {
 """, unsafe_allow_html=True)
 
 # ================= LOAD DATA =================
-metrics_df = pd.read_csv("data/crypto_metrics.csv")
+METRICS_CSV = "data/crypto_metrics.csv"
+metrics_df = pd.read_csv(METRICS_CSV)
+mark("fetch.metrics")
 
 # ================= RISK CLASSIFICATION =================
-def classify_risk(vol):
-    if vol > 0.7:
-        return "High Risk"
-    elif vol > 0.4:
-        return "Medium Risk"
-    else:
-        return "Low Risk"
-
-metrics_df["Risk Level"] = metrics_df["Annual Volatility"].apply(classify_risk)
+metrics_df["Risk Level"] = classify(metrics_df, version=file_version(METRICS_CSV)) + " Risk"
+mark("compute.risk_classification")
 
 # ================= CARD RENDER FUNCTION =================
 def render_card(title, df, color_class):
@@ -152,6 +151,7 @@ fig = px.bar(
 
 fig.update_layout(yaxis_range=[0, 100],plot_bgcolor="#0B1220")
 st.plotly_chart(fig, use_container_width=True)
+mark("render.completion_chart")
 
 st.markdown("---")
 
@@ -173,6 +173,8 @@ with c2:
 with c3:
     render_card("🟢 Low Risk", low, "risk-low")
 
+mark("render.risk_cards")
+
 # ================= SUMMARY =================
 st.markdown("---")
 st.subheader("📊 Risk Summary Report")
@@ -207,41 +209,61 @@ donut.update_layout(
     plot_bgcolor="#0B1220"
 )
 st.plotly_chart(donut, use_container_width=True)
+mark("render.donut")
 
 # ================= EXPORT =================
 st.markdown("---")
 st.subheader("⬇ Report Export")
 
-st.download_button(
-    "📥 Download CSV",
-    metrics_df.to_csv(index=False).encode("utf-8"),
-    "risk_report.csv",
-    "text/csv"
-)
-
-# ================= PDF =================
-def create_pdf(df):
-    pdf = FPDF()
-    pdf.add_page()
-    pdf.set_font("Arial", size=12)
-
-    pdf.cell(0, 10, "Risk Classification Report", ln=True)
-    pdf.ln(5)
-
-    for _, r in df.iterrows():
-        pdf.cell(
-            0, 8,
-            f"{r['Asset']} - {r['Risk Level']} ({r['Annual Volatility']*100:.1f}%)",
-            ln=True
-        )
+# Reports are rendered on request by a background worker and cached per
+# data version; the panel polls only while a render is in flight
+REPORT_FILES = {
+    "csv": ("📥 Download CSV", "risk_report.csv"),
+    "pdf": ("📄 Download PDF", "risk_report.pdf"),
+    "html": ("🌐 Download HTML", "risk_report.html"),
+}
+REPORT_POLL = 2
+
+report_worker = get_report_worker()
+report_prices = get_features(TICKERS).prices.rename(columns=TICKERS)
+# Hashed once per rerun, not on every poll of every format
+report_version = data_version(metrics_df, report_prices)
+
+def report_panel(polling):
+    cols = st.columns(len(REPORT_FILES))
+    for col, (fmt, (label, filename)) in zip(cols, REPORT_FILES.items()):
+        with col:
+            data = report_worker.ready(fmt, metrics_df, report_prices, version=report_version)
+            if data is not None:
+                st.download_button(label, data, filename, FORMATS[fmt], key=f"download_{fmt}")
+            elif report_worker.pending(fmt, report_version):
+                st.caption("Rendering in the background…")
+            elif st.button(f"Prepare {fmt.upper()} report", key=f"prepare_{fmt}"):
+                report_worker.submit(fmt, metrics_df, report_prices, version=report_version)
+                # Rerun the page so it switches to the polling panel
+                st.rerun()
+
+    # Nothing left in flight: a full rerun swaps back to the idle panel
+    if polling and not any(report_worker.pending(fmt, report_version) for fmt in REPORT_FILES):
+        st.rerun()
+
+@st.fragment
+def report_exports_idle():
+    report_panel(polling=False)
+
+@st.fragment(run_every=REPORT_POLL)
+def report_exports_polling():
+    report_panel(polling=True)
+
+def report_exports():
+    if any(report_worker.pending(fmt, report_version) for fmt in REPORT_FILES):
+        report_exports_polling()
+    else:
+        report_exports_idle()
 
-    return pdf.output(dest="S").encode("latin-1")
+report_exports()
+mark("render.report_exports")
 
-st.download_button(
-    "📄 Download PDF",
-    create_pdf(metrics_df),
-    "risk_report.pdf",
-    "application/pdf"
-)
+st.success("✅ Milestone 4 Completed – Risk Classification & Reporting")
 
-st.success("✅ Milestone 4 Completed – Risk Classification & Reporting")
\ No newline at end of file
+render_debug_panel(trace)
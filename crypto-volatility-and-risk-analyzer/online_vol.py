@@ -0,0 +1,98 @@
+import math
+
+# ===============================
+# STREAMING VOLATILITY ESTIMATOR
+# ===============================
+
+# Feed one price at a time; rolling mean/variance, EWMA volatility and
+# Sharpe are updated in O(1) from a fixed-size ring buffer of log returns.
+# The rolling moments use Welford's update, extended to drop the oldest
+# return once the window is full, so no sum of squares is ever formed.
+class StreamingVolatility:
+    def __init__(self, window=30, ewma_lambda=0.94, periods_per_year=365):
+        self.window = window
+        self.ewma_lambda = ewma_lambda
+        self.periods_per_year = periods_per_year
+
+        self._buffer = [0.0] * window
+        self._pos = 0
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.ewma_variance = None
+        self.last_price = None
+        self.last_return = None
+
+    def update(self, price):
+        if self.last_price is None:
+            self.last_price = price
+            return None
+
+        r = math.log(price / self.last_price)
+        self.last_price = price
+        self.last_return = r
+
+        if self.count < self.window:
+            self.count += 1
+            delta = r - self.mean
+            self.mean += delta / self.count
+            self._m2 += delta * (r - self.mean)
+        else:
+            old = self._buffer[self._pos]
+            old_mean = self.mean
+            self.mean += (r - old) / self.window
+            self._m2 += (r - old) * (r - self.mean + old - old_mean)
+            self._m2 = max(self._m2, 0.0)
+
+        self._buffer[self._pos] = r
+        self._pos = (self._pos + 1) % self.window
+
+        if self.ewma_variance is None:
+            self.ewma_variance = r * r
+        else:
+            lam = self.ewma_lambda
+            self.ewma_variance = lam * self.ewma_variance + (1 - lam) * r * r
+
+        return r
+
+    # Rolling sample variance of the returns in the window
+    @property
+    def variance(self):
+        if self.count < 2:
+            return float("nan")
+        return self._m2 / (self.count - 1)
+
+    @property
+    def volatility(self):
+        return math.sqrt(self.variance)
+
+    @property
+    def annualized_volatility(self):
+        return self.volatility * math.sqrt(self.periods_per_year)
+
+    @property
+    def ewma_volatility(self):
+        if self.ewma_variance is None:
+            return float("nan")
+        return math.sqrt(self.ewma_variance * self.periods_per_year)
+
+    # Annualized like utils.calculate_metrics
+    @property
+    def sharpe(self):
+        vol = self.volatility
+        if not vol:
+            return float("nan")
+        return self.mean / vol * math.sqrt(self.periods_per_year)
+
+    @property
+    def ready(self):
+        return self.count >= self.window
+
+    def snapshot(self):
+        return {
+            "price": self.last_price,
+            "return": self.last_return,
+            "rolling_volatility": self.annualized_volatility,
+            "ewma_volatility": self.ewma_volatility,
+            "sharpe": self.sharpe,
+        }
@@ -0,0 +1,245 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+# ===============================
+# CONFIGURATION
+# ===============================
+
+FRONTIER_POINTS = 200
+# Coarse frontier solved first to place the fine points evenly in return
+COARSE_POINTS = 24
+# Consecutive frontier points solved together in one vectorized batch
+BATCH_SIZE = 25
+TOL = 1e-9
+MAX_ITER = 20_000
+PERIODS_PER_YEAR = 252
+
+# All portfolios are long-only and fully invested (weights >= 0, sum to 1).
+# Units follow portfolio.py: daily expected return and volatility.
+
+
+# ===============================
+# BATCHED QP SOLVER
+# ===============================
+
+# Euclidean projection of every row of V onto the probability simplex
+def project_simplex(V):
+    k, n = V.shape
+    U = -np.sort(-V, axis=1)
+    css = np.cumsum(U, axis=1) - 1.0
+    positive = U - css / np.arange(1, n + 1) > 0
+    rho = n - 1 - np.argmax(positive[:, ::-1], axis=1)
+    theta = css[np.arange(k), rho] / (rho + 1)
+    return np.maximum(V - theta[:, None], 0.0)
+
+
+# Solves min 1/2 w'Cw - lam * mu'w over the simplex for every lam at once
+# with accelerated projected gradient (FISTA). Momentum is restarted per
+# row when it stops helping, which keeps ill-conditioned covariances fast.
+# W0 warm-starts the rows.
+def solve_batch(cov, mean, lambdas, W0=None, tol=TOL, max_iter=MAX_ITER):
+    lambdas = np.asarray(lambdas, dtype=float)[:, None]
+    n = len(mean)
+    step = 1.0 / np.linalg.eigvalsh(cov)[-1]
+
+    W = np.full((len(lambdas), n), 1.0 / n) if W0 is None else project_simplex(np.array(W0, dtype=float))
+    Y = W.copy()
+    t = np.ones((len(lambdas), 1))
+    for _ in range(max_iter):
+        W_next = project_simplex(Y - step * (Y @ cov - lambdas * mean))
+        delta = W_next - W
+        if np.abs(delta).max() < tol:
+            return W_next
+
+        restart = np.einsum("ij,ij->i", Y - W_next, delta)[:, None] > 0
+        t = np.where(restart, 1.0, t)
+        t_next = (1 + np.sqrt(1 + 4 * t * t)) / 2
+        Y = W_next + (t - 1) / t_next * delta
+        W, t = W_next, t_next
+    return W
+
+
+def _stats(W, cov, mean):
+    vol = np.sqrt(np.einsum("ij,jk,ik->i", W, cov, W))
+    ret = W @ mean
+    return ret, vol
+
+
+# ===============================
+# PORTFOLIOS
+# ===============================
+
+def _as_arrays(mean, cov):
+    return np.asarray(mean, dtype=float), np.asarray(cov, dtype=float)
+
+
+def min_variance(mean, cov):
+    mean, cov = _as_arrays(mean, cov)
+    return solve_batch(cov, mean, [0.0])[0]
+
+
+# Long-only equal risk contribution (each asset's w_i * (Cw)_i is the same),
+# by cyclical coordinate descent on 1/2 y'Cy - sum(log y), then w = y / sum(y)
+def risk_parity(cov, tol=1e-12, max_sweeps=1_000):
+    cov = np.asarray(cov, dtype=float)
+    n = len(cov)
+    diag = np.diag(cov)
+    y = 1.0 / np.sqrt(diag)
+    y /= np.sqrt(y @ cov @ y)
+    cy = cov @ y
+    for _ in range(max_sweeps):
+        y_prev = y.copy()
+        for i in range(n):
+            c = cy[i] - diag[i] * y[i]
+            new = (-c + np.sqrt(c * c + 4 * diag[i])) / (2 * diag[i])
+            cy += cov[:, i] * (new - y[i])
+            y[i] = new
+        if np.abs(y - y_prev).max() < tol * np.abs(y).max():
+            break
+    return y / y.sum()
+
+
+# Tangency portfolio: golden-section search for the best Sharpe along the
+# risk-aversion path, each step warm-started from the previous solution
+def max_sharpe(mean, cov, risk_free=0.0, iterations=60):
+    mean, cov = _as_arrays(mean, cov)
+    excess = mean - risk_free
+    lam_max = _lambda_max(mean, cov)
+
+    def sharpe(log_lam, w0):
+        w = solve_batch(cov, excess, [np.exp(log_lam)], W0=w0[None])[0]
+        return excess @ w / np.sqrt(w @ cov @ w), w
+
+    # No asset beats the risk-free rate: Sharpe is then a non-positive
+    # linear term over a convex one, quasi-convex in w, so its maximum over
+    # the simplex is at a vertex, the single asset with the best Sharpe
+    if excess.max() <= 0:
+        w = np.zeros(len(mean))
+        w[np.argmax(excess / np.sqrt(np.diag(cov)))] = 1.0
+        return w
+
+    w_best = min_variance(mean, cov)
+    best = excess @ w_best / np.sqrt(w_best @ cov @ w_best)
+
+    g = (np.sqrt(5) - 1) / 2
+    lo, hi = np.log(lam_max) - 20, np.log(lam_max)
+    a, b = hi - g * (hi - lo), lo + g * (hi - lo)
+    fa, wa = sharpe(a, w_best)
+    fb, wb = sharpe(b, wa)
+    for _ in range(iterations):
+        if fa > fb:
+            hi, b, fb, wb = b, a, fa, wa
+            a = hi - g * (hi - lo)
+            fa, wa = sharpe(a, wb)
+        else:
+            lo, a, fa, wa = a, b, fb, wb
+            b = lo + g * (hi - lo)
+            fb, wb = sharpe(b, wa)
+        if hi - lo < 1e-6:
+            break
+
+    for f, w in [(fa, wa), (fb, wb)]:
+        if f > best:
+            best, w_best = f, w
+    return w_best
+
+
+# ===============================
+# EFFICIENT FRONTIER
+# ===============================
+
+# Risk aversion past which the solution is the single highest-return asset
+def _lambda_max(mean, cov):
+    order = np.sort(mean)
+    gap = max(order[-1] - order[-2], 1e-12) if len(mean) > 1 else 1.0
+    return 4.0 * np.abs(cov).max() / gap
+
+
+# Consecutive batches of lambdas, each warm-started from the previous
+# batch's last solution (or the nearest coarse solution for the first)
+def _solve_chunk(args):
+    cov, mean, lambdas, w0, batch_size = args
+    out = np.empty((len(lambdas), len(mean)))
+    warm = w0
+    for i in range(0, len(lambdas), batch_size):
+        batch = lambdas[i:i + batch_size]
+        out[i:i + batch_size] = solve_batch(cov, mean, batch, W0=np.repeat(warm[None], len(batch), axis=0))
+        warm = out[i + len(batch) - 1]
+    return out
+
+
+# n_points portfolios evenly spaced in expected return from the minimum-
+# variance portfolio up to the best single asset. Returns a DataFrame of
+# Expected Return / Daily Volatility / Annual Volatility / Sharpe Ratio
+# plus one weight column per asset.
+def efficient_frontier(mean, cov, n_points=FRONTIER_POINTS, assets=None, workers=None,
+                       batch_size=BATCH_SIZE, periods_per_year=PERIODS_PER_YEAR):
+    mean, cov = _as_arrays(mean, cov)
+    assets = list(assets) if assets is not None else [f"asset_{i}" for i in range(len(mean))]
+    workers = workers or os.cpu_count() or 1
+
+    # Coarse pass maps log(lambda) -> expected return
+    lam_max = _lambda_max(mean, cov)
+    coarse_lams = np.concatenate(([0.0], np.geomspace(lam_max * 1e-6, lam_max, COARSE_POINTS - 1)))
+    coarse_W = solve_batch(cov, mean, coarse_lams)
+    coarse_ret, _ = _stats(coarse_W, cov, mean)
+    coarse_ret = np.maximum.accumulate(coarse_ret)
+
+    # Lambdas for evenly spaced target returns, interpolated on the coarse path
+    targets = np.linspace(coarse_ret[0], coarse_ret[-1], n_points)
+    log_lams = np.interp(targets, coarse_ret[1:], np.log(coarse_lams[1:]))
+    lambdas = np.where(targets <= coarse_ret[0], 0.0, np.exp(log_lams))
+
+    # Contiguous chunks in parallel; BLAS and sorting release the GIL
+    chunks = [c for c in np.array_split(np.arange(n_points), workers) if len(c)]
+    tasks = []
+    for c in chunks:
+        nearest = int(np.searchsorted(coarse_lams, lambdas[c[0]]).clip(0, COARSE_POINTS - 1))
+        tasks.append((cov, mean, lambdas[c], coarse_W[nearest], batch_size))
+    if len(tasks) == 1:
+        results = [_solve_chunk(tasks[0])]
+    else:
+        with ThreadPoolExecutor(max_workers=len(tasks)) as pool:
+            results = list(pool.map(_solve_chunk, tasks))
+
+    W = np.vstack(results)
+    ret, vol = _stats(W, cov, mean)
+    frontier = pd.DataFrame({
+        "Expected Return": ret,
+        "Daily Volatility": vol,
+        "Annual Volatility": vol * np.sqrt(periods_per_year),
+        "Sharpe Ratio": ret / vol,
+    })
+    return frontier.join(pd.DataFrame(W, columns=assets))
+
+
+# ===============================
+# SUMMARY
+# ===============================
+
+# Min-variance, max-Sharpe and risk-parity weights for a Date x asset returns frame
+def optimal_allocations(returns, risk_free=0.0, periods_per_year=PERIODS_PER_YEAR):
+    returns = returns.dropna()
+    X = returns.to_numpy(dtype=float)
+    mean = X.mean(axis=0)
+    cov = np.cov(X, rowvar=False)
+
+    rows = []
+    for name, w in [
+        ("Minimum Variance", min_variance(mean, cov)),
+        ("Maximum Sharpe", max_sharpe(mean, cov, risk_free)),
+        ("Risk Parity", risk_parity(cov)),
+    ]:
+        vol = np.sqrt(w @ cov @ w)
+        rows.append({
+            "Portfolio": name,
+            "Expected Return": w @ mean,
+            "Daily Volatility": vol,
+            "Annual Volatility": vol * np.sqrt(periods_per_year),
+            "Sharpe Ratio": (w @ mean - risk_free) / vol,
+            **dict(zip(returns.columns, w)),
+        })
+    return pd.DataFrame(rows)
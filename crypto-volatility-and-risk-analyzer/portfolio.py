@@ -0,0 +1,132 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+
+# ===============================
+# CONFIGURATION
+# ===============================
+
+CONFIDENCE = 0.95
+PERIODS_PER_YEAR = 252
+# Models kept for (data version, assets, date window) combinations
+CACHE_ENTRIES = 32
+
+
+# ===============================
+# PORTFOLIO RISK MODEL
+# ===============================
+
+# Mean vector and covariance matrix of a Date x asset returns frame, built
+# once; every weighting after that is a single covariance-vector product.
+# Units follow risk_engine.compute_risk_metrics: daily volatility, daily
+# Sharpe (mean / vol), beta against the benchmark column, parametric VaR
+# and CVaR as positive loss fractions.
+class PortfolioModel:
+    def __init__(self, returns, benchmark="bitcoin", periods_per_year=PERIODS_PER_YEAR):
+        returns = returns.dropna()
+        X = returns.to_numpy(dtype=float)
+
+        self.assets = list(returns.columns)
+        self.observations = len(X)
+        self.periods_per_year = periods_per_year
+        self.benchmark = benchmark
+        self._b = self.assets.index(benchmark)
+
+        self.mean = X.mean(axis=0)
+        centered = X - self.mean
+        self.cov = centered.T @ centered / (len(X) - 1)
+
+    # Dict/Series keyed by asset (missing assets weigh 0), array in asset
+    # order, or None for equal weights
+    def weights(self, weights=None):
+        if weights is None:
+            return np.full(len(self.assets), 1.0 / len(self.assets))
+        if isinstance(weights, (dict, pd.Series)):
+            return np.array([float(weights.get(a, 0.0)) for a in self.assets])
+        return np.asarray(weights, dtype=float)
+
+    def risk(self, weights=None, confidence=CONFIDENCE):
+        w = self.weights(weights)
+        sigma_w = self.cov @ w
+
+        vol = np.sqrt(w @ sigma_w)
+        mu = w @ self.mean
+        z = NormalDist().inv_cdf(confidence)
+
+        # Euler decomposition: component risks sum to the portfolio volatility
+        marginal = sigma_w / vol
+        component = w * marginal
+        contributions = pd.DataFrame({
+            "Weight": w,
+            "Marginal Risk": marginal,
+            "Component Risk": component,
+            "% of Risk": component / vol,
+        }, index=self.assets)
+
+        return {
+            "Daily Volatility": vol,
+            "Annual Volatility": vol * np.sqrt(self.periods_per_year),
+            "Expected Return": mu,
+            "Sharpe Ratio": mu / vol,
+            "Beta": sigma_w[self._b] / self.cov[self._b, self._b],
+            "VaR": z * vol - mu,
+            "CVaR": vol * np.exp(-z * z / 2) / (np.sqrt(2 * np.pi) * (1 - confidence)) - mu,
+            "contributions": contributions,
+        }
+
+    # Many candidate weightings at once: k x assets matrix -> k rows of metrics
+    def what_if(self, weight_matrix, confidence=CONFIDENCE):
+        W = np.atleast_2d(np.asarray(weight_matrix, dtype=float))
+        sigma_W = W @ self.cov
+        vol = np.sqrt(np.einsum("ij,ij->i", sigma_W, W))
+        mu = W @ self.mean
+        z = NormalDist().inv_cdf(confidence)
+
+        return pd.DataFrame({
+            "Daily Volatility": vol,
+            "Annual Volatility": vol * np.sqrt(self.periods_per_year),
+            "Expected Return": mu,
+            "Sharpe Ratio": mu / vol,
+            "Beta": sigma_W[:, self._b] / self.cov[self._b, self._b],
+            "VaR": z * vol - mu,
+        })
+
+
+# ===============================
+# MODEL CACHE
+# ===============================
+
+_models = OrderedDict()
+_models_lock = threading.Lock()
+
+
+# Digest of the row hashes in order, so reordered rows change it
+def _frame_version(returns):
+    row_hashes = pd.util.hash_pandas_object(returns, index=True).to_numpy()
+    return hashlib.sha1(row_hashes.tobytes()).hexdigest()[:16]
+
+
+# Shared across reruns and sessions. `version` should identify the data the
+# returns came from (e.g. feature_cache's data version); without one the
+# frame is hashed. The date window is part of the key, the weights are not.
+def get_portfolio_model(returns, version=None, benchmark="bitcoin", periods_per_year=PERIODS_PER_YEAR):
+    if version is None:
+        version = _frame_version(returns)
+    key = (version, tuple(returns.columns), returns.index.min(), returns.index.max(), benchmark, periods_per_year)
+
+    with _models_lock:
+        model = _models.get(key)
+        if model is not None:
+            _models.move_to_end(key)
+            return model
+
+    model = PortfolioModel(returns, benchmark, periods_per_year)
+    with _models_lock:
+        _models[key] = model
+        while len(_models) > CACHE_ENTRIES:
+            _models.popitem(last=False)
+    return model
@@ -0,0 +1,178 @@
+import math
+import sqlite3
+import threading
+import time
+
+import pandas as pd
+
+from fetcher import align_prices
+from providers import get_provider
+
+# ===============================
+# CONFIGURATION
+# ===============================
+
+STORE_PATH = "data/price_store.db"
+DAY_MS = 86_400_000
+HOUR_MS = 3_600_000
+
+# CoinGecko picks granularity from `days`; daily needs interval=daily,
+# hourly is returned automatically for 2-90 day windows
+RESOLUTIONS = {
+    "daily": {"interval": "daily", "min_days": 1},
+    "hourly": {"interval": None, "min_days": 2},
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS prices (
+    coin TEXT NOT NULL,
+    vs_currency TEXT NOT NULL,
+    resolution TEXT NOT NULL,
+    ts INTEGER NOT NULL,
+    price REAL NOT NULL,
+    PRIMARY KEY (coin, vs_currency, resolution, ts)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS series (
+    coin TEXT NOT NULL,
+    vs_currency TEXT NOT NULL,
+    resolution TEXT NOT NULL,
+    first_ts INTEGER,
+    last_ts INTEGER,
+    updated_at REAL,
+    PRIMARY KEY (coin, vs_currency, resolution)
+);
+"""
+
+
+# ===============================
+# LOCAL TIME-SERIES STORE
+# ===============================
+
+def _snap(ts, resolution):
+    return ts - ts % HOUR_MS if resolution == "hourly" else ts
+
+
+# Prices keyed by (coin, vs_currency, resolution); only the missing tail is fetched
+class PriceStore:
+    def __init__(self, path=STORE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    # First/last timestamp held for a series, or (None, None)
+    def bounds(self, coin, vs_currency="usd", resolution="daily"):
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT first_ts, last_ts FROM series WHERE coin=? AND vs_currency=? AND resolution=?",
+                (coin, vs_currency, resolution)
+            ).fetchone()
+        return row if row else (None, None)
+
+    def last_timestamp(self, coin, vs_currency="usd", resolution="daily"):
+        return self.bounds(coin, vs_currency, resolution)[1]
+
+    # Write [timestamp, price] rows; returns the number of rows written.
+    # Hourly points arrive at a different minute offset on every fetch, so
+    # they are snapped to the start of their hour: a re-fetched hour then
+    # replaces its row instead of adding a near-duplicate beside it.
+    def append(self, coin, prices, vs_currency="usd", resolution="daily"):
+        rows = [
+            (coin, vs_currency, resolution, _snap(int(ts), resolution), float(price))
+            for ts, price in zip(prices["timestamp"], prices["price"])
+        ]
+        key = (coin, vs_currency, resolution)
+
+        with self._lock, self.conn:
+            if resolution == "daily":
+                # The newest daily point is an intraday snapshot; replace it on every sync
+                self.conn.execute(
+                    "DELETE FROM prices WHERE coin=? AND vs_currency=? AND resolution=? AND ts % ? != 0",
+                    key + (DAY_MS,)
+                )
+            self.conn.executemany("INSERT OR REPLACE INTO prices VALUES (?, ?, ?, ?, ?)", rows)
+            first_ts, last_ts = self.conn.execute(
+                "SELECT MIN(ts), MAX(ts) FROM prices WHERE coin=? AND vs_currency=? AND resolution=?",
+                key
+            ).fetchone()
+            self.conn.execute(
+                "INSERT OR REPLACE INTO series VALUES (?, ?, ?, ?, ?, ?)",
+                key + (first_ts, last_ts, time.time())
+            )
+        return len(rows)
+
+    # Range-scoped read of raw [timestamp, price] rows
+    def read_raw(self, coin, start=None, end=None, vs_currency="usd", resolution="daily"):
+        start_ms = _to_ms(start) if start is not None else 0
+        end_ms = _to_ms(end) if end is not None else 2 ** 62
+
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT ts, price FROM prices WHERE coin=? AND vs_currency=? AND resolution=? "
+                "AND ts BETWEEN ? AND ? ORDER BY ts",
+                (coin, vs_currency, resolution, start_ms, end_ms)
+            ).fetchall()
+        return pd.DataFrame(rows, columns=["timestamp", "price"])
+
+    # Range-scoped read as a [date, price] frame
+    def read(self, coin, start=None, end=None, vs_currency="usd", resolution="daily"):
+        df = self.read_raw(coin, start, end, vs_currency, resolution)
+        df["date"] = pd.to_datetime(df["timestamp"], unit="ms")
+        return df[["date", "price"]]
+
+    # Aligned Date x coin panel for the given range
+    def read_panel(self, coins, start=None, end=None, vs_currency="usd", resolution="daily"):
+        charts = {coin: self.read_raw(coin, start, end, vs_currency, resolution) for coin in coins}
+        return align_prices(charts)
+
+    # Days CoinGecko must be asked for so the store covers the last `days`
+    def missing_days(self, coin, days, vs_currency="usd", resolution="daily", now_ms=None):
+        now_ms = now_ms if now_ms is not None else int(time.time() * 1000)
+        first_ts, last_ts = self.bounds(coin, vs_currency, resolution)
+
+        # Nothing held, or the requested window starts before what we hold
+        if last_ts is None or first_ts > now_ms - days * DAY_MS + DAY_MS:
+            return days
+
+        gap_days = math.ceil((now_ms - last_ts) / DAY_MS) + 1
+        return min(days, max(gap_days, RESOLUTIONS[resolution]["min_days"]))
+
+    # Fetch only the missing tail for each coin and append it
+    def sync(self, coins, days, vs_currency="usd", resolution="daily", provider=None):
+        coins = list(coins)
+        needed = {coin: self.missing_days(coin, days, vs_currency, resolution) for coin in coins}
+        interval = RESOLUTIONS[resolution]["interval"]
+
+        own_provider = provider is None
+        provider = provider or get_provider()
+        try:
+            charts = provider.market_charts(coins, needed, vs_currency, interval)
+        finally:
+            if own_provider:
+                provider.close()
+
+        return {
+            coin: self.append(coin, prices, vs_currency, resolution)
+            for coin, prices in charts.items()
+        }
+
+
+def _to_ms(value):
+    return int(pd.Timestamp(value).value // 10 ** 6)
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+# Process-wide store shared by scripts and dashboards
+def get_store(path=STORE_PATH):
+    global _store
+    with _store_lock:
+        if _store is None or _store.path != path:
+            _store = PriceStore(path)
+        return _store
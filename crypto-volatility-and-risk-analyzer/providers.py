@@ -0,0 +1,242 @@
+import os
+import time
+from abc import ABC, abstractmethod
+
+import numpy as np
+import pandas as pd
+
+from fetcher import CoinGeckoFetcher
+
+# ===============================
+# CONFIGURATION
+# ===============================
+
+# coingecko | yfinance | replay
+DEFAULT_PROVIDER = os.environ.get("CRYPTO_DATA_PROVIDER", "coingecko")
+
+YF_TICKERS = {
+    "bitcoin": "BTC-USD",
+    "ethereum": "ETH-USD",
+    "solana": "SOL-USD",
+    "cardano": "ADA-USD",
+    "dogecoin": "DOGE-USD",
+    "litecoin": "LTC-USD",
+    "ripple": "XRP-USD",
+    "polkadot": "DOT-USD",
+}
+
+DAY_MS = 86_400_000
+
+# Read-only fixtures for the replay provider; nothing in the app writes here
+REPLAY_DIR = "data/replay"
+
+
+# ===============================
+# PROVIDER INTERFACE
+# ===============================
+
+# Every source answers the same calls the pipeline makes:
+#   market_chart(s)  -> [timestamp (ms), price] frames, like CoinGecko's market_chart
+#   simple_price     -> {coin: {"usd", "usd_24h_change", "usd_24h_vol"}}
+#   history          -> daily OHLCV frame indexed by Date, like yfinance
+class DataProvider(ABC):
+    name = "base"
+
+    @abstractmethod
+    def market_chart(self, coin, days, vs_currency="usd", interval=None):
+        pass
+
+    def market_charts(self, coins, days, vs_currency="usd", interval=None):
+        days_for = days if isinstance(days, dict) else dict.fromkeys(coins, days)
+        return {coin: self.market_chart(coin, days_for[coin], vs_currency, interval) for coin in coins}
+
+    @abstractmethod
+    def simple_price(self, coins, vs_currency="usd"):
+        pass
+
+    @abstractmethod
+    def history(self, coin, period="1y"):
+        pass
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# ===============================
+# COINGECKO
+# ===============================
+
+class CoinGeckoProvider(DataProvider):
+    name = "coingecko"
+
+    def __init__(self, **fetcher_kwargs):
+        self.fetcher = CoinGeckoFetcher(**fetcher_kwargs)
+
+    def market_chart(self, coin, days, vs_currency="usd", interval=None):
+        return self.fetcher.market_chart(coin, days, vs_currency, interval)
+
+    # Concurrent, through the fetcher's pooled session
+    def market_charts(self, coins, days, vs_currency="usd", interval=None):
+        return self.fetcher.market_charts(coins, days, vs_currency, interval)
+
+    def simple_price(self, coins, vs_currency="usd"):
+        return self.fetcher.get_json("simple/price", {
+            "ids": ",".join(coins),
+            "vs_currencies": vs_currency,
+            "include_24hr_vol": "true",
+            "include_24hr_change": "true"
+        })
+
+    def history(self, coin, period="1y"):
+        days = {"1mo": 30, "3mo": 90, "6mo": 180, "1y": 365}.get(period, 365)
+        prices = self.market_chart(coin, days, interval="daily")
+        df = pd.DataFrame({"Close": prices["price"].to_numpy()},
+                          index=pd.to_datetime(prices["timestamp"], unit="ms", utc=True))
+        df.index.name = "Date"
+        return df
+
+    def close(self):
+        self.fetcher.close()
+
+
+# ===============================
+# YFINANCE
+# ===============================
+
+class YFinanceProvider(DataProvider):
+    name = "yfinance"
+
+    def __init__(self):
+        # Optional dependency, only needed when this provider is selected
+        import yfinance
+        self.yf = yfinance
+
+    def history(self, coin, period="1y"):
+        return self.yf.Ticker(YF_TICKERS.get(coin, coin)).history(period=period)
+
+    def market_chart(self, coin, days, vs_currency="usd", interval=None):
+        data = self.history(coin, period=f"{int(days) + 1}d")
+        return pd.DataFrame({
+            "timestamp": data.index.tz_convert("UTC").tz_localize(None).as_unit("ms").asi8,
+            "price": data["Close"].to_numpy()
+        })
+
+    def simple_price(self, coins, vs_currency="usd"):
+        payload = {}
+        for coin in coins:
+            data = self.history(coin, period="2d")
+            last, prev = data["Close"].iloc[-1], data["Close"].iloc[0]
+            payload[coin] = {
+                "usd": float(last),
+                "usd_24h_change": float((last / prev - 1) * 100),
+                "usd_24h_vol": float(data["Volume"].iloc[-1]),
+            }
+        return payload
+
+
+# ===============================
+# FILE REPLAY (OFFLINE)
+# ===============================
+
+# Serves the checked-in fixtures in data/replay/ with no network:
+#   prices.csv                 -> market_chart / stream for the five tracked coins
+#   btc_ohlc.csv               -> BTC OHLCV history
+#   markets.csv, quotes.csv    -> simple_price
+# They are copies of the CSVs the scripts produce, kept apart so that
+# running a script in replay mode never rewrites its own input.
+# With rebase=True the files' last day is shifted to today, so the price
+# store and date windows behave exactly as they would against live data.
+class ReplayProvider(DataProvider):
+    name = "replay"
+
+    def __init__(self, prices_path=os.path.join(REPLAY_DIR, "prices.csv"),
+                 ohlc_path=os.path.join(REPLAY_DIR, "btc_ohlc.csv"),
+                 market_path=os.path.join(REPLAY_DIR, "markets.csv"),
+                 table_path=os.path.join(REPLAY_DIR, "quotes.csv"),
+                 speedup=None, rebase=True):
+        self.speedup = speedup
+
+        prices = pd.read_csv(prices_path, index_col="Date", parse_dates=True)
+        self.prices = prices[[c for c in prices.columns if "_" not in c]]
+
+        self.ohlc = pd.read_csv(ohlc_path, index_col="Date")
+        self.ohlc.index = pd.to_datetime(self.ohlc.index, utc=True)
+
+        self.offset = pd.Timedelta(0)
+        if rebase:
+            today = pd.Timestamp.now(tz="UTC").normalize().tz_localize(None)
+            self.offset = today - self.prices.index[-1].normalize()
+
+        self.quotes = self._load_quotes(market_path, table_path)
+
+    @staticmethod
+    def _load_quotes(market_path, table_path):
+        quotes = {}
+        table = pd.read_csv(table_path)
+        for _, r in table.iterrows():
+            volume = r["Volume (24h)"].strip("$")
+            quotes[r["Cryptocurrency"].lower()] = {
+                "usd": float(r["Price (USD)"].strip("$").replace(",", "")),
+                "usd_24h_change": float(r["24h Change"].split()[-1].rstrip("%")),
+                "usd_24h_vol": float(volume.rstrip("B")) * 1e9,
+            }
+        market = pd.read_csv(market_path)
+        for _, r in market.iterrows():
+            quotes[r["id"]] = {
+                "usd": float(r["current_price"]),
+                "usd_24h_change": float(r["price_change_percentage_24h"]),
+                "usd_24h_vol": float(r["total_volume"]),
+            }
+        return quotes
+
+    def _timestamps(self, index):
+        return (index + self.offset).as_unit("ms").asi8
+
+    def market_chart(self, coin, days, vs_currency="usd", interval=None):
+        series = self.prices[coin].dropna().iloc[-(int(days) + 1):]
+        return pd.DataFrame({"timestamp": self._timestamps(series.index), "price": series.to_numpy()})
+
+    def simple_price(self, coins, vs_currency="usd"):
+        return {coin: dict(self.quotes[coin]) for coin in coins if coin in self.quotes}
+
+    def history(self, coin, period="1y"):
+        if coin != "bitcoin":
+            raise KeyError(f"replay history only has bitcoin OHLC, not {coin}")
+        data = self.ohlc.copy()
+        data.index = data.index + self.offset
+        return data
+
+    # Yield (coin, timestamp_ms, price) ticks in time order. With a speed-up,
+    # sleeps for data-time / speedup between ticks (86_400 = one day per
+    # second); with speedup=None ticks are emitted as fast as possible.
+    def stream(self, coins=None):
+        frame = self.prices[list(coins) if coins else list(self.prices.columns)]
+        timestamps = self._timestamps(frame.index)
+        values = frame.to_numpy()
+
+        previous = None
+        for ts, row in zip(timestamps, values):
+            if self.speedup and previous is not None:
+                time.sleep((ts - previous) / 1000 / self.speedup)
+            previous = ts
+            for coin, price in zip(frame.columns, row):
+                if not np.isnan(price):
+                    yield coin, int(ts), float(price)
+
+
+PROVIDERS = {
+    "coingecko": CoinGeckoProvider,
+    "yfinance": YFinanceProvider,
+    "replay": ReplayProvider,
+}
+
+
+# Provider chosen by name or by CRYPTO_DATA_PROVIDER
+def get_provider(name=None, **kwargs):
+    return PROVIDERS[name or DEFAULT_PROVIDER](**kwargs)
@@ -0,0 +1,405 @@
+import hashlib
+import html
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from downsample import downsample_series
+from instrumentation import timed
+from risk_classification import classify
+
+# ===============================
+# CONFIGURATION
+# ===============================
+
+REPORTS_DIR = "data/reports"
+TITLE = "Risk Classification Report"
+FORMATS = {"csv": "text/csv", "pdf": "application/pdf", "html": "text/html"}
+# Rendered reports kept in memory by the background worker
+CACHE_ENTRIES = 32
+# Points per price line on a per-asset page
+CHART_POINTS = 300
+
+LEVEL_COLORS = {"High": (239, 68, 68), "Medium": (250, 204, 21), "Low": (34, 197, 94)}
+
+
+# ===============================
+# REPORT DATA
+# ===============================
+# A report is built from a metrics frame (one row per Asset, as in
+# data/crypto_metrics.csv) and optionally a Date x asset price frame whose
+# columns match the Asset values, which adds a price chart to each asset page.
+
+# Content hash of everything a report is rendered from
+def data_version(metrics, prices=None):
+    digest = hashlib.sha1()
+    digest.update(pd.util.hash_pandas_object(metrics, index=False).to_numpy().tobytes())
+    digest.update(",".join(map(str, metrics.columns)).encode())
+    if prices is not None:
+        digest.update(pd.util.hash_pandas_object(prices, index=True).to_numpy().tobytes())
+        digest.update(",".join(map(str, prices.columns)).encode())
+    return digest.hexdigest()[:16]
+
+
+# Metrics with a plain "Low" / "Medium" / "High" level per row
+def _levels(metrics):
+    if "Risk Level" in metrics:
+        return metrics["Risk Level"].astype(str).str.replace(" Risk", "", regex=False)
+    return classify(metrics)
+
+
+# Every column as display strings, formatted a column at a time
+def _formatted(metrics):
+    out = {}
+    for column in metrics.columns:
+        values = metrics[column]
+        if pd.api.types.is_float_dtype(values):
+            out[column] = values.map("{:.4f}".format)
+        else:
+            out[column] = values.astype(str)
+    return pd.DataFrame(out, index=metrics.index)
+
+
+def _price_points(prices, asset, n_out=CHART_POINTS):
+    if prices is None or asset not in prices:
+        return None
+    series = downsample_series(prices[asset].dropna(), n_out, method="minmax")
+    if len(series) < 2:
+        return None
+    return series.to_numpy(dtype=float)
+
+
+def _summary(metrics, levels):
+    counts = levels.value_counts()
+    return {
+        "Total Assets": len(metrics),
+        "Average Volatility": f"{metrics['Annual Volatility'].mean():.2f}",
+        "Risk Distribution": " / ".join(f"{counts.get(l, 0)} {l}" for l in ["High", "Medium", "Low"]),
+    }
+
+
+# ===============================
+# RENDERERS
+# ===============================
+
+def render_csv(metrics, prices=None, title=TITLE):
+    return metrics.to_csv(index=False).encode("utf-8")
+
+
+def _pdf_text(value):
+    return str(value).encode("latin-1", "replace").decode("latin-1")
+
+
+# Horizontal bars of annual volatility, coloured by risk level
+def _pdf_bar_chart(pdf, assets, values, levels):
+    top = max(np.nanmax(values), 1e-12)
+    for asset, value, level in zip(assets, values, levels):
+        if pdf.get_y() > 270:
+            pdf.add_page()
+        y = pdf.get_y()
+        pdf.cell(30, 6, _pdf_text(asset))
+        width = 0 if np.isnan(value) else 130 * value / top
+        pdf.set_fill_color(*LEVEL_COLORS.get(level, (156, 163, 175)))
+        pdf.rect(40, y + 1, width, 4, style="F")
+        pdf.set_xy(42 + width, y)
+        pdf.cell(0, 6, f"{value * 100:.1f}%", ln=True)
+
+
+def _pdf_line_chart(pdf, points, width=190, height=70):
+    x0, y0 = pdf.get_x(), pdf.get_y()
+    pdf.set_draw_color(200, 200, 200)
+    pdf.rect(x0, y0, width, height)
+    lo, hi = points.min(), points.max()
+    span = hi - lo or 1.0
+    xs = x0 + np.linspace(0, width, len(points))
+    ys = y0 + height - (points - lo) / span * height
+    pdf.set_draw_color(37, 99, 235)
+    for i in range(1, len(points)):
+        pdf.line(xs[i - 1], ys[i - 1], xs[i], ys[i])
+    pdf.set_draw_color(0, 0, 0)
+    pdf.set_y(y0 + height + 2)
+    pdf.cell(0, 5, f"Low {lo:,.2f}   High {hi:,.2f}", ln=True)
+
+
+# Summary page with the volatility chart and metrics table, then one page
+# per asset with its metrics and (when prices are given) its price history
+def render_pdf(metrics, prices=None, title=TITLE):
+    from fpdf import FPDF
+
+    levels = _levels(metrics)
+    text = _formatted(metrics)
+    assets = metrics["Asset"].astype(str).tolist()
+
+    pdf = FPDF()
+    pdf.set_auto_page_break(True, margin=15)
+    pdf.add_page()
+    pdf.set_font("Arial", "B", 16)
+    pdf.cell(0, 10, _pdf_text(title), ln=True)
+    pdf.set_font("Arial", size=10)
+    pdf.cell(0, 6, f"Generated {datetime.now():%Y-%m-%d %H:%M}", ln=True)
+    for name, value in _summary(metrics, levels).items():
+        pdf.cell(0, 6, f"{name}: {value}", ln=True)
+
+    pdf.ln(4)
+    pdf.set_font("Arial", "B", 12)
+    pdf.cell(0, 8, "Annual Volatility by Asset", ln=True)
+    pdf.set_font("Arial", size=9)
+    _pdf_bar_chart(pdf, assets, metrics["Annual Volatility"].to_numpy(dtype=float), levels.tolist())
+
+    pdf.ln(4)
+    pdf.set_font("Arial", "B", 12)
+    pdf.cell(0, 8, "Metrics", ln=True)
+    pdf.set_font("Arial", "B", 8)
+    width = 190 / len(text.columns)
+    for column in text.columns:
+        pdf.cell(width, 6, _pdf_text(column), border=1)
+    pdf.ln()
+    pdf.set_font("Arial", size=8)
+    for row in text.itertuples(index=False):
+        for value in row:
+            pdf.cell(width, 6, _pdf_text(value), border=1)
+        pdf.ln()
+
+    details = text.drop(columns=["Asset"]).to_dict("records")
+    for asset, level, fields in zip(assets, levels, details):
+        pdf.add_page()
+        pdf.set_font("Arial", "B", 14)
+        pdf.set_text_color(*LEVEL_COLORS.get(level, (0, 0, 0)))
+        pdf.cell(0, 10, _pdf_text(f"{asset} - {level} Risk"), ln=True)
+        pdf.set_text_color(0, 0, 0)
+        pdf.set_font("Arial", size=10)
+        for name, value in fields.items():
+            pdf.cell(60, 7, _pdf_text(name), border=1)
+            pdf.cell(60, 7, _pdf_text(value), border=1, ln=True)
+
+        points = _price_points(prices, asset)
+        if points is not None:
+            pdf.ln(4)
+            pdf.set_font("Arial", "B", 12)
+            pdf.cell(0, 8, "Price History", ln=True)
+            pdf.set_font("Arial", size=8)
+            _pdf_line_chart(pdf, points)
+
+    out = pdf.output(dest="S")
+    return out.encode("latin-1") if isinstance(out, str) else bytes(out)
+
+
+def _svg_bar_chart(assets, values, levels, width=640, row=22):
+    top = max(np.nanmax(values), 1e-12)
+    bars = []
+    for i, (asset, value, level) in enumerate(zip(assets, values, levels)):
+        w = 0 if np.isnan(value) else (width - 200) * value / top
+        y = i * row
+        bars.append(
+            f'<text x="0" y="{y + 15}">{html.escape(asset)}</text>'
+            f'<rect x="100" y="{y + 4}" width="{w:.1f}" height="14" fill="rgb{LEVEL_COLORS.get(level, (156, 163, 175))}"/>'
+            f'<text x="{106 + w:.1f}" y="{y + 15}">{value * 100:.1f}%</text>'
+        )
+    return f'<svg width="{width}" height="{len(bars) * row}" font-size="12">{"".join(bars)}</svg>'
+
+
+def _svg_line_chart(points, width=640, height=200):
+    lo, hi = points.min(), points.max()
+    span = hi - lo or 1.0
+    xs = np.linspace(0, width, len(points))
+    ys = height - (points - lo) / span * height
+    path = " ".join(f"{x:.1f},{y:.1f}" for x, y in zip(xs, ys))
+    return (f'<svg width="{width}" height="{height}"><polyline points="{path}" '
+            f'fill="none" stroke="#2563EB" stroke-width="1.5"/></svg>'
+            f"<p>Low {lo:,.2f} &middot; High {hi:,.2f}</p>")
+
+
+# Self-contained page: inline CSS and SVG, no scripts or external assets
+def render_html(metrics, prices=None, title=TITLE):
+    levels = _levels(metrics)
+    text = _formatted(metrics)
+    assets = metrics["Asset"].astype(str).tolist()
+
+    parts = [
+        f"<!DOCTYPE html><html><head><meta charset='utf-8'><title>{html.escape(title)}</title>",
+        "<style>body{font-family:Arial,sans-serif;margin:2em;} table{border-collapse:collapse;}"
+        "td,th{border:1px solid #ccc;padding:4px 8px;} .asset{page-break-before:always;}</style>",
+        f"</head><body><h1>{html.escape(title)}</h1>",
+        f"<p>Generated {datetime.now():%Y-%m-%d %H:%M}</p><ul>",
+    ]
+    parts += [f"<li><b>{name}:</b> {value}</li>" for name, value in _summary(metrics, levels).items()]
+    parts.append("</ul><h2>Annual Volatility by Asset</h2>")
+    parts.append(_svg_bar_chart(assets, metrics["Annual Volatility"].to_numpy(dtype=float), levels.tolist()))
+    parts.append("<h2>Metrics</h2>")
+    parts.append(text.to_html(index=False))
+
+    details = text.drop(columns=["Asset"]).to_dict("records")
+    for asset, level, fields in zip(assets, levels, details):
+        parts.append(f"<div class='asset'><h2>{html.escape(asset)} &ndash; {level} Risk</h2><table>")
+        parts += [f"<tr><th>{html.escape(k)}</th><td>{html.escape(v)}</td></tr>" for k, v in fields.items()]
+        parts.append("</table>")
+        points = _price_points(prices, asset)
+        if points is not None:
+            parts.append("<h3>Price History</h3>" + _svg_line_chart(points))
+        parts.append("</div>")
+    parts.append("</body></html>")
+    return "".join(parts).encode("utf-8")
+
+
+RENDERERS = {"csv": render_csv, "pdf": render_pdf, "html": render_html}
+
+
+def render_report(fmt, metrics, prices=None, title=TITLE):
+    return RENDERERS[fmt](metrics, prices, title)
+
+
+# ===============================
+# BACKGROUND WORKER
+# ===============================
+
+# Renders reports off the Streamlit script thread. Nothing is built until
+# a report is submitted; finished bytes stay cached under (format, title,
+# data version), so every session and rerun on the same data shares them.
+class ReportWorker:
+    def __init__(self, workers=1, max_cached=CACHE_ENTRIES):
+        self.max_cached = max_cached
+        self.timings = {}
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="reports")
+        self._futures = OrderedDict()
+        self._lock = threading.Lock()
+
+    # Callers that check several formats per rerun pass a `version` computed
+    # once with data_version() instead of re-hashing the data on every call
+    def key(self, fmt, metrics, prices=None, title=TITLE, version=None):
+        return (fmt, title, version or data_version(metrics, prices))
+
+    def _render(self, key, fmt, metrics, prices, title):
+        start = time.perf_counter()
+        with timed(f"render.report.{fmt}"):
+            data = render_report(fmt, metrics, prices, title)
+        self.timings[key] = time.perf_counter() - start
+        return data
+
+    # Future for the report's bytes, starting the render if it isn't cached
+    # (failed renders are retried on the next submit)
+    def submit(self, fmt, metrics, prices=None, title=TITLE, version=None):
+        key = self.key(fmt, metrics, prices, title, version)
+        with self._lock:
+            future = self._futures.get(key)
+            if future is None or (future.done() and future.exception() is not None):
+                future = self._pool.submit(self._render, key, fmt, metrics.copy(),
+                                           None if prices is None else prices.copy(), title)
+                self._futures[key] = future
+            self._futures.move_to_end(key)
+            while len(self._futures) > self.max_cached:
+                old_key, _ = self._futures.popitem(last=False)
+                self.timings.pop(old_key, None)
+        return future
+
+    # Bytes if the report has already been rendered, else None; never blocks
+    # and never starts a render
+    def ready(self, fmt, metrics, prices=None, title=TITLE, version=None):
+        with self._lock:
+            future = self._futures.get(self.key(fmt, metrics, prices, title, version))
+        if future is None or not future.done() or future.exception() is not None:
+            return None
+        return future.result()
+
+    # True while a submitted render is still running
+    def pending(self, fmt, version, title=TITLE):
+        with self._lock:
+            future = self._futures.get((fmt, title, version))
+        return future is not None and not future.done()
+
+
+_worker = None
+_worker_lock = threading.Lock()
+
+
+def get_report_worker():
+    global _worker
+    with _worker_lock:
+        if _worker is None:
+            _worker = ReportWorker()
+        return _worker
+
+
+# ===============================
+# BATCH GENERATION
+# ===============================
+# A job is {"name": ..., "format": ..., "assets": [...] or None}: a
+# per-asset report, or a per-user report over that user's asset list.
+
+def per_asset_jobs(metrics, fmt="pdf"):
+    return [{"name": str(asset), "format": fmt, "assets": [asset]} for asset in metrics["Asset"]]
+
+
+def _render_job(args):
+    job, metrics, prices, title = args
+    start = time.perf_counter()
+    data = render_report(job["format"], metrics, prices, title)
+    return data, time.perf_counter() - start
+
+
+# Renders every job over a process pool (serially with one worker). Returns
+# one dict per job with its bytes and render seconds, plus overall timing.
+def render_batch(jobs, metrics, prices=None, workers=None, title=TITLE):
+    tasks = []
+    for job in jobs:
+        subset = metrics if job.get("assets") is None else metrics[metrics["Asset"].isin(job["assets"])]
+        sub_prices = None
+        if prices is not None:
+            sub_prices = prices[[a for a in subset["Asset"] if a in prices]]
+        tasks.append((job, subset.reset_index(drop=True), sub_prices, f"{title} - {job['name']}"))
+
+    start = time.perf_counter()
+    workers = min(workers or os.cpu_count() or 1, max(len(tasks), 1))
+    if workers <= 1:
+        results = [_render_job(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_render_job, tasks))
+    elapsed = time.perf_counter() - start
+
+    reports = [
+        {"name": job["name"], "format": job["format"], "bytes": data, "seconds": seconds}
+        for job, (data, seconds) in zip(jobs, results)
+    ]
+    timing = {
+        "reports": len(reports),
+        "workers": workers,
+        "seconds": elapsed,
+        "reports_per_second": len(reports) / elapsed if elapsed else float("inf"),
+    }
+    return reports, timing
+
+
+# ===============================
+# COMMAND LINE
+# ===============================
+
+def main(fmt="pdf"):
+    from feature_cache import get_features
+    from risk_classification import TICKERS
+
+    metrics = pd.read_csv("data/crypto_metrics.csv")
+    prices = get_features(TICKERS).prices.rename(columns=TICKERS)
+
+    jobs = [{"name": "all", "format": fmt, "assets": None}] + per_asset_jobs(metrics, fmt)
+    reports, timing = render_batch(jobs, metrics, prices)
+
+    os.makedirs(REPORTS_DIR, exist_ok=True)
+    for report in reports:
+        path = os.path.join(REPORTS_DIR, f"risk_report_{report['name']}.{fmt}")
+        with open(path, "wb") as f:
+            f.write(report["bytes"])
+        print(f"{path}: {len(report['bytes']):,} bytes in {report['seconds'] * 1000:.1f} ms")
+    print(f"\n{timing['reports']} reports in {timing['seconds']:.2f}s on {timing['workers']} "
+          f"worker(s): {timing['reports_per_second']:,.1f} reports/s")
+
+
+if __name__ == "__main__":
+    import sys
+
+    main(*sys.argv[1:2])
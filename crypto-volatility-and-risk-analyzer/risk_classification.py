@@ -0,0 +1,153 @@
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+# ===============================
+# CONFIGURATION
+# ===============================
+
+LEVELS = ["Low", "Medium", "High"]
+ICONS = {"Low": "🟢", "Medium": "🟠", "High": "🔴"}
+
+# Every dashboard labels with the same rule set unless told otherwise
+DEFAULT_RULESET = os.environ.get("CRYPTO_RISK_RULESET", "absolute")
+
+# absolute    annualized volatility above fixed cut-offs
+# quantile    terciles of the frame being labelled (relative ranking)
+# vol_regime  the asset's current volatility (next-day GARCH forecast from
+#             vol_forecast.py) relative to its long-run GARCH level; rows
+#             without both estimates fall back to the absolute rule
+RULESETS = {
+    "absolute": {"kind": "absolute", "column": "Annual Volatility", "medium": 0.4, "high": 0.7},
+    "quantile": {"kind": "quantile", "column": "Annual Volatility", "medium": 0.33, "high": 0.66},
+    "vol_regime": {
+        "kind": "regime",
+        "column": "GARCH Vol 1d",
+        "baseline": "Long-Run Volatility",
+        "medium": 0.9,
+        "high": 1.2,
+    },
+}
+
+FORECASTS_CSV = "data/volatility_forecasts.csv"
+CACHE_ENTRIES = 64
+
+TICKERS = {
+    "bitcoin": "BTC",
+    "ethereum": "ETH",
+    "solana": "SOL",
+    "cardano": "ADA",
+    "dogecoin": "DOGE",
+}
+
+
+# ===============================
+# VECTORIZED RULES
+# ===============================
+
+def _by_thresholds(values, medium, high):
+    return np.select([values > high, values > medium], ["High", "Medium"], "Low")
+
+
+def _absolute(df, rule):
+    return _by_thresholds(df[rule["column"]].to_numpy(dtype=float), rule["medium"], rule["high"])
+
+
+# Same semantics as the old milestone 2 terciles: below the lower quantile
+# is Low, below the upper one Medium, the rest High
+def _quantile(df, rule):
+    values = df[rule["column"]].to_numpy(dtype=float)
+    low, high = np.nanquantile(values, [rule["medium"], rule["high"]])
+    return np.select([values < low, values < high], ["Low", "Medium"], "High")
+
+
+def _regime(df, rule):
+    fallback = _absolute(df, RULESETS["absolute"])
+    if rule["column"] not in df or rule["baseline"] not in df:
+        return fallback
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = df[rule["column"]].to_numpy(dtype=float) / df[rule["baseline"]].to_numpy(dtype=float)
+    labels = _by_thresholds(ratio, rule["medium"], rule["high"])
+    return np.where(np.isfinite(ratio), labels, fallback)
+
+
+RULES = {"absolute": _absolute, "quantile": _quantile, "regime": _regime}
+
+
+# Current and long-run volatility per Asset (ticker) from the forecasting
+# output, for frames that don't carry them already
+def with_regime_baseline(df, forecasts_path=FORECASTS_CSV):
+    rule = RULESETS["vol_regime"]
+    missing = [c for c in (rule["column"], rule["baseline"]) if c not in df]
+    if not missing or "Asset" not in df or not os.path.exists(forecasts_path):
+        return df
+    forecasts = pd.read_csv(forecasts_path, usecols=["Asset"] + missing)
+    return df.merge(forecasts, on="Asset", how="left")
+
+
+# ===============================
+# CACHED CLASSIFICATION
+# ===============================
+
+_labels = OrderedDict()
+_labels_lock = threading.Lock()
+
+
+# Version of a CSV for callers that label it straight from disk
+def file_version(path):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return f"{path}:{stat.st_mtime_ns}:{stat.st_size}"
+
+
+# Risk level ("Low" / "Medium" / "High") for every row of a metrics frame,
+# as a Series aligned with df. With a `version` (which must change whenever
+# the rows or their order do) labels are cached per (version, rule set);
+# without one they are computed directly, which costs about as much as
+# hashing the frame would.
+def classify(df, ruleset=None, version=None):
+    name = ruleset or DEFAULT_RULESET
+    rule = RULESETS[name]
+    if rule["kind"] == "regime":
+        df = with_regime_baseline(df)
+    if version is None:
+        return pd.Series(RULES[rule["kind"]](df, rule), index=df.index, name="Risk Level")
+
+    # The regime baseline is a second input with its own version
+    key = (name, version, file_version(FORECASTS_CSV) if rule["kind"] == "regime" else None)
+    with _labels_lock:
+        labels = _labels.get(key)
+        if labels is not None:
+            _labels.move_to_end(key)
+            return pd.Series(labels, index=df.index, name="Risk Level")
+
+    labels = RULES[rule["kind"]](df, rule)
+    with _labels_lock:
+        _labels[key] = labels
+        while len(_labels) > CACHE_ENTRIES:
+            _labels.popitem(last=False)
+    return pd.Series(labels, index=df.index, name="Risk Level")
+
+
+# Single asset: annualized volatility (and optionally its coin id, for the
+# regime estimates) -> risk level. Quantile rules need a cross-section, so
+# `reference` (a metrics frame) supplies the other assets; `version` is the
+# reference data's version and enables the cache like classify's.
+def classify_value(annual_volatility, coin=None, ruleset=None, reference=None, version=None):
+    row = pd.DataFrame({
+        "Asset": [TICKERS.get(coin, coin)],
+        "Annual Volatility": [annual_volatility],
+    })
+    frame = row if reference is None else pd.concat([reference, row], ignore_index=True)
+    if version is not None:
+        version = (version, coin, float(annual_volatility))
+    return classify(frame, ruleset, version).iloc[-1]
+
+
+def label_with_icon(level):
+    return f"{ICONS[level]} {level} Risk"
@@ -0,0 +1,34 @@
+import numpy as np
+import pandas as pd
+
+# ===============================
+# VECTORIZED CROSS-ASSET RISK
+# ===============================
+
+# Returns (metrics, covariance, correlation) for a Date x asset returns frame.
+# Everything comes from one covariance product; there is no loop over assets.
+def compute_risk_metrics(returns, benchmark="bitcoin", periods_per_year=252):
+    assets = returns.columns
+    X = returns.to_numpy(dtype=float)
+    n = X.shape[0]
+
+    mean = X.mean(axis=0)
+    centered = X - mean
+    cov = centered.T @ centered / (n - 1)
+
+    daily_vol = np.sqrt(np.diag(cov))
+    corr = cov / np.outer(daily_vol, daily_vol)
+
+    b = assets.get_loc(benchmark)
+    beta = cov[:, b] / cov[b, b]
+
+    metrics = pd.DataFrame({
+        "Daily Volatility": daily_vol,
+        "Annual Volatility": daily_vol * np.sqrt(periods_per_year),
+        "Sharpe Ratio": mean / daily_vol,
+        "Beta": beta
+    }, index=assets)
+
+    cov_df = pd.DataFrame(cov, index=assets, columns=assets)
+    corr_df = pd.DataFrame(corr, index=assets, columns=assets)
+    return metrics, cov_df, corr_df
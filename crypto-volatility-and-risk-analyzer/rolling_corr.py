@@ -0,0 +1,181 @@
+import hashlib
+import json
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+# ===============================
+# CONFIGURATION
+# ===============================
+
+ROLLING_DIR = "data/rolling_cache"
+WINDOW = 30
+# Window steps advanced per vectorized update; bounds scratch memory to
+# BLOCK x N x N float64 and is also how often the sums are re-anchored
+BLOCK = 64
+# Cached results kept on disk; older data versions are removed
+MAX_CACHED = 8
+
+
+# ===============================
+# INCREMENTAL ROLLING COVARIANCE
+# ===============================
+
+def _outer(rows):
+    return np.einsum("ti,tj->tij", rows, rows)
+
+
+# Covariance of every trailing window as a (steps x N x N) float32 array.
+# Running sums of x and x x' are carried from one step to the next: each
+# step adds the row entering the window and removes the row leaving it,
+# so the cost is O(N^2) per step instead of O(window * N^2). Steps are
+# advanced a block at a time with a cumulative sum, and the sums are
+# recomputed exactly at each block boundary so rounding cannot build up.
+def rolling_covariance(X, window=WINDOW, block=BLOCK):
+    X = np.asarray(X, dtype=float)
+    T, N = X.shape
+    steps = T - window + 1
+    out = np.empty((max(steps, 0), N, N), dtype=np.float32)
+    if steps <= 0:
+        return out
+
+    s = X[:window].sum(axis=0)
+    ss = X[:window].T @ X[:window]
+    out[0] = (ss - np.outer(s, s) / window) / (window - 1)
+
+    for start in range(1, steps, block):
+        stop = min(start + block, steps)
+        entering = X[start + window - 1:stop + window - 1]
+        leaving = X[start - 1:stop - 1]
+
+        S = s + np.cumsum(entering - leaving, axis=0)
+        SS = _outer(entering)
+        SS -= _outer(leaving)
+        np.cumsum(SS, axis=0, out=SS)
+        SS += ss
+        SS -= _outer(S / np.sqrt(window))
+        SS /= window - 1
+        out[start:stop] = SS
+
+        last = X[stop - 1:stop - 1 + window]
+        s, ss = last.sum(axis=0), last.T @ last
+    return out
+
+
+# Correlation and beta stacks from a covariance stack. beta[t, i, j] is the
+# beta of asset i against asset j: cov(i, j) / var(j).
+def correlation_and_beta(cov):
+    var = np.diagonal(cov, axis1=1, axis2=2)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sd = np.sqrt(var)
+        corr = cov / (sd[:, :, None] * sd[:, None, :])
+        beta = cov / var[:, None, :]
+    return corr.astype(np.float32), beta.astype(np.float32)
+
+
+# ===============================
+# RESULT
+# ===============================
+
+class RollingMatrices:
+    def __init__(self, dates, assets, window, corr, beta):
+        self.dates = pd.DatetimeIndex(dates)
+        self.assets = list(assets)
+        self.window = window
+        self.corr = corr
+        self.beta = beta
+
+    def _step(self, date):
+        return max(int(self.dates.searchsorted(pd.Timestamp(date), "right")) - 1, 0)
+
+    # N x N correlation matrix of the window ending on (or before) date
+    def corr_at(self, date):
+        return pd.DataFrame(self.corr[self._step(date)], index=self.assets, columns=self.assets)
+
+    def beta_at(self, date):
+        return pd.DataFrame(self.beta[self._step(date)], index=self.assets, columns=self.assets)
+
+    # Rolling beta of every asset against one benchmark, Date x asset
+    def beta_to(self, benchmark):
+        j = self.assets.index(benchmark)
+        return pd.DataFrame(self.beta[:, :, j], index=self.dates, columns=self.assets)
+
+    def pair(self, a, b):
+        i, j = self.assets.index(a), self.assets.index(b)
+        return pd.Series(self.corr[:, i, j], index=self.dates, name=f"{a}/{b}")
+
+    # Mean off-diagonal correlation per step; a rising line is contagion
+    def average_correlation(self):
+        n = len(self.assets)
+        total = self.corr.sum(axis=(1, 2), dtype=np.float64) - n
+        return pd.Series(total / (n * (n - 1)), index=self.dates, name="Average Correlation")
+
+
+# ===============================
+# ON-DISK CACHE
+# ===============================
+# One directory per (returns data, window), named by a hash of both:
+#
+#   data/rolling_cache/<key>/
+#       meta.json  dates.npy  corr.npy  beta.npy
+#
+# Arrays are opened with mmap_mode="r", so a dashboard rerun only pages
+# in the steps it actually draws.
+
+def cache_key(returns, window):
+    digest = hashlib.sha1()
+    digest.update(json.dumps([list(map(str, returns.columns)), window]).encode())
+    digest.update(pd.DatetimeIndex(returns.index).as_unit("ns").asi8.tobytes())
+    digest.update(np.ascontiguousarray(returns.to_numpy(dtype=float)).tobytes())
+    return digest.hexdigest()[:16]
+
+
+def _save(path, result):
+    tmp_path = path + ".tmp"
+    os.makedirs(tmp_path, exist_ok=True)
+    np.save(os.path.join(tmp_path, "dates.npy"), result.dates.as_unit("ns").asi8)
+    np.save(os.path.join(tmp_path, "corr.npy"), result.corr)
+    np.save(os.path.join(tmp_path, "beta.npy"), result.beta)
+    with open(os.path.join(tmp_path, "meta.json"), "w") as f:
+        json.dump({"assets": result.assets, "window": result.window}, f)
+    os.replace(tmp_path, path)
+
+
+def _load(path):
+    with open(os.path.join(path, "meta.json")) as f:
+        meta = json.load(f)
+    dates = pd.to_datetime(np.load(os.path.join(path, "dates.npy")))
+    corr = np.load(os.path.join(path, "corr.npy"), mmap_mode="r")
+    beta = np.load(os.path.join(path, "beta.npy"), mmap_mode="r")
+    return RollingMatrices(dates, meta["assets"], meta["window"], corr, beta)
+
+
+def _prune(cache_dir, keep=MAX_CACHED):
+    entries = [os.path.join(cache_dir, name) for name in os.listdir(cache_dir)]
+    entries = sorted((p for p in entries if os.path.isdir(p)), key=os.path.getmtime, reverse=True)
+    for path in entries[keep:]:
+        shutil.rmtree(path, ignore_errors=True)
+
+
+# Rolling correlation/beta for a Date x asset returns frame, from the disk
+# cache when this exact data and window have been computed before
+def rolling_matrices(returns, window=WINDOW, cache_dir=ROLLING_DIR):
+    returns = returns.dropna()
+    path = os.path.join(cache_dir, cache_key(returns, window)) if cache_dir else None
+    if path and os.path.exists(os.path.join(path, "meta.json")):
+        return _load(path)
+
+    cov = rolling_covariance(returns.to_numpy(dtype=float), window)
+    corr, beta = correlation_and_beta(cov)
+    result = RollingMatrices(returns.index[window - 1:], returns.columns, window, corr, beta)
+    if path:
+        os.makedirs(cache_dir, exist_ok=True)
+        try:
+            _save(path, result)
+        except OSError:
+            # Another process wrote the same key first
+            shutil.rmtree(path + ".tmp", ignore_errors=True)
+        _prune(cache_dir)
+    return result
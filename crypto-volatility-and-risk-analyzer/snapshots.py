@@ -0,0 +1,53 @@
+import json
+import os
+import tempfile
+import time
+
+# ===============================
+# ATOMIC SNAPSHOTS
+# ===============================
+# Writers produce a temp file in the target directory and os.replace()
+# it over the old one, so readers always see a complete file.
+
+SNAPSHOT_DIR = "data/snapshots"
+
+
+def _atomic_write(path, write):
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "w", newline="", encoding="utf-8") as f:
+            write(f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def atomic_to_csv(df, path, **kwargs):
+    _atomic_write(path, lambda f: df.to_csv(f, **kwargs))
+
+
+def atomic_write_text(path, text):
+    _atomic_write(path, lambda f: f.write(text))
+
+
+# Publish a JSON payload under data/snapshots/<name>.json with its publish time
+def publish_snapshot(name, payload, directory=SNAPSHOT_DIR):
+    document = {"published_at": time.time(), "data": payload}
+    _atomic_write(os.path.join(directory, f"{name}.json"), lambda f: json.dump(document, f))
+
+
+# Latest payload for `name`, or None if missing or older than max_age seconds
+def read_snapshot(name, max_age=None, directory=SNAPSHOT_DIR):
+    path = os.path.join(directory, f"{name}.json")
+    try:
+        with open(path, encoding="utf-8") as f:
+            document = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if max_age is not None and time.time() - document["published_at"] > max_age:
+        return None
+    return document["data"]
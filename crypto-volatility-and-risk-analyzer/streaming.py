@@ -0,0 +1,362 @@
+import json
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from datetime import datetime
+
+from online_vol import StreamingVolatility
+
+# ===============================
+# CONFIGURATION
+# ===============================
+
+# Coinbase Exchange ticker feed; point it at benchmarks/stub_exchange_ws.py
+# (ws://127.0.0.1:<port>/) to run without network access
+STREAM_URL = os.environ.get("CRYPTO_STREAM_URL", "wss://ws-feed.exchange.coinbase.com")
+
+# CoinGecko ids used across the app -> exchange product ids
+PRODUCTS = {
+    "bitcoin": "BTC-USD",
+    "ethereum": "ETH-USD",
+    "solana": "SOL-USD",
+    "cardano": "ADA-USD",
+    "dogecoin": "DOGE-USD",
+    "litecoin": "LTC-USD",
+    "ripple": "XRP-USD",
+    "polkadot": "DOT-USD",
+}
+
+CONNECT_TIMEOUT = 10
+# No frame (ticks or heartbeats) for this long means the connection is dead
+READ_TIMEOUT = 30
+MAX_BACKOFF = 60
+
+SUBSCRIBER_QUEUE = 1000
+# Subscriptions not read for this long (closed browser tabs) are dropped
+SUBSCRIBER_IDLE = 300
+LATENCY_SAMPLES = 2000
+
+VOL_WINDOW = 60
+
+
+def log(message):
+    print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] {message}", flush=True)
+
+
+# ===============================
+# WEBSOCKET CLIENT
+# ===============================
+# The websockets package (sync API, >= 12) handles framing, ping/pong and
+# close. It is imported on first connect, so pages that never stream load
+# without it.
+
+def _connect(url):
+    from websockets.sync.client import connect
+    return connect(url, open_timeout=CONNECT_TIMEOUT)
+
+
+def _connection_errors():
+    from websockets.exceptions import WebSocketException
+    return (OSError, WebSocketException)
+
+
+# ===============================
+# IN-PROCESS PUB/SUB
+# ===============================
+
+# Bounded per-subscriber buffer: a slow reader loses its oldest ticks
+# instead of holding up the connection or other subscribers. `closed` is
+# set once the bus stops publishing to it (unsubscribed or reaped as idle);
+# holders should subscribe again.
+class Subscription:
+    def __init__(self, topic, maxsize=SUBSCRIBER_QUEUE):
+        self.topic = topic
+        self._items = deque(maxlen=maxsize)
+        self._cond = threading.Condition()
+        self.dropped = 0
+        self.closed = False
+        self.last_read = time.monotonic()
+
+    def put(self, message):
+        with self._cond:
+            if len(self._items) == self._items.maxlen:
+                self.dropped += 1
+            self._items.append(message)
+            self._cond.notify()
+
+    # Next message, or None after `timeout` seconds
+    def get(self, timeout=None):
+        with self._cond:
+            self.last_read = time.monotonic()
+            if not self._items and not self._cond.wait_for(lambda: self._items, timeout):
+                return None
+            return self._items.popleft()
+
+    # Everything buffered since the last read, oldest first
+    def drain(self):
+        with self._cond:
+            self.last_read = time.monotonic()
+            items = list(self._items)
+            self._items.clear()
+            return items
+
+
+class PubSub:
+    def __init__(self, idle_after=SUBSCRIBER_IDLE):
+        self.idle_after = idle_after
+        self._subscribers = defaultdict(list)
+        self._lock = threading.Lock()
+
+    def subscribe(self, topic, maxsize=SUBSCRIBER_QUEUE):
+        subscription = Subscription(topic, maxsize)
+        with self._lock:
+            self._subscribers[topic].append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.topic, [])
+            if subscription in subscribers:
+                subscribers.remove(subscription)
+        subscription.closed = True
+
+    def publish(self, topic, message):
+        cutoff = time.monotonic() - self.idle_after
+        with self._lock:
+            subscribers = self._subscribers.get(topic, [])
+            for s in subscribers:
+                if s.last_read < cutoff:
+                    s.closed = True
+            subscribers[:] = [s for s in subscribers if not s.closed]
+            subscribers = list(subscribers)
+        for subscription in subscribers:
+            subscription.put(message)
+        return len(subscribers)
+
+    def subscriber_count(self, topic):
+        with self._lock:
+            return len(self._subscribers.get(topic, []))
+
+
+# ===============================
+# LATENCY
+# ===============================
+
+class LatencyStats:
+    def __init__(self, maxlen=LATENCY_SAMPLES):
+        self._samples = deque(maxlen=maxlen)
+        self._lock = threading.Lock()
+
+    def record(self, seconds):
+        with self._lock:
+            self._samples.append(seconds)
+
+    # Percentiles in milliseconds over the most recent samples
+    def summary(self):
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return {"count": 0, "p50_ms": None, "p95_ms": None, "max_ms": None}
+
+        def pct(q):
+            return samples[min(int(q * len(samples)), len(samples) - 1)] * 1000
+
+        return {"count": len(samples), "p50_ms": pct(0.5), "p95_ms": pct(0.95), "max_ms": samples[-1] * 1000}
+
+
+# ===============================
+# PRICE STREAM
+# ===============================
+
+def _parse_time(value):
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return None
+
+
+# One persistent connection for the whole process. Ticks are published on
+# "ticks" (and "ticks.<coin>") as dicts with the price, 24h stats, the
+# streaming volatility estimates and two timestamps:
+#   time      exchange timestamp of the trade
+#   received  when this process decoded it (time.time())
+class PriceStream:
+    def __init__(self, url=STREAM_URL, coins=None, bus=None, vol_window=VOL_WINDOW):
+        self.url = url
+        self.coins = list(coins or PRODUCTS)
+        self.products = {PRODUCTS[c]: c for c in self.coins}
+        self.bus = bus or PubSub()
+        # Ticks arrive irregularly, so volatility is reported per tick, not annualized
+        self.estimators = {c: StreamingVolatility(window=vol_window, periods_per_year=1) for c in self.coins}
+
+        self.latest = {}
+        self.network_latency = LatencyStats()
+        self.screen_latency = LatencyStats()
+        self.ticks = 0
+        self.connects = 0
+        self.errors = 0
+        self.malformed = 0
+        self.connected = False
+
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._ws = None
+        self._thread = None
+
+    def start(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._run, name="price-stream", daemon=True)
+                self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        ws = self._ws
+        if ws is not None:
+            ws.close()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+    def _subscribe_message(self):
+        return {"type": "subscribe", "product_ids": list(self.products), "channels": ["ticker", "heartbeat"]}
+
+    # Reconnects with exponential backoff until stop() is called
+    def _run(self):
+        try:
+            errors = _connection_errors()
+        except ImportError:
+            self.errors += 1
+            log("price stream needs the websockets package (pip install websockets)")
+            return
+
+        delay = 1
+        while not self._stop.is_set():
+            try:
+                self._ws = _connect(self.url)
+                self._ws.send(json.dumps(self._subscribe_message()))
+                self.connects += 1
+                self.connected = True
+                delay = 1
+                log(f"price stream connected to {self.url}")
+                while not self._stop.is_set():
+                    # TimeoutError (an OSError) when not even a heartbeat arrives
+                    self._handle(self._ws.recv(timeout=READ_TIMEOUT))
+            except errors as e:
+                if self._stop.is_set():
+                    break
+                self.errors += 1
+                log(f"price stream disconnected ({e}), reconnecting in {delay}s")
+            finally:
+                self.connected = False
+                if self._ws is not None:
+                    self._ws.close()
+                    self._ws = None
+            self._stop.wait(delay)
+            delay = min(delay * 2, MAX_BACKOFF)
+
+    # One feed message; anything malformed is counted, logged and skipped so
+    # a bad message never takes the reader thread down
+    def _handle(self, message):
+        received = time.time()
+        try:
+            tick = self._parse(message, received)
+        except (AttributeError, KeyError, TypeError, ValueError) as e:
+            self.malformed += 1
+            log(f"price stream skipped a malformed message ({e!r}): {str(message)[:200]}")
+            return
+        if tick is None:
+            return
+
+        with self._lock:
+            self.latest[tick["coin"]] = tick
+            self.ticks += 1
+        self.bus.publish("ticks", tick)
+        self.bus.publish(f"ticks.{tick['coin']}", tick)
+
+    # Ticker message -> tick dict; None for other message types and products
+    def _parse(self, message, received):
+        data = json.loads(message)
+        if data.get("type") != "ticker":
+            return None
+        coin = self.products.get(data.get("product_id"))
+        if coin is None:
+            return None
+
+        price = float(data["price"])
+        exchange_time = _parse_time(data.get("time"))
+        if exchange_time is not None:
+            self.network_latency.record(max(received - exchange_time, 0.0))
+
+        estimator = self.estimators[coin]
+        estimator.update(price)
+        open_24h = float(data.get("open_24h") or 0)
+        return {
+            "coin": coin,
+            "price": price,
+            "usd_24h_change": (price / open_24h - 1) * 100 if open_24h else None,
+            "usd_24h_vol": float(data.get("volume_24h") or 0) * price,
+            "time": exchange_time,
+            "received": received,
+            "volatility": estimator.volatility,
+            "ewma_volatility": estimator.ewma_volatility,
+        }
+
+    def subscribe(self, coin=None):
+        return self.bus.subscribe(f"ticks.{coin}" if coin else "ticks")
+
+    # Latest tick per coin, in the shape of data_access.get_simple_prices()
+    def prices(self):
+        with self._lock:
+            latest = dict(self.latest)
+        return {
+            coin: {"usd": t["price"], "usd_24h_change": t["usd_24h_change"], "usd_24h_vol": t["usd_24h_vol"]}
+            for coin, t in latest.items()
+        }
+
+    # Called by the UI when it draws ticks: received -> rendered latency
+    def record_render(self, ticks, rendered_at=None):
+        rendered_at = rendered_at or time.time()
+        for tick in ticks:
+            self.screen_latency.record(max(rendered_at - tick["received"], 0.0))
+
+    def stats(self):
+        return {
+            "url": self.url,
+            "connected": self.connected,
+            "connects": self.connects,
+            "errors": self.errors,
+            "malformed": self.malformed,
+            "ticks": self.ticks,
+            "subscribers": self.bus.subscriber_count("ticks"),
+            "network_latency": self.network_latency.summary(),
+            "screen_latency": self.screen_latency.summary(),
+        }
+
+
+_stream = None
+_stream_lock = threading.Lock()
+
+
+# Process-wide stream shared by every Streamlit session
+def get_stream():
+    global _stream
+    with _stream_lock:
+        if _stream is None:
+            _stream = PriceStream()
+        return _stream.start()
+
+
+# Drops a session's subscription and stops the shared stream once no one is
+# subscribed; unlike get_stream it never opens a connection
+def release(subscription):
+    with _stream_lock:
+        if _stream is None:
+            return
+        _stream.bus.unsubscribe(subscription)
+        if _stream.bus.subscriber_count("ticks") == 0:
+            _stream.stop()
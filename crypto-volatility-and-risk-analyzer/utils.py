@@ -1,26 +1,32 @@
 import requests
 import pandas as pd
 import numpy as np
+from price_store import get_store
+from instrumentation import count, instrumented
 
-# Fetch crypto price data from CoinGecko
+# Fetch crypto price data from CoinGecko, through the local price store
+@instrumented("fetch.crypto_data")
 def fetch_crypto_data(coin="bitcoin", days=90):
-    url = f"https://api.coingecko.com/api/v3/coins/{coin}/market_chart"
-    params = {
-        "vs_currency": "usd",
-        "days": days
-    }
-    response = requests.get(url, params=params)
-    data = response.json()
-
-    prices = data["prices"]
-    df = pd.DataFrame(prices, columns=["timestamp", "price"])
-    df["date"] = pd.to_datetime(df["timestamp"], unit="ms")
-    df = df[["date", "price"]]
+    # CoinGecko serves hourly points up to 90 days and daily points beyond
+    resolution = "hourly" if days <= 90 else "daily"
+    store = get_store()
+
+    try:
+        store.sync([coin], days, resolution=resolution)
+    except requests.RequestException:
+        # Offline: fall back to whatever history is already on disk
+        if store.last_timestamp(coin, resolution=resolution) is None:
+            raise
+
+    start = pd.Timestamp.now(tz="UTC") - pd.Timedelta(days=days)
+    df = store.read(coin, start=start, resolution=resolution)
+    count("rows_fetched", len(df), source="price_store")
 
     return df
 
 
 # Calculate volatility and Sharpe ratio
+@instrumented("compute.metrics")
 def calculate_metrics(df):
     df["returns"] = np.log(df["price"] / df["price"].shift(1))
 
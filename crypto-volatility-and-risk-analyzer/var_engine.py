@@ -0,0 +1,155 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from statistics import NormalDist
+
+import numpy as np
+
+# ===============================
+# CONFIGURATION
+# ===============================
+
+CONFIDENCE = 0.95
+MC_PATHS = 1_000_000
+# Upper bound on the float64 scratch memory one simulation chunk may use
+MEMORY_BUDGET_MB = 64
+
+# VaR and CVaR are reported as positive loss fractions of portfolio value
+
+
+def _weights(returns, weights):
+    n_assets = returns.shape[1]
+    if weights is None:
+        return np.full(n_assets, 1.0 / n_assets)
+    return np.asarray(weights, dtype=float)
+
+
+def _tail(pnl, confidence):
+    var = -np.quantile(pnl, 1 - confidence)
+    cvar = -pnl[pnl <= -var].mean()
+    return var, cvar
+
+
+# How many of the smallest of n outcomes np.quantile reads at 1 - confidence
+# (the two order statistics it interpolates between)
+def _tail_count(n, confidence):
+    return min(n, int(np.floor((1 - confidence) * (n - 1))) + 2)
+
+
+# _tail from only the smallest _tail_count(n, confidence) of n outcomes
+def _tail_from_smallest(smallest, n, confidence):
+    smallest = np.sort(smallest)
+    pos = (1 - confidence) * (n - 1)
+    lo = int(np.floor(pos))
+    hi = min(lo + 1, len(smallest) - 1)
+    var = -(smallest[lo] + (pos - lo) * (smallest[hi] - smallest[lo]))
+    cvar = -smallest[smallest <= -var].mean()
+    return var, cvar
+
+
+# ===============================
+# HISTORICAL
+# ===============================
+
+# Empirical quantile of the portfolio's past returns
+def historical_var(returns, weights=None, confidence=CONFIDENCE):
+    R = np.asarray(returns, dtype=float)
+    pnl = R @ _weights(R, weights)
+    var, cvar = _tail(pnl, confidence)
+    return {"method": "historical", "VaR": var, "CVaR": cvar}
+
+
+# ===============================
+# PARAMETRIC (VARIANCE-COVARIANCE)
+# ===============================
+
+# Normal-distribution VaR/CVaR from the mean vector and covariance matrix
+def parametric_var(mean, cov, weights=None, confidence=CONFIDENCE):
+    mean = np.asarray(mean, dtype=float)
+    cov = np.asarray(cov, dtype=float)
+    w = np.full(len(mean), 1.0 / len(mean)) if weights is None else np.asarray(weights, dtype=float)
+
+    mu = w @ mean
+    sigma = np.sqrt(w @ cov @ w)
+    z = NormalDist().inv_cdf(confidence)
+    var = z * sigma - mu
+    cvar = sigma * np.exp(-z * z / 2) / (np.sqrt(2 * np.pi) * (1 - confidence)) - mu
+    return {"method": "parametric", "VaR": var, "CVaR": cvar}
+
+
+# ===============================
+# MONTE CARLO
+# ===============================
+
+# Paths per chunk so that one chunk's scratch fits MEMORY_BUDGET_MB; a
+# budget too small for a single path still simulates one at a time
+def chunk_size(n_assets, memory_budget_mb=MEMORY_BUDGET_MB):
+    # normals + correlated draws per asset, P&L + its partition copy, float64
+    bytes_per_path = 8 * (2 * n_assets + 2)
+    return max(1, int(memory_budget_mb * 1024 ** 2 // bytes_per_path))
+
+
+# Smallest `keep` portfolio P&L outcomes of one chunk
+def _simulate_chunk(args):
+    seed, n_paths, mean, chol, w, keep = args
+    rng = np.random.default_rng(seed)
+    z = rng.standard_normal((n_paths, len(mean)))
+    draws = z @ chol.T
+    draws += mean
+    pnl = draws @ w
+    if keep >= n_paths:
+        return pnl
+    return np.partition(pnl, keep - 1)[:keep]
+
+
+def _merge_tail(tail, chunk_tail, keep):
+    merged = np.concatenate([tail, chunk_tail])
+    if len(merged) <= keep:
+        return merged
+    return np.partition(merged, keep - 1)[:keep]
+
+
+# Correlated multivariate-normal simulation from the covariance matrix,
+# generated in memory-bounded chunks and optionally spread over processes
+def monte_carlo_var(mean, cov, weights=None, confidence=CONFIDENCE, n_paths=MC_PATHS,
+                    memory_budget_mb=MEMORY_BUDGET_MB, workers=None, seed=None):
+    mean = np.asarray(mean, dtype=float)
+    cov = np.asarray(cov, dtype=float)
+    w = np.full(len(mean), 1.0 / len(mean)) if weights is None else np.asarray(weights, dtype=float)
+
+    chol = np.linalg.cholesky(cov + np.eye(len(mean)) * 1e-12)
+    size = chunk_size(len(mean), memory_budget_mb)
+    counts = [size] * (n_paths // size)
+    if n_paths % size:
+        counts.append(n_paths % size)
+
+    # Only the worst (1 - confidence) share of outcomes decides VaR and CVaR,
+    # so each chunk hands back its worst `keep` and a running buffer of that
+    # size is all that outlives a chunk
+    keep = _tail_count(n_paths, confidence)
+    seeds = np.random.SeedSequence(seed).spawn(len(counts))
+    jobs = [(s, count, mean, chol, w, keep) for s, count in zip(seeds, counts)]
+
+    tail = np.empty(0)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(jobs) == 1:
+        for job in jobs:
+            tail = _merge_tail(tail, _simulate_chunk(job), keep)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for chunk_tail in pool.map(_simulate_chunk, jobs):
+                tail = _merge_tail(tail, chunk_tail, keep)
+
+    var, cvar = _tail_from_smallest(tail, n_paths, confidence)
+    return {"method": "monte_carlo", "VaR": var, "CVaR": cvar, "paths": n_paths, "chunks": len(jobs)}
+
+
+# All three methods for one returns frame and weight vector
+def portfolio_var_report(returns, weights=None, confidence=CONFIDENCE, n_paths=MC_PATHS, **mc_kwargs):
+    R = np.asarray(returns, dtype=float)
+    mean = R.mean(axis=0)
+    cov = np.atleast_2d(np.cov(R, rowvar=False))
+    return [
+        historical_var(R, weights, confidence),
+        parametric_var(mean, cov, weights, confidence),
+        monte_carlo_var(mean, cov, weights, confidence, n_paths, **mc_kwargs),
+    ]
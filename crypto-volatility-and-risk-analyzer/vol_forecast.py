@@ -0,0 +1,222 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from snapshots import publish_snapshot, read_snapshot
+
+# ===============================
+# CONFIGURATION
+# ===============================
+
+RISKMETRICS_LAMBDA = 0.94
+PERIODS_PER_YEAR = 252
+
+# Candidate decay factors for the fitted EWMA
+EWMA_GRID = np.linspace(0.80, 0.995, 40)
+
+# Cold-start GARCH grid: alpha x persistence (alpha + beta)
+ALPHA_GRID = np.linspace(0.02, 0.30, 8)
+PERSISTENCE_GRID = np.array([0.80, 0.88, 0.93, 0.96, 0.98, 0.99, 0.995])
+COLD_STEP = 0.02
+# Warm starts search a small neighbourhood of yesterday's parameters
+WARM_STEP = 0.002
+STEP_TOL = 1e-4
+MAX_ITER = 200
+
+# Assets fitted together in one vectorized batch (and one pool task)
+CHUNK_ASSETS = 32
+PARAMS_SNAPSHOT = "vol_models"
+
+# Pattern-search moves in (alpha, beta); the first is "stay"
+STENCIL = np.array([[0, 0], [1, 0], [-1, 0], [0, 1], [0, -1], [1, -1], [-1, 1], [1, 1], [-1, -1]], dtype=float)
+
+
+# ===============================
+# VECTORIZED LIKELIHOODS
+# ===============================
+# Returns are a (T x N) matrix; parameters are (K x N) so K candidates for
+# each of N assets are evaluated in the same pass over time. The recursion
+# is sequential in t but every step is one array operation.
+
+def _initial_variance(R):
+    head = R[:min(len(R), 30)]
+    return np.maximum((head * head).mean(axis=0), 1e-12)
+
+
+# Gaussian negative log-likelihood (without constants) of EWMA variances
+def ewma_nll(R, lambdas):
+    lam = np.asarray(lambdas, dtype=float)[:, None]
+    s2 = np.broadcast_to(_initial_variance(R), (len(lam), R.shape[1])).copy()
+    nll = np.zeros_like(s2)
+    for r in R:
+        r2 = r * r
+        nll += np.log(s2) + r2 / s2
+        s2 = lam * s2 + (1 - lam) * r2
+    return 0.5 * nll, s2
+
+
+# GARCH(1,1) with variance targeting: omega = (1 - alpha - beta) * var(r)
+def garch_nll(R, alpha, beta, long_run):
+    omega = (1 - alpha - beta) * long_run
+    s2 = np.broadcast_to(_initial_variance(R), alpha.shape).copy()
+    nll = np.zeros_like(s2)
+    for r in R:
+        r2 = r * r
+        nll += np.log(s2) + r2 / s2
+        s2 = omega + alpha * r2 + beta * s2
+    return 0.5 * nll, s2
+
+
+def _feasible(alpha, beta):
+    alpha = np.clip(alpha, 1e-6, 0.999)
+    beta = np.clip(beta, 0.0, 0.999)
+    over = alpha + beta > 0.9995
+    scale = np.where(over, 0.9995 / (alpha + beta), 1.0)
+    return alpha * scale, beta * scale
+
+
+# ===============================
+# BATCHED FITTING
+# ===============================
+
+# One chunk of assets: EWMA lambda by grid, GARCH(1,1) by a grid (cold) or
+# the previous parameters (warm), then a per-asset pattern search whose
+# stencil points are all evaluated in one vectorized likelihood pass
+def _fit_chunk(args):
+    R, init = args
+    R = R - R.mean(axis=0)
+    n = R.shape[1]
+    long_run = R.var(axis=0)
+
+    ewma_losses, ewma_next = ewma_nll(R, EWMA_GRID)
+    best_lambda = ewma_losses.argmin(axis=0)
+    ewma_lambda = EWMA_GRID[best_lambda]
+    ewma_forecast = ewma_next[best_lambda, np.arange(n)]
+    _, riskmetrics_next = ewma_nll(R, [RISKMETRICS_LAMBDA])
+
+    if init is None:
+        a_grid, p_grid = np.meshgrid(ALPHA_GRID, PERSISTENCE_GRID)
+        a_grid, b_grid = _feasible(a_grid.ravel(), p_grid.ravel() - a_grid.ravel())
+        losses, _ = garch_nll(R, np.repeat(a_grid[:, None], n, axis=1), np.repeat(b_grid[:, None], n, axis=1), long_run)
+        best = losses.argmin(axis=0)
+        center = np.stack([a_grid[best], b_grid[best]], axis=1)
+        step = np.full(n, COLD_STEP)
+    else:
+        center = np.stack(_feasible(init[:, 0], init[:, 1]), axis=1)
+        step = np.full(n, WARM_STEP)
+
+    # Only assets still refining are evaluated each round
+    iterations = np.zeros(n, dtype=int)
+    active = np.flatnonzero(step > STEP_TOL)
+    while len(active) and iterations.max() < MAX_ITER:
+        iterations[active] += 1
+        cand = center[None, active, :] + STENCIL[:, None, :] * step[None, active, None]
+        alpha, beta = _feasible(cand[..., 0], cand[..., 1])
+        losses, _ = garch_nll(R[:, active], alpha, beta, long_run[active])
+        best = losses.argmin(axis=0)
+        cols = np.arange(len(active))
+        center[active] = np.stack([alpha[best, cols], beta[best, cols]], axis=1)
+        step[active] = np.where(best == 0, step[active] / 2, step[active])
+        active = active[step[active] > STEP_TOL]
+
+    alpha, beta = center[:, 0], center[:, 1]
+    losses, garch_next = garch_nll(R, alpha[None], beta[None], long_run)
+    return {
+        "ewma_lambda": ewma_lambda,
+        "ewma_forecast": ewma_forecast,
+        "riskmetrics_forecast": riskmetrics_next[0],
+        "omega": (1 - alpha - beta) * long_run,
+        "alpha": alpha,
+        "beta": beta,
+        "long_run": long_run,
+        "garch_forecast": garch_next[0],
+        "nll": losses[0],
+        "iterations": iterations,
+        "converged": step <= STEP_TOL,
+    }
+
+
+def _chunks(columns, size):
+    return [columns[i:i + size] for i in range(0, len(columns), size)]
+
+
+# Fits EWMA and GARCH(1,1) for every column of a Date x asset returns frame.
+# Assets with parameters in the vol_models snapshot are warm-started from
+# them; new fits are written back so tomorrow's refit starts here too.
+# Returns one row per asset with next-day volatility forecasts.
+def fit_volatility_models(returns, workers=None, chunk_assets=CHUNK_ASSETS,
+                          use_cache=True, periods_per_year=PERIODS_PER_YEAR):
+    returns = returns.dropna()
+    cached = (read_snapshot(PARAMS_SNAPSHOT) or {}) if use_cache else {}
+    warm = [a for a in returns.columns if a in cached]
+    cold = [a for a in returns.columns if a not in cached]
+
+    tasks, task_assets = [], []
+    for group, is_warm in [(warm, True), (cold, False)]:
+        for assets in _chunks(group, chunk_assets):
+            init = np.array([[cached[a]["alpha"], cached[a]["beta"]] for a in assets]) if is_warm else None
+            tasks.append((returns[assets].to_numpy(dtype=float), init))
+            task_assets.append((assets, is_warm))
+
+    workers = min(workers or os.cpu_count() or 1, len(tasks))
+    if workers <= 1:
+        results = [_fit_chunk(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_fit_chunk, tasks))
+
+    frames = []
+    for (assets, is_warm), result in zip(task_assets, results):
+        frame = pd.DataFrame(result, index=assets)
+        frame["warm_start"] = is_warm
+        frames.append(frame)
+    fits = pd.concat(frames).loc[returns.columns]
+
+    if use_cache:
+        params = {**cached, **{
+            asset: {
+                "alpha": float(row["alpha"]),
+                "beta": float(row["beta"]),
+                "ewma_lambda": float(row["ewma_lambda"]),
+                "last_date": str(returns.index[-1]),
+            }
+            for asset, row in fits.iterrows()
+        }}
+        publish_snapshot(PARAMS_SNAPSHOT, params)
+
+    ann = np.sqrt(periods_per_year)
+    report = pd.DataFrame({
+        "EWMA Lambda": fits["ewma_lambda"],
+        "EWMA Volatility": np.sqrt(fits["ewma_forecast"]),
+        "RiskMetrics Volatility": np.sqrt(fits["riskmetrics_forecast"]),
+        "GARCH Omega": fits["omega"],
+        "GARCH Alpha": fits["alpha"],
+        "GARCH Beta": fits["beta"],
+        "GARCH Persistence": fits["alpha"] + fits["beta"],
+        "GARCH Volatility": np.sqrt(fits["garch_forecast"]),
+        "Long-Run Volatility": np.sqrt(fits["long_run"]),
+        "GARCH Annual Volatility": np.sqrt(fits["garch_forecast"]) * ann,
+        "Converged": fits["converged"],
+        "Warm Start": fits["warm_start"],
+    })
+    report.index.name = "Asset"
+    return report
+
+
+# ===============================
+# FORECASTS
+# ===============================
+
+# GARCH(1,1) expected daily volatility h days ahead, for each asset in a
+# fit_volatility_models() report: mean-reverts from the next-day forecast
+# toward the long-run level at rate alpha + beta
+def garch_term_structure(report, horizons=(1, 5, 10, 30)):
+    long_run = report["Long-Run Volatility"] ** 2
+    next_day = report["GARCH Volatility"] ** 2
+    persistence = report["GARCH Persistence"]
+    return pd.DataFrame({
+        f"{h}d": np.sqrt(long_run + persistence ** (h - 1) * (next_day - long_run))
+        for h in horizons
+    })